@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+# Time to first paint of the Caleson main window.
+# Each run starts Caleson in a fresh interpreter and measures, from the
+# interpreter start: the end of the imports, the end of CalesonMainW(),
+# the first paint of the window and the end of the background startup
+# (all panels filled). The median of each is reported.
+#
+#   benchmarks/first_paint.py [--runs=N] [--max-ms=MS] [--offscreen]
+#
+# With --max-ms, exits with 1 if the first paint is slower than MS.
+# --offscreen uses the Qt offscreen platform (no display needed).
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+STARTUP_TIMEOUT = 30000 # ms
+STEPS = ('imports', 'window', 'first_paint', 'startup_finished')
+
+
+def run_child():
+    'one measured startup, prints the times in ms as JSON'
+    start = time.perf_counter()
+    times = dict[str, float]()
+
+    def mark(step: str):
+        if step not in times:
+            times[step] = (time.perf_counter() - start) * 1000.0
+
+    sys.path.insert(0, SRC_DIR)
+
+    from PyQt5.QtCore import QEvent, QObject, QTimer
+    from PyQt5.QtWidgets import QApplication
+
+    import caleson
+    from shared_canvasjack import gDBus
+    mark('imports')
+
+    class PaintFilter(QObject):
+        def eventFilter(self, obj, event):
+            if (event.type() == QEvent.Paint
+                    and obj.isWidgetType() and obj.window() is gui):
+                mark('first_paint')
+                finished()
+            return False
+
+    def finished():
+        if 'first_paint' in times and 'startup_finished' in times:
+            app.quit()
+
+    def startup_finished():
+        mark('startup_finished')
+        finished()
+
+    # as caleson.py main
+    app = QApplication(sys.argv[:1])
+    app.setApplicationName("Caleson")
+    app.setOrganizationName("Caleson")
+    if caleson.haveDBus:
+        gDBus.loop = caleson.DBusMainLoop(set_as_default=True)
+        gDBus.bus = caleson.dbus.SessionBus(mainloop=gDBus.loop)
+
+    gui = caleson.CalesonMainW()
+    gui.startup_finished.connect(startup_finished)
+    mark('window')
+
+    paint_filter = PaintFilter()
+    app.installEventFilter(paint_filter)
+    gui.show()
+
+    QTimer.singleShot(STARTUP_TIMEOUT, app.quit)
+    app.exec_()
+
+    sys.stdout.write(json.dumps(times) + '\n')
+
+
+def startup_times_ms(offscreen: bool) -> dict[str, float]:
+    env = os.environ.copy()
+    if offscreen:
+        env['QT_QPA_PLATFORM'] = 'offscreen'
+
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child'],
+        env=env, capture_output=True, text=True)
+
+    if proc.returncode or not proc.stdout.strip():
+        raise RuntimeError(proc.stderr.strip() or 'no output')
+
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    runs = 5
+    max_ms = None
+    offscreen = False
+
+    for arg in sys.argv[1:]:
+        if arg == '--child':
+            run_child()
+            return 0
+        if arg.startswith('--runs='):
+            runs = int(arg.partition('=')[2])
+        elif arg.startswith('--max-ms='):
+            max_ms = float(arg.partition('=')[2])
+        elif arg == '--offscreen':
+            offscreen = True
+        else:
+            print(f'unknown argument: {arg}')
+            return 2
+
+    results = list[dict[str, float]]()
+    for i in range(runs):
+        try:
+            results.append(startup_times_ms(offscreen))
+        except RuntimeError as e:
+            print(f'Caleson startup failed: {e}')
+            return 2
+
+    for step in STEPS:
+        values = [r[step] for r in results if step in r]
+        if len(values) < runs:
+            print(f'{step}: not reached in {runs - len(values)} runs')
+        if values:
+            print(f'{step}: {statistics.median(values):.1f} ms '
+                  f'(min {min(values):.1f} ms, {runs} runs)')
+
+    paints = [r['first_paint'] for r in results if 'first_paint' in r]
+    if max_ms is not None and (
+            len(paints) < runs or statistics.median(paints) > max_ms):
+        print(f'first_paint: slower than {max_ms:.1f} ms')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
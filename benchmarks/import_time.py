@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+
+# Import time of Caleson modules, as measured by 'python -X importtime'.
+# Each module is imported in a fresh interpreter, several times,
+# the median of the cumulative import time is reported.
+#
+#   benchmarks/import_time.py [--runs=N] [--max-ms=MS] [module...]
+#
+# With --max-ms, exits with 1 if one module is slower than MS,
+# so it can guard against import time regressions.
+
+import os
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+DEFAULT_MODULES = ('jacklib', 'jacklib_helpers')
+
+
+def import_time_us(module: str) -> int:
+    'cumulative import time of module, in microseconds'
+    env = os.environ.copy()
+    env['PYTHONPATH'] = os.pathsep.join(
+        p for p in (SRC_DIR, env.get('PYTHONPATH')) if p)
+
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        env=env, capture_output=True, text=True)
+
+    if proc.returncode:
+        raise ImportError(proc.stderr.strip().splitlines()[-1])
+
+    # "import time:       self [us] |  cumulative | imported package"
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+
+    raise ImportError(f'{module} not found in importtime output')
+
+def main() -> int:
+    runs = 10
+    max_ms = None
+    modules = list[str]()
+
+    for arg in sys.argv[1:]:
+        if arg.startswith('--runs='):
+            runs = int(arg.partition('=')[2])
+        elif arg.startswith('--max-ms='):
+            max_ms = float(arg.partition('=')[2])
+        else:
+            modules.append(arg)
+
+    too_slow = False
+
+    for module in modules or DEFAULT_MODULES:
+        try:
+            times = [import_time_us(module) for i in range(runs)]
+        except ImportError as e:
+            print(f'{module}: skipped, {e}')
+            continue
+
+        median_ms = statistics.median(times) / 1000.0
+        print(f'{module}: {median_ms:.2f} ms '
+              f'(min {min(times) / 1000.0:.2f} ms, {runs} runs)')
+
+        if max_ms is not None and median_ms > max_ms:
+            print(f'{module}: slower than {max_ms:.2f} ms')
+            too_slow = True
+
+    return 1 if too_slow else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
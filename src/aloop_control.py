@@ -0,0 +1,152 @@
+# Control channel of caleson-aloop-daemon.
+# The daemon listens on a local socket, clients send one JSON request
+# per line ({"command": "status"}) and read one JSON reply per line.
+
+import json
+import logging
+import os
+import tempfile
+from typing import Optional
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+from PyQt5.QtNetwork import QLocalSocket
+
+
+_logger = logging.getLogger(__name__)
+
+# commands understood by the daemon
+CMD_START = 'start'
+CMD_STOP = 'stop'
+CMD_RESTART = 'restart'
+CMD_STATUS = 'status'
+COMMANDS = (CMD_START, CMD_STOP, CMD_RESTART, CMD_STATUS)
+
+# ms, the daemon answers from its event loop, it should be fast
+DEFAULT_TIMEOUT = 300
+# ms, the stop reply is sent once the bridges are stopped
+STOP_TIMEOUT = 5000
+
+
+def socket_path() -> str:
+    runtime_dir = os.getenv('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, 'caleson-aloop-daemon.sock')
+    return os.path.join(tempfile.gettempdir(),
+                        f'caleson-aloop-daemon-{os.getuid()}.sock')
+
+def encode(message: dict) -> bytes:
+    return json.dumps(message).encode() + b'\n'
+
+def decode(line: bytes) -> Optional[dict]:
+    try:
+        message = json.loads(line.decode(errors='replace'))
+    except ValueError:
+        return None
+    if not isinstance(message, dict):
+        return None
+    return message
+
+def _check_reply(command: str, data: bytes) -> Optional[dict]:
+    reply = decode(data)
+    if reply is None:
+        _logger.warning(f"Invalid reply from caleson-aloop-daemon: {data!r}")
+    elif 'error' in reply:
+        _logger.warning(
+            f"caleson-aloop-daemon '{command}' failed: {reply['error']}")
+    return reply
+
+def request(command: str, timeout=DEFAULT_TIMEOUT) -> Optional[dict]:
+    '''send command to the daemon and wait for its reply.
+    Blocking, for the GUI thread prefer AsyncRequest.
+    Returns None if the daemon is not running or did not answer.'''
+    sock = QLocalSocket()
+    sock.connectToServer(socket_path())
+    if not sock.waitForConnected(timeout):
+        # no daemon, this is not an error
+        return None
+
+    sock.write(encode({'command': command}))
+    sock.flush()
+
+    data = b''
+    while not data.endswith(b'\n'):
+        if not sock.waitForReadyRead(timeout):
+            _logger.warning(
+                f"caleson-aloop-daemon did not answer to '{command}'")
+            sock.abort()
+            return None
+        data += bytes(sock.readAll())
+
+    sock.disconnectFromServer()
+    return _check_reply(command, data)
+
+def status(timeout=DEFAULT_TIMEOUT) -> Optional[dict]:
+    '''daemon state, None if not running. Keys are:
+    running (bridges are running), bridge (tool name), channels,
+    pids (bridge PIDs), restart_count (automatic restarts)
+    and last_exit_code (None if no bridge exited yet).'''
+    return request(CMD_STATUS, timeout)
+
+
+class AsyncRequest(QObject):
+    '''command sent to the daemon from the Qt event loop, without waiting.
+    `replied` is emitted once, with the reply, or with None if the daemon
+    is not running or did not answer in time (ms).
+    The request deletes itself after.'''
+
+    replied = pyqtSignal(object)
+
+    def __init__(self, command: str, parent: Optional[QObject]=None,
+                 timeout=DEFAULT_TIMEOUT):
+        QObject.__init__(self, parent)
+        self.command = command
+        self._timeout = timeout
+        self._data = b''
+        self._done = False
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._timed_out)
+
+        self._socket = QLocalSocket(self)
+        self._socket.connected.connect(self._connected)
+        self._socket.readyRead.connect(self._ready_read)
+        # errorOccurred is Qt >= 5.15
+        getattr(self._socket, 'errorOccurred', self._socket.error).connect(
+            self._socket_error)
+
+    def send(self):
+        'connect to `replied` first, it can be emitted from here'
+        self._timer.start(self._timeout)
+        self._socket.connectToServer(socket_path())
+
+    def _finish(self, reply: Optional[dict]):
+        if self._done:
+            return
+
+        self._done = True
+        self._timer.stop()
+        self._socket.abort()
+        self.replied.emit(reply)
+        self.deleteLater()
+
+    @pyqtSlot()
+    def _connected(self):
+        self._socket.write(encode({'command': self.command}))
+
+    @pyqtSlot()
+    def _ready_read(self):
+        self._data += bytes(self._socket.readAll())
+        if self._data.endswith(b'\n'):
+            self._finish(_check_reply(self.command, self._data))
+
+    @pyqtSlot()
+    def _socket_error(self):
+        # no daemon, this is not an error
+        self._finish(None)
+
+    @pyqtSlot()
+    def _timed_out(self):
+        _logger.warning(
+            f"caleson-aloop-daemon did not answer to '{self.command}'")
+        self._finish(None)
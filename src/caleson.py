@@ -20,6 +20,7 @@
 
 # Imports (Global)
 
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 import logging
 import os
@@ -27,6 +28,7 @@ import sys
 import shutil
 from platform import architecture
 import subprocess
+from typing import Optional
 
 from PyQt5.QtCore import (
     QFileSystemWatcher, Qt, QTimer,
@@ -38,9 +40,11 @@ from PyQt5.QtWidgets import (
 # Imports (Custom Stuff)
 
 from clickablelabel import ClickableLabel
+import aloop_control
 import force_restart
 import systray
 import pulse2jack_tool
+from patchbay_mirror import PatchbayMirror
 
 from alsa_audio_dialog import AlsaAudioDialog
 from asio_tools import have_wine, getWineAsioKeyValue, smartHex
@@ -57,8 +61,14 @@ from shared_caleson import (
 from shared_canvasjack import (
     jacklib, gDBus, BUFFER_SIZE_LIST)
 from shared_i18n import setup_i18n
-from system_checks import calesonSystemChecks, initSystemChecks
+from dbus_async import (
+    jack_call, a2j_call, on_done)
+from system_checks import (
+    calesonSystemChecks, initSystemChecks, CalesonSystemCheck)
+from jack_status import JackStatusEngine
+from main_thread_call import MainThreadCaller
 import jacksettings
+import tracing
 
 import ui_caleson
 
@@ -80,6 +90,11 @@ _logger = logging.getLogger(__name__)
 # Check for PulseAudio
 havePulseAudio = bool(shutil.which('pulseaudio'))
 
+# ms, time given to a new caleson-aloop-daemon to start its bridge
+ALSA_BRIDGE_START_TIMEOUT = 10000
+# seconds, system bus calls of the CPU governor probe
+SYSTEM_BUS_TIMEOUT = 2.0
+
 
 class IJackDbus(Enum):
     GRAPH_VERSION = 0
@@ -91,10 +106,6 @@ class IJackDbus(Enum):
     PORT_TYPE = 6
 
 
-global jackClientIdALSA
-jackClientIdALSA = -1
-
-
 def get_architecture():
     return architecture()[0]
 
@@ -148,19 +159,64 @@ def get_windows_information():
 
     return (os, version)
 
-# ---------------------------------------------------------------------
-
-def isAlsaAudioBridged():
-    global jackClientIdALSA
-    return bool(jackClientIdALSA != -1)
+def probeCpuGovernors(availGovPath: str, curGovPath: str):
+    '''Available CPU governors, scaling_governor files and their CPUs,
+    None if the governor can not be changed.
+    Blocking (system bus, /sys), run in a worker thread.'''
+    try:
+        # private connection, the shared one is used by the main thread
+        fBus = dbus.SystemBus(private=True)
+        try:
+            # as get_object (activates the service), with a timeout
+            if not fBus.call_blocking(
+                    dbus.BUS_DAEMON_NAME, dbus.BUS_DAEMON_PATH,
+                    dbus.BUS_DAEMON_IFACE, "NameHasOwner", "s",
+                    ("com.ubuntu.IndicatorCpufreqSelector",),
+                    timeout=SYSTEM_BUS_TIMEOUT):
+                fBus.call_blocking(
+                    dbus.BUS_DAEMON_NAME, dbus.BUS_DAEMON_PATH,
+                    dbus.BUS_DAEMON_IFACE, "StartServiceByName", "su",
+                    ("com.ubuntu.IndicatorCpufreqSelector", 0),
+                    timeout=SYSTEM_BUS_TIMEOUT)
+        finally:
+            fBus.close()
+    except:
+        return None
+
+    if not (os.path.exists(availGovPath) and os.path.exists(curGovPath)):
+        return None
+
+    availGovFd = open(availGovPath, "r")
+    availGovRead = availGovFd.read().strip()
+    availGovFd.close()
+
+    # cpuN directories are all in /sys/devices/system/cpu,
+    # no need to walk the whole tree
+    cpus = list[tuple[int, str]]()
+    for entry in os.scandir("/sys/devices/system/cpu/"):
+        if not entry.name.startswith("cpu"):
+            continue
+        cpuNum = entry.name.replace("cpu", "", 1)
+        if not cpuNum.isdigit():
+            continue
+
+        cpuGovPath = os.path.join(entry.path, "cpufreq", "scaling_governor")
+        if os.path.exists(cpuGovPath):
+            cpus.append((int(cpuNum), cpuGovPath))
+
+    cpus.sort()
+    return (availGovRead.split(" "),
+            [cpu[1] for cpu in cpus],
+            [cpu[0] for cpu in cpus])
 
+# ---------------------------------------------------------------------
 
 # Main Window
 class CalesonMainW(QMainWindow):
     DBusJackServerStartedCallback = pyqtSignal()
     DBusJackServerStoppedCallback = pyqtSignal()
     DBusJackClientAppearedCallback = pyqtSignal(int, str)
-    DBusJackClientDisappearedCallback = pyqtSignal(int)
+    DBusJackClientDisappearedCallback = pyqtSignal(int, str)
     DBusA2JBridgeStartedCallback = pyqtSignal()
     DBusA2JBridgeStoppedCallback = pyqtSignal()
 
@@ -169,12 +225,17 @@ class CalesonMainW(QMainWindow):
     SIGUSR2 = pyqtSignal()
     
     pulse_bridges_edited = pyqtSignal()
+    startup_finished = pyqtSignal()
+    'panels filled in the background are all filled'
 
     def __init__(self, parent=None):
         QMainWindow.__init__(self, parent)
+        sections = tracing.sections("CalesonMainW.__init__")
+        sections.next("setupUi")
         self.ui = ui_caleson.Ui_CalesonMainW()
         self.ui.setupUi(self)
 
+        sections.next("settings")
         self.settings = QSettings("Caleson", "Caleson")
         self.loadSettings(True)
 
@@ -184,18 +245,38 @@ class CalesonMainW(QMainWindow):
         self.pix_warning = QIcon(getIcon("dialog-warning", 16)).pixmap(16, 16)
 
         self.m_lastAlsaIndexType = AlsaFile.INVALID
+        # a daemon has been launched and does not run its bridge yet
+        self.m_alsaBridgeStarting = False
+        self.m_alsaStatusSerial = 0
+
+        # Slow parts (processes to start, system bus, /sys) run in
+        # workers, their panels show placeholders until filled.
+        self.m_mainThread = MainThreadCaller(self)
+        self.m_initPool = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix='caleson-init')
+        # closing the window may only hide it in the systray
+        QApplication.instance().aboutToQuit.connect(
+            self.slot_shutdownWorkers)
+        self.m_pendingInit = set[str]()
 
         if jacklib and not jacklib.JACK2:
             self.ui.b_jack_switchmaster.setEnabled(False)
 
         # -------------------------------------------------------------
         # Set-up GUI (System Information)
-        info = platform_.get_info()
-        self.ui.label_info_os.setText(info[0])
-        self.ui.label_info_version.setText(info[1])
-        self.ui.label_info_arch.setText(get_architecture())
+        sections.next("System Information")
+        for label in (self.ui.label_info_os,
+                      self.ui.label_info_version,
+                      self.ui.label_info_arch):
+            label.setText("...")
+
+        self.runInBackground(
+            "system-information",
+            lambda: platform_.get_info() + (get_architecture(),),
+            self._systemInformationReceived)
 
         # Set-up GUI (System Status)
+        sections.next("System Status")
 
         self.m_availGovPath = \
             "/sys/devices/system/cpu/cpu0/cpufreq/scaling_available_governors"
@@ -203,81 +284,34 @@ class CalesonMainW(QMainWindow):
             "/sys/devices/system/cpu/cpu0/cpufreq/scaling_governor"
         self.m_curGovPaths = list[str]()
         self.m_curGovCPUs = list[int]()
+        self.m_availGovList = list[str]()
+        self.m_govWatcher = None
 
-        try:
-            fBus = dbus.SystemBus(mainloop=gDBus.loop)
-            fProxy = fBus.get_object(
-                "com.ubuntu.IndicatorCpufreqSelector",
-                "/Selector",
-                introspect=False)
-            haveFreqSelector = True
-        except:
-            haveFreqSelector = False
-
-        if (haveFreqSelector
-                and os.path.exists(self.m_availGovPath)
-                and os.path.exists(self.m_curGovPath)):
-            self.m_govWatcher = QFileSystemWatcher(self)
-            self.m_govWatcher.addPath(self.m_curGovPath)
-            self.m_govWatcher.fileChanged.connect(
-                self.slot_governorFileChanged)
-            QTimer.singleShot(0, self.slot_governorFileChanged)
+        # enabled once governors are found
+        self.ui.cb_cpufreq.setEnabled(False)
 
-            availGovFd = open(self.m_availGovPath, "r")
-            availGovRead = availGovFd.read().strip()
-            availGovFd.close()
-
-            self.m_availGovList = availGovRead.split(" ")
-            for availGov in self.m_availGovList:
-                self.ui.cb_cpufreq.addItem(availGov)
-
-            for root, dirs, files in os.walk("/sys/devices/system/cpu/"):
-                for dir_ in [dir_ for dir_ in dirs if dir_.startswith("cpu")]:
-                    if not dir_.replace("cpu", "", 1).isdigit():
-                        continue
-
-                    cpuGovPath = os.path.join(
-                        root, dir_, "cpufreq", "scaling_governor")
-
-                    if os.path.exists(cpuGovPath):
-                        self.m_curGovPaths.append(cpuGovPath)
-                        self.m_curGovCPUs.append(
-                            int(dir_.replace("cpu", "", 1)))
-
-            self.ui.cb_cpufreq.setCurrentIndex(-1)
-
-        else:
-            self.m_govWatcher = None
-            self.ui.cb_cpufreq.setEnabled(False)
-            self.ui.label_cpufreq.setEnabled(False)
+        self.runInBackground(
+            "cpu-governors",
+            lambda: probeCpuGovernors(self.m_availGovPath, self.m_curGovPath),
+            self._cpuGovernorsReceived)
 
         # -------------------------------------------------------------
         # Set-up GUI (System Checks)
+        sections.next("System Checks")
 
-        for check in calesonSystemChecks:
-            if check.get_id() == 'kernel':
-                self.ui.labelUsedKernel.setText(check.result)
-                if check.moreInfo:
-                    self.ui.labelUsedKernel.setToolTip(check.moreInfo)
-                widgetIcon = self.ui.labelUsedKernelIcon
-                
-            elif check.get_id() == 'audio_group':
-                self.ui.labelUserInAudioGroup.setText(check.result)
-                if check.moreInfo:
-                    self.ui.labelUserInAudioGroup.setToolTip(check.moreInfo)
-                widgetIcon = self.ui.labelUserInAudioGroupIcon
+        self.ui.labelUsedKernel.setText(self.tr("Checking..."))
+        self.ui.labelUserInAudioGroup.setText(self.tr("Checking..."))
 
-            if check.icon == check.ICON_ERROR:
-                widgetIcon.setPixmap(self.pix_error)
-            elif check.icon == check.ICON_WARN:
-                widgetIcon.setPixmap(self.pix_warning)
-            elif check.icon == check.ICON_OK:
-                widgetIcon.setPixmap(self.pix_apply)
-            else:
-                widgetIcon.setPixmap(self.pix_cancel)
+        def systemChecks() -> list[CalesonSystemCheck]:
+            initSystemChecks(platform_)
+            return calesonSystemChecks
+
+        self.runInBackground(
+            "system-checks", systemChecks, self._systemChecksReceived)
 
         # -------------------------------------------------------------
         # Set-up GUI (JACK Bridges)
+        sections.next("JACK Bridges")
         
         self.pulse_bridges_edited.connect(self.slot_PulseAudioBridgeSetEdited)
         self._pulse_check_timer = QTimer()
@@ -290,16 +324,11 @@ class CalesonMainW(QMainWindow):
             #self.toolBox_pulseaudio.setEnabled(False)
             self.ui.label_bridge_pulse.setText(self.tr("PulseAudio is not installed"))
         
-        self._pulse_bridge_dicts = pulse2jack_tool.get_existing_modules_in_dicts()
-        for bridge_dict in self._pulse_bridge_dicts:
-            if bridge_dict['type'] == 'source':
-                source_item = PaBridgeItem(self.ui.listWidgetPulseSources,
-                                           self.pulse_bridges_edited, bridge_dict)
-                self.ui.listWidgetPulseSources.addItem(source_item)
-            else:
-                sink_item = PaBridgeItem(self.ui.listWidgetPulseSinks,
-                                         self.pulse_bridges_edited, bridge_dict)
-                self.ui.listWidgetPulseSinks.addItem(sink_item)
+        # filled by slot_checkPulseAudioBridges
+        self._pulse_bridge_dicts = list[dict]()
+        self._pulse_check_serial = 0
+        self.m_pendingInit.add("pulse-bridges")
+        self.slot_checkPulseAudioBridges()
         
         # Not available in cxfreeze builds
         if sys.argv[0].endswith("/caleson"):
@@ -307,6 +336,7 @@ class CalesonMainW(QMainWindow):
 
         # -------------------------------------------------------------
         # Set-up GUI (Tweaks)
+        sections.next("Tweaks")
 
         self.settings_changed_types = list[str]()
         self.ui.frame_tweaks_settings.setVisible(False)
@@ -319,6 +349,7 @@ class CalesonMainW(QMainWindow):
 
         # -------------------------------------------------------------
         # Set-up GUI (Tweaks, WineASIO)
+        sections.next("WineASIO")
 
         if have_wine():
             ins = int(
@@ -354,6 +385,7 @@ class CalesonMainW(QMainWindow):
 
         # -------------------------------------------------------------
         # Set-up systray
+        sections.next("systray")
 
         self.systray = systray.GlobalSysTray(self, "Caleson", "caleson")
 
@@ -397,6 +429,7 @@ class CalesonMainW(QMainWindow):
 
         # -------------------------------------------------------------
         # Set-up connections
+        sections.next("connections")
 
         self.ui.b_jack_start.clicked.connect(self.slot_JackServerStart)
         self.ui.b_jack_stop.clicked.connect(self.slot_JackServerStop)
@@ -461,14 +494,35 @@ class CalesonMainW(QMainWindow):
             self.slot_A2JBridgeUniquePortNames)
 
         # -------------------------------------------------------------
-
+        # Set-up JACK status
+        sections.next("JACK status")
+
+        self.m_jack_status = JackStatusEngine(self)
+        self.m_jack_status.dsp_load_changed.connect(
+            self.slot_jackDspLoadChanged)
+        self.m_jack_status.xruns_changed.connect(
+            self.slot_jackXrunsChanged)
+        self.m_jack_status.buffer_size_changed.connect(
+            self.slot_jackBufferSizeChanged)
+        self.m_jack_status.sample_rate_changed.connect(
+            self.slot_jackSampleRateChanged)
+        self.m_jack_status.server_shutdown.connect(
+            self.slot_jackServerShutdown)
+
+        # only used if the JACK status engine can not start
         self.m_last_dsp_load = None
         self.m_last_xruns = None
         self.m_last_buffer_size = None
 
         self.m_timer500 = None
-        self.m_timer2000 = self.startTimer(2000)
+        self.m_timer2000 = None
+
+        # last states known from DBus replies and signals
+        self.m_jack_started = False
+        self.m_a2j_started = False
+        self.m_patchbay = PatchbayMirror()
 
+        sections.next("DBus")
         self.DBusReconnect()
 
         if haveDBus:
@@ -480,11 +534,102 @@ class CalesonMainW(QMainWindow):
                 interface_keyword='interface',
                 sender_keyword='sender')
 
+        sections.end()
+
+    def runInBackground(self, name: str, func, callback):
+        '''run func in a worker, then callback with its result
+        in the main thread. startup_finished is emitted once
+        all functions run this way during startup are done.'''
+        self.m_pendingInit.add(name)
+
+        def traced_func():
+            with tracing.span(name):
+                return func()
+
+        self.m_mainThread.on_done(
+            self.m_initPool.submit(traced_func),
+            lambda result: self._backgroundDone(name, callback, result),
+            lambda error: self._backgroundFailed(name, error))
+
+    def _backgroundDone(self, name: str, callback, result):
+        try:
+            callback(result)
+        finally:
+            self._initDone(name)
+
+    def _backgroundFailed(self, name: str, error: BaseException):
+        _logger.error(f"Startup task {name} failed: {error}")
+        self._initDone(name)
+
+    def _initDone(self, name: str):
+        if name not in self.m_pendingInit:
+            return
+
+        self.m_pendingInit.discard(name)
+        if not self.m_pendingInit:
+            tracing.instant("startup finished")
+            self.startup_finished.emit()
+
+    def _systemInformationReceived(self, info: tuple[str, str, str]):
+        self.ui.label_info_os.setText(info[0])
+        self.ui.label_info_version.setText(info[1])
+        self.ui.label_info_arch.setText(info[2])
+
+    def _cpuGovernorsReceived(self, governors):
+        if governors is None:
+            self.ui.cb_cpufreq.setEnabled(False)
+            self.ui.label_cpufreq.setEnabled(False)
+            return
+
+        self.m_availGovList, self.m_curGovPaths, self.m_curGovCPUs = governors
+
+        self.m_govWatcher = QFileSystemWatcher(self)
+        self.m_govWatcher.addPath(self.m_curGovPath)
+        self.m_govWatcher.fileChanged.connect(
+            self.slot_governorFileChanged)
+
+        for availGov in self.m_availGovList:
+            self.ui.cb_cpufreq.addItem(availGov)
+
+        self.ui.cb_cpufreq.setCurrentIndex(-1)
+        self.ui.cb_cpufreq.setEnabled(True)
+        self.slot_governorFileChanged()
+
+    def _systemChecksReceived(self, checks: list[CalesonSystemCheck]):
+        # no checks on this platform
+        self.ui.labelUsedKernel.setText("")
+        self.ui.labelUserInAudioGroup.setText("")
+
+        for check in checks:
+            if check.get_id() == 'kernel':
+                self.ui.labelUsedKernel.setText(check.result)
+                if check.moreInfo:
+                    self.ui.labelUsedKernel.setToolTip(check.moreInfo)
+                widgetIcon = self.ui.labelUsedKernelIcon
+                
+            elif check.get_id() == 'audio_group':
+                self.ui.labelUserInAudioGroup.setText(check.result)
+                if check.moreInfo:
+                    self.ui.labelUserInAudioGroup.setToolTip(check.moreInfo)
+                widgetIcon = self.ui.labelUserInAudioGroupIcon
+
+            if check.icon == check.ICON_ERROR:
+                widgetIcon.setPixmap(self.pix_error)
+            elif check.icon == check.ICON_WARN:
+                widgetIcon.setPixmap(self.pix_warning)
+            elif check.icon == check.ICON_OK:
+                widgetIcon.setPixmap(self.pix_apply)
+            else:
+                widgetIcon.setPixmap(self.pix_cancel)
+
+    @tracing.traced("DBusReconnect")
     def DBusReconnect(self):
         if haveDBus:
+            # no introspection, it would be a blocking call
             try:
                 gDBus.jack = gDBus.bus.get_object(
-                    "org.jackaudio.service", "/org/jackaudio/Controller")
+                    "org.jackaudio.service", "/org/jackaudio/Controller",
+                    introspect=False)
                 gDBus.patchbay = dbus.Interface(
                     gDBus.jack, "org.jackaudio.JackPatchbay")
                 jacksettings.initBus(gDBus.bus)
@@ -494,54 +639,23 @@ class CalesonMainW(QMainWindow):
 
             try:
                 gDBus.a2j = dbus.Interface(
-                    gDBus.bus.get_object("org.gna.home.a2jmidid", "/"),
+                    gDBus.bus.get_object(
+                        "org.gna.home.a2jmidid", "/", introspect=False),
                     "org.gna.home.a2jmidid.control")
             except:
                 gDBus.a2j = None
 
         if gDBus.jack:
-            if gDBus.jack.IsStarted():
-                # Check for pulseaudio in jack graph
-                try:
-                    version, groups, conns = gDBus.patchbay.GetGraph(0)
-                except:
-                    version, groups, conns = (list(), list(), list())
-
-                for group_id, group_name, ports in groups:
-                    if group_name == "alsa2jack":
-                        global jackClientIdALSA
-                        jackClientIdALSA = group_id
-
-                self.jackStarted()
-
-            else:
-                self.jackStopped()
-                self.ui.label_jack_realtime.setText(
-                    self.tr("Yes") if jacksettings.isRealtime() else self.tr("No"))
+            on_done(jack_call("IsStarted"),
+                    self._jackIsStartedReceived,
+                    lambda error: self.jackUnavailable())
         else:
-            self.jackStopped()
-            self.ui.label_jack_status.setText(self.tr("Unavailable"))
-            self.ui.label_jack_status_ico.setPixmap(self.pix_error)
-            self.ui.label_jack_realtime.setText(self.tr("Unknown"))
-            self.ui.label_jack_realtime_ico.setPixmap(self.pix_error)
-            self.ui.groupBox_jack.setEnabled(False)
-            self.ui.groupBox_jack.setTitle(self.tr("-- jackdbus is not available --"))
-            self.ui.b_jack_start.setEnabled(False)
-            self.ui.b_jack_stop.setEnabled(False)
-            self.ui.b_jack_restart.setEnabled(False)
-            self.ui.b_jack_configure.setEnabled(False)
-            self.ui.b_jack_switchmaster.setEnabled(False)
+            self.jackUnavailable()
 
         if gDBus.a2j:
-            try:
-                started = gDBus.a2j.is_started()
-            except:
-                started = False
-
-            if started:
-                self.a2jStarted()
-            else:
-                self.a2jStopped()
+            on_done(a2j_call("is_started"),
+                    self._a2jIsStartedReceived,
+                    lambda error: self._a2jIsStartedReceived(False))
         else:
             self.ui.cb_a2j_autostart.setChecked(False)
             self.ui.cb_a2j_autoexport.setChecked(False)
@@ -551,6 +665,42 @@ class CalesonMainW(QMainWindow):
 
         self.updateSystrayTooltip()
 
+    def _jackIsStartedReceived(self, started: bool):
+        tracing.instant("JACK IsStarted reply", started=bool(started))
+        if started:
+            self.jackStarted()
+            self.updateSystrayTooltip()
+        else:
+            self.jackStopped()
+            self.ui.label_jack_realtime.setText(
+                self.tr("Yes") if jacksettings.isRealtime() else self.tr("No"))
+            self.updateSystrayTooltip()
+
+    def _jackGraphReceived(self, patchbay: PatchbayMirror):
+        # the ALSA bridge is found in the graph
+        self.checkAlsaAudio()
+
+    def _a2jIsStartedReceived(self, started: bool):
+        if started:
+            self.a2jStarted()
+        else:
+            self.a2jStopped()
+
+    def jackUnavailable(self):
+        self.jackStopped()
+        self.ui.label_jack_status.setText(self.tr("Unavailable"))
+        self.ui.label_jack_status_ico.setPixmap(self.pix_error)
+        self.ui.label_jack_realtime.setText(self.tr("Unknown"))
+        self.ui.label_jack_realtime_ico.setPixmap(self.pix_error)
+        self.ui.groupBox_jack.setEnabled(False)
+        self.ui.groupBox_jack.setTitle(self.tr("-- jackdbus is not available --"))
+        self.ui.b_jack_start.setEnabled(False)
+        self.ui.b_jack_stop.setEnabled(False)
+        self.ui.b_jack_restart.setEnabled(False)
+        self.ui.b_jack_configure.setEnabled(False)
+        self.ui.b_jack_switchmaster.setEnabled(False)
+        self.updateSystrayTooltip()
+
     def DBusSignalReceiver(self, *args, **kwds):
         if (kwds['interface'] == "org.freedesktop.DBus"
                 and kwds['path'] == "/org/freedesktop/DBus"
@@ -560,6 +710,8 @@ class CalesonMainW(QMainWindow):
             if not newId:
                 # Something crashed
                 if appInterface == "org.jackaudio.service":
+                    # graph versions of a new service are unrelated
+                    self.m_patchbay.clear()
                     QTimer.singleShot(0, self.slot_handleCrash_jack)
                 elif appInterface == "org.gna.home.a2jmidid":
                     QTimer.singleShot(0, self.slot_handleCrash_a2j)
@@ -578,13 +730,16 @@ class CalesonMainW(QMainWindow):
                 _logger.debug(
                     f"org.jackaudio.JackPatchbay, {kwds['member']}")
 
+                self.m_patchbay.signal_received(kwds['member'], args)
+
                 if kwds['member'] == "ClientAppeared":
                     self.DBusJackClientAppearedCallback.emit(
                         args[IJackDbus.CLIENT_ID.value],
                         args[IJackDbus.CLIENT_NAME.value])
                 elif kwds['member'] == "ClientDisappeared":
                     self.DBusJackClientDisappearedCallback.emit(
-                        args[IJackDbus.CLIENT_ID.value])
+                        args[IJackDbus.CLIENT_ID.value],
+                        args[IJackDbus.CLIENT_NAME.value])
 
         elif kwds['interface'] == "org.gna.home.a2jmidid.control":
             _logger.debug(
@@ -596,9 +751,7 @@ class CalesonMainW(QMainWindow):
                 self.DBusA2JBridgeStoppedCallback.emit()
 
     def jackStarted(self):
-        self.m_last_dsp_load = gDBus.jack.GetLoad()
-        self.m_last_xruns = int(gDBus.jack.GetXruns())
-        self.m_last_buffer_size = gDBus.jack.GetBufferSize()
+        self.m_jack_started = True
 
         self.ui.b_jack_start.setEnabled(False)
         self.ui.b_jack_stop.setEnabled(True)
@@ -609,48 +762,111 @@ class CalesonMainW(QMainWindow):
         self.ui.label_jack_status.setText(self.tr("Started"))
         self.ui.label_jack_status_ico.setPixmap(self.pix_apply)
 
-        if gDBus.jack.IsRealtime():
+        on_done(jack_call("IsRealtime"), self._jackRealtimeReceived)
+        # the patchbay has been rebuilt by jackdbus
+        on_done(self.m_patchbay.sync(), self._jackGraphReceived)
+
+        if self.m_jack_status.start():
+            # labels are updated by the status engine signals
+            on_done(jack_call("GetXruns"), self._jackXrunsReceived)
+            self.m_jack_status.set_load_polling(self.isVisible())
+        else:
+            # fallback, poll jackdbus
+            self.m_last_dsp_load = None
+            self.m_last_xruns = None
+            self.m_last_buffer_size = None
+            self.pollJackdbusStatus()
+
+            self.killJackStatusTimers()
+            self.m_timer500 = self.startTimer(500)
+            self.m_timer2000 = self.startTimer(2000)
+
+        if gDBus.a2j:
+            self.a2jAutoStart()
+
+        self.checkAlsaAudio()
+        self.checkPulseAudio()
+
+    def _jackXrunsReceived(self, xruns: int):
+        # the status client counts xruns since its activation, it may
+        # have counted some after jackdbus replied. Both counts are
+        # lower bounds of the server count, keep the largest.
+        self.m_jack_status.set_xruns(
+            max(int(xruns), self.m_jack_status.xruns()))
+
+    def _jackRealtimeReceived(self, realtime: bool):
+        if realtime:
             self.ui.label_jack_realtime.setText(self.tr("Yes"))
             self.ui.label_jack_realtime_ico.setPixmap(self.pix_apply)
         else:
             self.ui.label_jack_realtime.setText(self.tr("No"))
             self.ui.label_jack_realtime_ico.setPixmap(self.pix_cancel)
+        self.updateSystrayTooltip()
 
-        self.ui.label_jack_dsp.setText("%.2f%%" % self.m_last_dsp_load)
-        self.ui.label_jack_xruns.setText(str(self.m_last_xruns))
-        self.ui.label_jack_bfsize.setText(self.tr("%i samples") % self.m_last_buffer_size)
-        self.ui.label_jack_srate.setText("%i Hz" % gDBus.jack.GetSampleRate())
-        self.ui.label_jack_latency.setText("%.1f ms" % gDBus.jack.GetLatency())
-
-        self.m_timer500 = self.startTimer(500)
-        self.m_timer2000 = self.startTimer(2000)
-
-        if gDBus.a2j and not gDBus.a2j.is_started():
-            portsExported = bool(gDBus.a2j.get_hw_export())
-            unique_port_names = not bool(gDBus.a2j.get_disable_port_uniqueness())
-            if GlobalSettings.value("A2J/AutoStart", True, type=bool):
-                if not portsExported and GlobalSettings.value("A2J/AutoExport", True, type=bool):
-                    gDBus.a2j.set_hw_export(True)
-                    # portsExported = True
-                    
-                if not unique_port_names:
-                    gDBus.a2j.set_disable_port_uniqueness(True)
-
-                gDBus.a2j.start()
-            else:
+    def a2jAutoStart(self):
+        def started_received(started: bool):
+            if started:
+                return
+
+            if not GlobalSettings.value("A2J/AutoStart", True, type=bool):
                 self.ui.b_a2j_start.setEnabled(True)
                 self.systray.setActionEnabled("a2j_start", True)
+                return
 
-        self.checkAlsaAudio()
-        self.checkPulseAudio()
+            # a2jmidid handles its calls in order,
+            # no need to wait for the set_hw_export reply.
+            if GlobalSettings.value("A2J/AutoExport", True, type=bool):
+                a2j_call("set_hw_export", True)
+            on_done(a2j_call("get_disable_port_uniqueness"),
+                    uniqueness_received)
+
+        def uniqueness_received(disabled: bool):
+            if disabled:
+                a2j_call("set_disable_port_uniqueness", True)
+            on_done(a2j_call("start"))
+
+        on_done(a2j_call("is_started"), started_received)
+
+    def pollJackdbusStatus(self):
+        'Status update when the JACK status engine is not available'
+        on_done(jack_call("GetLoad"), self._polledLoadReceived)
+        on_done(jack_call("GetXruns"), self._polledXrunsReceived)
+        on_done(jack_call("GetBufferSize"), self._polledBufferSizeReceived)
+        on_done(jack_call("GetSampleRate"), self._polledSampleRateReceived)
+
+    def _polledLoadReceived(self, dsp_load: float):
+        if self.m_last_dsp_load != dsp_load:
+            self.m_last_dsp_load = dsp_load
+            self.ui.label_jack_dsp.setText("%.2f%%" % dsp_load)
+            self.updateSystrayTooltip()
+
+    def _polledXrunsReceived(self, xruns: int):
+        if self.m_last_xruns != int(xruns):
+            self.m_last_xruns = int(xruns)
+            self.ui.label_jack_xruns.setText(str(self.m_last_xruns))
+            self.updateSystrayTooltip()
+
+    def _polledBufferSizeReceived(self, buffer_size: int):
+        if self.m_last_buffer_size != buffer_size:
+            self.m_last_buffer_size = buffer_size
+            self.ui.label_jack_bfsize.setText(
+                self.tr("%i samples") % buffer_size)
+            on_done(jack_call("GetLatency"), self._polledLatencyReceived)
+
+    def _polledSampleRateReceived(self, sample_rate: int):
+        self.ui.label_jack_srate.setText("%i Hz" % sample_rate)
+        self.updateSystrayTooltip()
+
+    def _polledLatencyReceived(self, latency: float):
+        self.ui.label_jack_latency.setText("%.1f ms" % latency)
+        self.updateSystrayTooltip()
 
     def jackStopped(self):
-        if self.m_timer500:
-            self.killTimer(self.m_timer500)
-            self.m_timer500 = None
-        if self.m_timer2000:
-            self.killTimer(self.m_timer2000)
-            self.m_timer2000 = None
+        self.m_jack_started = False
+        # graph versions restart with the next server start
+        self.m_patchbay.clear()
+        self.m_jack_status.stop()
+        self.killJackStatusTimers()
 
         self.m_last_dsp_load = None
         self.m_last_xruns = None
@@ -677,27 +893,36 @@ class CalesonMainW(QMainWindow):
             self.ui.b_a2j_start.setEnabled(False)
             self.systray.setActionEnabled("a2j_start", False)
 
-        global jackClientIdALSA
-        jackClientIdALSA = -1
-
         if haveDBus:
             self.checkAlsaAudio()
             self.checkPulseAudio()
 
+    def killJackStatusTimers(self):
+        if self.m_timer500:
+            self.killTimer(self.m_timer500)
+            self.m_timer500 = None
+        if self.m_timer2000:
+            self.killTimer(self.m_timer2000)
+            self.m_timer2000 = None
+
     def a2jStarted(self):
+        self.m_a2j_started = True
         self.ui.b_a2j_start.setEnabled(False)
         self.ui.b_a2j_stop.setEnabled(True)
         self.systray.setActionEnabled("a2j_start", False)
         self.systray.setActionEnabled("a2j_stop", True)
-        if bool(gDBus.a2j.get_hw_export()):
+        self.ui.label_bridge_a2j.setText(
+            self.tr("ALSA MIDI Bridge is running"))
+        on_done(a2j_call("get_hw_export"), self._a2jHwExportReceived)
+
+    def _a2jHwExportReceived(self, exported: bool):
+        if exported and self.m_a2j_started:
             self.ui.label_bridge_a2j.setText(
                 self.tr("ALSA MIDI Bridge is running, ports are exported"))
-        else :
-            self.ui.label_bridge_a2j.setText(
-                self.tr("ALSA MIDI Bridge is running"))
 
     def a2jStopped(self):
-        jackRunning = bool(gDBus.jack and gDBus.jack.IsStarted())
+        self.m_a2j_started = False
+        jackRunning = self.m_jack_started
         self.ui.b_a2j_start.setEnabled(jackRunning)
         self.ui.b_a2j_stop.setEnabled(False)
         self.systray.setActionEnabled("a2j_start", jackRunning)
@@ -720,22 +945,9 @@ class CalesonMainW(QMainWindow):
             asoundrcRead = asoundrcFd.read().strip()
 
         if asoundrcRead.startswith(ASOUNDRC_ALOOP_CHECK):
-            if isAlsaAudioBridged():
-                self.ui.b_alsa_start.setEnabled(False)
-                self.ui.b_alsa_stop.setEnabled(True)
-                self.ui.label_bridge_alsa.setText(
-                    self.tr("Using Caleson snd-aloop daemon, started"))
-            else:
-                try:
-                    jackRunning = bool(gDBus.jack and gDBus.jack.IsStarted())
-                except:
-                    jackRunning = False
-
-                self.ui.b_alsa_start.setEnabled(jackRunning)
-                self.ui.b_alsa_stop.setEnabled(False)
-                self.ui.label_bridge_alsa.setText(
-                    self.tr("Using Caleson snd-aloop daemon, stopped"))
-
+            running = self.alsaAudioBridgeInGraph()
+            if running is not None:
+                self.showAlsaAudioState(running)
             self.ui.cb_alsa_type.setCurrentIndex(AlsaFile.LOOP.value)
             self.ui.tb_alsa_options.setEnabled(True)
 
@@ -767,6 +979,70 @@ class CalesonMainW(QMainWindow):
         self.m_lastAlsaIndexType = AlsaFile(
             self.ui.cb_alsa_type.currentIndex())
 
+        if self.m_lastAlsaIndexType is AlsaFile.LOOP:
+            # details (and state without graph) come with the daemon reply
+            self.requestAlsaAudioStatus()
+
+    def alsaAudioBridgeInGraph(self) -> Optional[bool]:
+        '''True if the alsa2jack client of the bridge is in the JACK graph,
+        None if the graph is not known.'''
+        if not self.m_jack_started or not self.m_patchbay.is_synced():
+            return None
+        return self.m_patchbay.has_client("alsa2jack")
+
+    def requestAlsaAudioStatus(self):
+        # only the reply to the last request is used
+        self.m_alsaStatusSerial += 1
+        serial = self.m_alsaStatusSerial
+
+        request = aloop_control.AsyncRequest(aloop_control.CMD_STATUS, self)
+        request.replied.connect(
+            lambda daemonStatus: self._alsaAudioStatusReceived(
+                serial, daemonStatus))
+        request.send()
+
+    def _alsaAudioStatusReceived(self, serial: int,
+                                 daemonStatus: Optional[dict]):
+        if (serial != self.m_alsaStatusSerial
+                or self.m_lastAlsaIndexType is not AlsaFile.LOOP):
+            return
+
+        running = self.alsaAudioBridgeInGraph()
+        if running is None:
+            running = bool(daemonStatus and daemonStatus.get("running"))
+        self.showAlsaAudioState(running, daemonStatus)
+
+    def showAlsaAudioState(self, running: bool,
+                           daemonStatus: Optional[dict]=None):
+        if running:
+            self.m_alsaBridgeStarting = False
+            self.ui.b_alsa_start.setEnabled(False)
+            self.ui.b_alsa_stop.setEnabled(True)
+            self.ui.label_bridge_alsa.setText(
+                self.tr("Using Caleson snd-aloop daemon, started"))
+            if daemonStatus is not None:
+                self.ui.label_bridge_alsa.setToolTip(
+                    self.tr("%s, PIDs: %s\nAutomatic restarts: %i") % (
+                        daemonStatus.get("bridge", ""),
+                        ", ".join(str(pid)
+                                  for pid in daemonStatus.get("pids", [])),
+                        daemonStatus.get("restart_count", 0)))
+
+        elif self.m_alsaBridgeStarting:
+            # the daemon may not listen yet
+            self.ui.b_alsa_start.setEnabled(False)
+            self.ui.b_alsa_stop.setEnabled(True)
+            self.ui.label_bridge_alsa.setText(
+                self.tr("Using Caleson snd-aloop daemon, starting..."))
+            self.ui.label_bridge_alsa.setToolTip("")
+
+        else:
+            self.ui.b_alsa_start.setEnabled(self.m_jack_started)
+            self.ui.b_alsa_stop.setEnabled(False)
+            self.ui.label_bridge_alsa.setText(
+                self.tr("Using Caleson snd-aloop daemon, stopped"))
+            self.ui.label_bridge_alsa.setToolTip("")
+
     def checkPulseAudio(self):
         if not havePulseAudio:
             self.systray.setActionEnabled("pulse_start", False)
@@ -783,7 +1059,7 @@ class CalesonMainW(QMainWindow):
                 self.systray.setActionEnabled("pulse_stop", True)
                 mess = self.tr("PulseAudio is started and bridged to JACK")
             else:
-                jackRunning = bool(gDBus.jack and gDBus.jack.IsStarted())
+                jackRunning = self.m_jack_started
                 self.ui.b_pulse_start.setEnabled(jackRunning)
                 self.ui.b_pulse_stop.setEnabled(False)
                 self.systray.setActionEnabled("pulse_start", jackRunning)
@@ -793,7 +1069,7 @@ class CalesonMainW(QMainWindow):
                 else:
                     mess = self.tr("PulseAudio is started but JACK is stopped")
         else:
-            jackRunning = bool(gDBus.jack and gDBus.jack.IsStarted())
+            jackRunning = self.m_jack_started
             self.ui.b_pulse_start.setEnabled(jackRunning)
             self.ui.b_pulse_stop.setEnabled(False)
             self.systray.setActionEnabled("pulse_start", jackRunning)
@@ -856,21 +1132,47 @@ class CalesonMainW(QMainWindow):
     @pyqtSlot(int, str)
     def slot_DBusJackClientAppearedCallback(self, group_id, group_name):
         if group_name == "alsa2jack":
-            global jackClientIdALSA
-            jackClientIdALSA = group_id
             self.checkAlsaAudio()
 
         self._pulse_check_timer.start()
 
-    @pyqtSlot(int)
-    def slot_DBusJackClientDisappearedCallback(self, group_id):
-        global jackClientIdALSA
-        if group_id == jackClientIdALSA:
-            jackClientIdALSA = -1
+    @pyqtSlot(int, str)
+    def slot_DBusJackClientDisappearedCallback(self, group_id, group_name):
+        if group_name == "alsa2jack":
             self.checkAlsaAudio()
         
         self._pulse_check_timer.start()
 
+    @pyqtSlot(float)
+    def slot_jackDspLoadChanged(self, dsp_load: float):
+        self.ui.label_jack_dsp.setText("%.2f%%" % dsp_load)
+        self.updateSystrayTooltip()
+
+    @pyqtSlot(int)
+    def slot_jackXrunsChanged(self, xruns: int):
+        self.ui.label_jack_xruns.setText(str(xruns))
+        self.updateSystrayTooltip()
+
+    @pyqtSlot(int)
+    def slot_jackBufferSizeChanged(self, buffer_size: int):
+        self.ui.label_jack_bfsize.setText(self.tr("%i samples") % buffer_size)
+        self.ui.label_jack_latency.setText(
+            "%.1f ms" % self.m_jack_status.latency_ms())
+        self.updateSystrayTooltip()
+
+    @pyqtSlot(int)
+    def slot_jackSampleRateChanged(self, sample_rate: int):
+        self.ui.label_jack_srate.setText("%i Hz" % sample_rate)
+        self.ui.label_jack_latency.setText(
+            "%.1f ms" % self.m_jack_status.latency_ms())
+        self.updateSystrayTooltip()
+
+    @pyqtSlot()
+    def slot_jackServerShutdown(self):
+        # jackdbus also sends ServerStopped, unless it died with JACK
+        if self.m_jack_started:
+            self.jackStopped()
+
     @pyqtSlot()
     def slot_DBusA2JBridgeStartedCallback(self):
         self.a2jStarted()
@@ -881,7 +1183,27 @@ class CalesonMainW(QMainWindow):
 
     @pyqtSlot()
     def slot_checkPulseAudioBridges(self):
-        self._pulse_bridge_dicts = pulse2jack_tool.get_existing_modules_in_dicts()
+        # get_existing_modules_in_dicts starts pactl, run it in a worker.
+        # Only the reply to the last request is used.
+        self._pulse_check_serial += 1
+        serial = self._pulse_check_serial
+        self.m_mainThread.on_done(
+            self.m_initPool.submit(
+                pulse2jack_tool.get_existing_modules_in_dicts),
+            lambda bridge_dicts: self._pulseBridgesReceived(
+                serial, bridge_dicts),
+            lambda error: self._pulseBridgesFailed(serial, error))
+
+    def _pulseBridgesFailed(self, serial: int, error: BaseException):
+        _logger.error(f"Unable to list PulseAudio bridges: {error}")
+        if serial == self._pulse_check_serial:
+            self._initDone("pulse-bridges")
+
+    def _pulseBridgesReceived(self, serial: int, bridge_dicts: list[dict]):
+        if serial != self._pulse_check_serial:
+            return
+
+        self._pulse_bridge_dicts = bridge_dicts
         self.ui.listWidgetPulseSources.clear()
         self.ui.listWidgetPulseSinks.clear()
         
@@ -897,33 +1219,34 @@ class CalesonMainW(QMainWindow):
         
         self.ui.b_pulse_apply.setEnabled(False)
         self.checkPulseAudio()
+        self._initDone("pulse-bridges")
 
     @pyqtSlot()
     def slot_JackServerStart(self):
         self.saveSettings()
-        try:
-            gDBus.jack.StartServer()
-        except:
-            QMessageBox.warning(
-                self,
-                self.tr("Warning"),
-                self.tr("Failed to start JACK, please check the logs for more information."))
+        on_done(jack_call("StartServer"),
+                errback=lambda error: QMessageBox.warning(
+                    self,
+                    self.tr("Warning"),
+                    self.tr("Failed to start JACK, please check the logs for more information.")))
 
     @pyqtSlot()
     def slot_JackServerStop(self):
-        if gDBus.a2j and bool(gDBus.a2j.is_started()):
-            gDBus.a2j.stop()
-        try:
-            gDBus.jack.StopServer()
-        except:
-            QMessageBox.warning(
-                self,
-                self.tr("Warning"),
-                self.tr("Failed to stop JACK, please check the logs for more information."))
+        def stop_server(*args):
+            on_done(jack_call("StopServer"),
+                    errback=lambda error: QMessageBox.warning(
+                        self,
+                        self.tr("Warning"),
+                        self.tr("Failed to stop JACK, please check the logs for more information.")))
+
+        if gDBus.a2j and self.m_a2j_started:
+            on_done(a2j_call("stop"), stop_server, stop_server)
+        else:
+            stop_server()
 
     @pyqtSlot()
     def slot_JackServerForceRestart(self):
-        if gDBus.jack.IsStarted():
+        if self.m_jack_started:
             ask = CustomMessageBox(
                 self, QMessageBox.Warning, self.tr("Warning"),
                 self.tr("This will force kill all JACK applications!<br>Make sure to save your projects before continue."),
@@ -932,13 +1255,8 @@ class CalesonMainW(QMainWindow):
             if ask != QMessageBox.Yes:
                 return
 
-        if self.m_timer500:
-            self.killTimer(self.m_timer500)
-            self.m_timer500 = None
-        
-        if self.m_timer2000:
-            self.killTimer(self.m_timer2000)
-            self.m_timer2000 = None
+        self.m_jack_status.stop()
+        self.killJackStatusTimers()
 
         self.saveSettings()
         force_restart.ForceWaitDialog(self).exec_()
@@ -951,32 +1269,55 @@ class CalesonMainW(QMainWindow):
 
     @pyqtSlot()
     def slot_JackServerSwitchMaster(self):
-        try:
-            gDBus.jack.SwitchMaster()
-        except:
-            QMessageBox.warning(
-                self,
-                self.tr("Warning"),
-                self.tr("Failed to switch JACK master, please check the logs for more information."))
-            return
-
-        self.jackStarted()
+        on_done(jack_call("SwitchMaster"),
+                lambda ret: self.jackStarted(),
+                lambda error: QMessageBox.warning(
+                    self,
+                    self.tr("Warning"),
+                    self.tr("Failed to switch JACK master, please check the logs for more information.")))
 
     @pyqtSlot()
     def slot_JackClearXruns(self):
         if gDBus.jack:
-            gDBus.jack.ResetXruns()
+            on_done(jack_call("ResetXruns"))
+
+            if self.m_jack_status.is_active():
+                self.m_jack_status.set_xruns(0)
 
     @pyqtSlot()
     def slot_AlsaBridgeStart(self):
-        self.slot_AlsaBridgeStop()
-        startAlsaAudioLoopBridge()
+        def previousStopped(reply: Optional[dict]):
+            startAlsaAudioLoopBridge()
+            QTimer.singleShot(ALSA_BRIDGE_START_TIMEOUT,
+                              self._alsaBridgeStartTimedOut)
+            self.checkAlsaAudio()
+
+        self.m_alsaBridgeStarting = True
+
+        # a running daemon is stopped first
+        request = aloop_control.AsyncRequest(
+            aloop_control.CMD_STOP, self, aloop_control.STOP_TIMEOUT)
+        request.replied.connect(previousStopped)
+        request.send()
+
+    def _alsaBridgeStartTimedOut(self):
+        if self.m_alsaBridgeStarting:
+            self.m_alsaBridgeStarting = False
+            self.checkAlsaAudio()
 
     @pyqtSlot()
     def slot_AlsaBridgeStop(self):
-        checkFile = "/tmp/.caleson-aloop-daemon.x"
-        if os.path.exists(checkFile):
-            os.remove(checkFile)
+        def stopped(reply: Optional[dict]):
+            if reply is not None:
+                self.checkAlsaAudio()
+
+        self.m_alsaBridgeStarting = False
+
+        # the daemon replies once its bridges are stopped
+        request = aloop_control.AsyncRequest(
+            aloop_control.CMD_STOP, self, aloop_control.STOP_TIMEOUT)
+        request.replied.connect(stopped)
+        request.send()
 
     @pyqtSlot(int)
     def slot_AlsaBridgeChanged(self, index: int):
@@ -1038,35 +1379,35 @@ class CalesonMainW(QMainWindow):
 
     @pyqtSlot()
     def slot_A2JBridgeStart(self):
-        gDBus.a2j.start()
+        on_done(a2j_call("start"))
 
     @pyqtSlot()
     def slot_A2JBridgeStop(self):
-        gDBus.a2j.stop()
+        on_done(a2j_call("stop"))
 
-    @pyqtSlot(int)
-    def slot_A2JBridgeExportHW(self, state):
-        a2jWasStarted = bool(gDBus.a2j.is_started())
+    def a2jRestartWith(self, method: str, value: bool):
+        '''set an a2j option, restarting a2j if needed.
+        a2jmidid processes the calls in order, they can be all sent now.'''
+        if not gDBus.a2j:
+            return
 
-        if a2jWasStarted:
-            gDBus.a2j.stop()
+        a2j_was_started = self.m_a2j_started
 
-        gDBus.a2j.set_hw_export(bool(state))
+        if a2j_was_started:
+            a2j_call("stop")
+
+        on_done(a2j_call(method, value))
 
-        if a2jWasStarted:
-            gDBus.a2j.start()
+        if a2j_was_started:
+            on_done(a2j_call("start"))
+
+    @pyqtSlot(int)
+    def slot_A2JBridgeExportHW(self, state):
+        self.a2jRestartWith("set_hw_export", bool(state))
 
     @pyqtSlot(int)
     def slot_A2JBridgeUniquePortNames(self, state: int):
-        a2j_was_started = bool(gDBus.a2j.is_started())
-        
-        if a2j_was_started:
-            gDBus.a2j.stop()
-            
-        gDBus.a2j.set_disable_port_uniqueness(not bool(state))
-        
-        if a2j_was_started:
-            gDBus.a2j.start()
+        self.a2jRestartWith("set_disable_port_uniqueness", not bool(state))
 
     @pyqtSlot()
     def slot_PulseAudioBridgeApply(self):
@@ -1287,39 +1628,31 @@ class CalesonMainW(QMainWindow):
 
     def timerEvent(self, event):
         if event.timerId() == self.m_timer500:
-            if gDBus.jack and self.m_last_dsp_load != None:
-                next_dsp_load = gDBus.jack.GetLoad()
-                next_xruns = int(gDBus.jack.GetXruns())
-                needUpdateTip = False
-
-                if self.m_last_dsp_load != next_dsp_load:
-                    self.m_last_dsp_load = next_dsp_load
-                    self.ui.label_jack_dsp.setText("%.2f%%" % self.m_last_dsp_load)
-                    needUpdateTip = True
-
-                if self.m_last_xruns != next_xruns:
-                    self.m_last_xruns = next_xruns
-                    self.ui.label_jack_xruns.setText(str(self.m_last_xruns))
-                    needUpdateTip = True
-
-                if needUpdateTip:
-                    self.updateSystrayTooltip()
+            if gDBus.jack and self.m_jack_started:
+                on_done(jack_call("GetLoad"), self._polledLoadReceived)
+                on_done(jack_call("GetXruns"), self._polledXrunsReceived)
 
         elif event.timerId() == self.m_timer2000:
-            if gDBus.jack and self.m_last_buffer_size != None:
-                next_buffer_size = gDBus.jack.GetBufferSize()
+            if gDBus.jack and self.m_jack_started:
+                on_done(jack_call("GetBufferSize"),
+                        self._polledBufferSizeReceived)
 
-                if self.m_last_buffer_size != next_buffer_size:
-                    self.m_last_buffer_size = next_buffer_size
-                    self.ui.label_jack_bfsize.setText(
-                        self.tr("%i samples") % self.m_last_buffer_size)
-                    self.ui.label_jack_latency.setText(
-                        "%.1f ms" % gDBus.jack.GetLatency())
+        QMainWindow.timerEvent(self, event)
 
-            else:
-                self.update()
+    def showEvent(self, event):
+        self.m_jack_status.set_load_polling(True)
+        QMainWindow.showEvent(self, event)
 
-        QMainWindow.timerEvent(self, event)
+    def hideEvent(self, event):
+        # no need to wake up for a DSP load nobody can see
+        self.m_jack_status.set_load_polling(False)
+        QMainWindow.hideEvent(self, event)
+
+    @pyqtSlot()
+    def slot_shutdownWorkers(self):
+        # queued tasks are useless now, running ones are bounded
+        # by their subprocess and DBus timeouts
+        self.m_initPool.shutdown(wait=False, cancel_futures=True)
 
     def closeEvent(self, event: QCloseEvent):
         self.saveSettings()
@@ -1328,6 +1661,9 @@ class CalesonMainW(QMainWindow):
 
 #--------------- main ------------------
 if __name__ == '__main__':
+    # --profile writes a trace of the startup
+    sys.argv = tracing.setup(sys.argv)
+
     # App initialization
     app = QApplication(sys.argv)
     app.setApplicationName("Caleson")
@@ -1340,10 +1676,9 @@ if __name__ == '__main__':
         gDBus.loop = DBusMainLoop(set_as_default=True)
         gDBus.bus = dbus.SessionBus(mainloop=gDBus.loop)
 
-    initSystemChecks(platform_)
-
-    # Show GUI
-    gui = CalesonMainW()
+    # Show GUI, system checks are run by the window, in the background
+    with tracing.span("CalesonMainW"):
+        gui = CalesonMainW()
 
     # Set-up custom signal handling
     setUpSignals(gui)
@@ -1353,7 +1688,12 @@ if __name__ == '__main__':
         gui.systray.setActionText("show", gui.tr("Restore"))
         app.setQuitOnLastWindowClosed(False)
     else:
-        gui.show()
+        with tracing.span("show"):
+            gui.show()
+
+    # first event loop iteration, the window is painted just before
+    if tracing.is_enabled():
+        QTimer.singleShot(0, lambda: tracing.instant("event loop started"))
 
     # Exit properly
     sys.exit(gui.systray.exec_(app))
@@ -20,16 +20,24 @@
 
 # Imports (Global)
 
+import errno
 import logging
 import os
+import signal
+import socket
 import sys
-from signal import signal, SIGINT, SIGTERM
-from time import sleep
 
-from PyQt5.QtCore import QProcess
+from PyQt5.QtCore import (
+    QCoreApplication, QObject, QProcess,
+    QSocketNotifier, QTimer, pyqtSignal, pyqtSlot)
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
 
 # Imports (Custom Stuff)
 
+import aloop_control
+import jack_dispatcher
+from jack_dispatcher import JackDispatcher, JackEvent
+from jack_graph import GRAPH_EVENTS, JackGraph
 import jacklib
 
 
@@ -38,117 +46,442 @@ _logger = logging.getLogger(__name__)
 # --------------------------------------------------
 # Auto re-activate if on good kernel
 
-global reactivateCounter
-reactivateCounter = -1
 isKernelGood = [int(i) for i in os.uname()[2].split("-", 1)[0].split(".", 2)[:2]] >= [3,8]
 
-# --------------------------------------------------
-# Global loop check
-
-global doLoop, doRunNow, useZita, procIn, procOut
-doLoop = True
-doRunNow = True
-useZita = False
-procIn = QProcess()
-procOut = QProcess()
-checkFile = "/tmp/.caleson-aloop-daemon.x"
-
-# --------------------------------------------------
-# Global JACK variables
-
-global bufferSize, sampleRate, channels
-bufferSize = 1024
-sampleRate = 44100
-channels = 2
-
-# --------------------------------------------------
-# quit on SIGINT or SIGTERM
+# delays before restarting a bridge which stopped by itself (ms)
+RESTART_DELAY_MIN = 200
+RESTART_DELAY_MAX = 5000
+
+# connections of new bridge ports are made once their client is active,
+# JACK2 refuses them before. Retried every CONNECT_RETRY_INTERVAL ms,
+# at most CONNECT_RETRY_MAX times.
+CONNECT_RETRY_INTERVAL = 100
+CONNECT_RETRY_MAX = 50
+
+
+class AloopDaemon(QObject):
+    '''Runs alsa_in/alsa_out (or zita-a2j/j2a) on the snd-aloop device.
+
+    Everything happens in the Qt event loop:
+    JACK callbacks, bridge processes exit, unix signals and requests
+    on the control socket (see aloop_control) wake it up,
+    it sleeps otherwise.'''
+
+    # emitted from JACK threads when events are queued,
+    # received (queued) in the main thread
+    _jack_events = pyqtSignal()
+
+    def __init__(self, channels: int, useZita: bool, channelMap: dict):
+        QObject.__init__(self)
+
+        self.fChannels = channels
+        self.fUseZita = useZita
+        # {bridge channel: system channel}, missing channels are not mapped
+        # to another number, mapping to 0 disables the connection.
+        self.fChannelMap = channelMap
+        self.fBridgeName = "zita-a2j/j2a" if useZita else "alsa_in/out"
+
+        self.fClient = None
+        self.fBufferSize = 1024
+        self.fSampleRate = 44100
+
+        self.fProcIn = QProcess(self)
+        self.fProcOut = QProcess(self)
+        self.fRestarting = False
+        self.fRestartDelay = RESTART_DELAY_MIN
+        self.fRestartCount = 0
+        self.fLastExitCode = None
+
+        for proc in (self.fProcIn, self.fProcOut):
+            proc.finished.connect(self.slot_bridgeFinished)
+
+        self.fRestartTimer = QTimer(self)
+        self.fRestartTimer.setSingleShot(True)
+        self.fRestartTimer.timeout.connect(self.runAlsaBridge)
+
+        # a bridge running long enough is considered stable
+        self.fStableTimer = QTimer(self)
+        self.fStableTimer.setSingleShot(True)
+        self.fStableTimer.setInterval(RESTART_DELAY_MAX * 2)
+        self.fStableTimer.timeout.connect(self.slot_bridgeStable)
+
+        # {(source port, destination port): failed attempts}
+        self.fPendingConnections = dict[tuple[str, str], int]()
+        self.fConnectTimer = QTimer(self)
+        self.fConnectTimer.setInterval(CONNECT_RETRY_INTERVAL)
+        self.fConnectTimer.timeout.connect(self.slot_connectPending)
+
+        self.fServer = QLocalServer(self)
+        self.fServer.newConnection.connect(self.slot_newConnection)
+
+        self.fDispatcher = JackDispatcher(wakeup=self._jack_events.emit)
+        self._jack_events.connect(self.slot_processJackEvents)
+        self.fDispatcher.subscribe(
+            jack_dispatcher.EVENT_BUFFER_SIZE,
+            lambda event: self.slot_bufferSizeChanged(event.args[0]))
+        self.fDispatcher.subscribe(
+            jack_dispatcher.EVENT_SAMPLE_RATE,
+            lambda event: self.slot_sampleRateChanged(event.args[0]))
+        self.fDispatcher.subscribe(
+            jack_dispatcher.EVENT_SHUTDOWN,
+            lambda event: self.slot_jackShutdown())
+        # JackGraph of our client, created in start
+        self.fGraph = None
+
+        self.fSignalNotifier = None
+        self.fSignalSockets = None
+
+    # --------------------------------------------------
+    # quit on SIGINT or SIGTERM, without polling:
+    # python writes the signal number to our socket
+
+    def installSignalHandlers(self):
+        readSock, writeSock = socket.socketpair()
+        readSock.setblocking(False)
+        writeSock.setblocking(False)
+        self.fSignalSockets = (readSock, writeSock)
+
+        signal.set_wakeup_fd(writeSock.fileno())
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            # python handler is required for the wakeup fd to be written
+            signal.signal(sig, lambda *args: None)
+
+        self.fSignalNotifier = QSocketNotifier(
+            readSock.fileno(), QSocketNotifier.Read, self)
+        self.fSignalNotifier.activated.connect(self.slot_signalReceived)
+
+    @pyqtSlot()
+    def slot_signalReceived(self):
+        try:
+            self.fSignalSockets[0].recv(64)
+        except OSError:
+            pass
+        self.quit()
+
+    # --------------------------------------------------
+    # JACK
+
+    def start(self) -> bool:
+        self.fClient = jacklib.client_open(
+            "caleson-aloop-daemon", jacklib.JackUseExactName, None)
+
+        if not self.fClient:
+            _logger.error("caleson-aloop-daemon is already running")
+            return False
+
+        # we are the only instance, a remaining socket is stale
+        QLocalServer.removeServer(aloop_control.socket_path())
+        self.fServer.setSocketOptions(QLocalServer.UserAccessOption)
+        if not self.fServer.listen(aloop_control.socket_path()):
+            _logger.error(
+                "Unable to listen on control socket "
+                f"{aloop_control.socket_path()}: {self.fServer.errorString()}")
+            jacklib.client_close(self.fClient)
+            self.fClient = None
+            return False
+
+        # the graph is updated first, subscribers read it after
+        self.fGraph = JackGraph(self.fClient)
+        self.fGraph.attach(self.fDispatcher)
+        self.fDispatcher.subscribe(
+            jack_dispatcher.EVENT_PORT_REGISTRATION,
+            self.portRegistrationReceived)
+        self.fDispatcher.subscribe(
+            jack_dispatcher.EVENT_OVERFLOW,
+            lambda event: self.connectAllBridgePorts())
+
+        self.fDispatcher.install(
+            self.fClient, (jack_dispatcher.EVENT_BUFFER_SIZE,
+                           jack_dispatcher.EVENT_SAMPLE_RATE,
+                           jack_dispatcher.EVENT_SHUTDOWN) + GRAPH_EVENTS)
+        jacklib.activate(self.fClient)
+        self.fGraph.build()
+
+        # Get initial values
+        self.fSampleRate = jacklib.get_sample_rate(self.fClient)
+        self.fBufferSize = jacklib.get_buffer_size(self.fClient)
+
+        _logger.info(
+            "caleson-aloop-daemon started, "
+            f"using {self.fBridgeName} and {self.fChannels} channels")
+
+        self.runAlsaBridge()
+        return True
+
+    def quit(self):
+        QCoreApplication.quit()
+
+    def close(self):
+        self.fRestartTimer.stop()
+        self.fConnectTimer.stop()
+        self.fPendingConnections.clear()
+        self.stopAlsaBridge()
+
+        if self.fClient:
+            jacklib.deactivate(self.fClient)
+            jacklib.client_close(self.fClient)
+            self.fClient = None
+
+        if self.fGraph is not None:
+            self.fGraph.detach(self.fDispatcher)
+            self.fGraph = None
+
+        if self.fServer.isListening():
+            self.fServer.close()
+
+    # JACK events, queued by the dispatcher in JACK threads,
+    # delivered here in the Qt thread
+
+    @pyqtSlot()
+    def slot_processJackEvents(self):
+        self.fDispatcher.process_pending()
+
+    def portRegistrationReceived(self, event: JackEvent):
+        portId, register = event.args
+        if not register:
+            return
 
-def signal_handler(sig, frame=0):
-    global doLoop
-    doLoop = False
+        port = self.fGraph.port_by_id(portId)
+        if port is not None:
+            self.portRegistered(port.name)
+
+    @pyqtSlot(int)
+    def slot_bufferSizeChanged(self, bufferSize: int):
+        if bufferSize != self.fBufferSize:
+            self.fBufferSize = bufferSize
+            self.runAlsaBridge()
+
+    @pyqtSlot(int)
+    def slot_sampleRateChanged(self, sampleRate: int):
+        if sampleRate != self.fSampleRate:
+            self.fSampleRate = sampleRate
+            self.runAlsaBridge()
+
+    @pyqtSlot()
+    def slot_jackShutdown(self):
+        # client is unusable after shutdown
+        self.fClient = None
+        self.quit()
+
+    # --------------------------------------------------
+    # control socket
+
+    @pyqtSlot()
+    def slot_newConnection(self):
+        while self.fServer.hasPendingConnections():
+            sock = self.fServer.nextPendingConnection()
+            sock.readyRead.connect(self.slot_controlReadyRead)
+            sock.disconnected.connect(sock.deleteLater)
+
+    @pyqtSlot()
+    def slot_controlReadyRead(self):
+        sock: QLocalSocket = self.sender()
+
+        while sock.canReadLine():
+            message = aloop_control.decode(bytes(sock.readLine()))
+            if message is None:
+                reply = {'error': 'invalid request'}
+            else:
+                reply = self.controlRequest(message.get('command'))
+
+            sock.write(aloop_control.encode(reply))
+            sock.flush()
+
+            if message is not None \
+                    and message.get('command') == aloop_control.CMD_STOP:
+                # let the reply leave before quitting
+                sock.waitForBytesWritten(100)
+                self.quit()
+                return
+
+    def controlRequest(self, command) -> dict:
+        if command == aloop_control.CMD_STATUS:
+            return self.status()
+
+        if command == aloop_control.CMD_START:
+            if not self.isBridgeRunning():
+                self.fRestartDelay = RESTART_DELAY_MIN
+                self.runAlsaBridge()
+            return self.status()
+
+        if command == aloop_control.CMD_RESTART:
+            self.fRestartDelay = RESTART_DELAY_MIN
+            self.runAlsaBridge()
+            return self.status()
+
+        if command == aloop_control.CMD_STOP:
+            # JACK client released before the reply,
+            # so a new daemon can be started right after.
+            self.close()
+            return self.status()
+
+        return {'error': f"unknown command '{command}'"}
+
+    def isBridgeRunning(self) -> bool:
+        return any(proc.state() != QProcess.NotRunning
+                   for proc in (self.fProcIn, self.fProcOut))
+
+    def status(self) -> dict:
+        return {
+            'running': self.isBridgeRunning(),
+            'bridge': self.fBridgeName,
+            'channels': self.fChannels,
+            'pids': [proc.processId() for proc in (self.fProcIn, self.fProcOut)
+                     if proc.state() != QProcess.NotRunning],
+            'restart_count': self.fRestartCount,
+            'last_exit_code': self.fLastExitCode,
+            'buffer_size': self.fBufferSize,
+            'sample_rate': self.fSampleRate}
+
+    # --------------------------------------------------
+    # run alsa_in and alsa_out
+
+    def stopAlsaBridge(self):
+        self.fRestarting = True
+
+        for proc in (self.fProcIn, self.fProcOut):
+            if proc.state() != QProcess.NotRunning:
+                proc.terminate()
+                if not proc.waitForFinished(1000):
+                    proc.kill()
+                    proc.waitForFinished(500)
+
+        self.fRestarting = False
+
+    @pyqtSlot()
+    def runAlsaBridge(self):
+        self.fRestartTimer.stop()
+        self.stopAlsaBridge()
+        # for ports of the stopped bridges
+        self.fPendingConnections.clear()
+
+        env = ["JACK_SAMPLE_RATE=%i" % self.fSampleRate,
+               "JACK_PERIOD_SIZE=%i" % self.fBufferSize]
+        sampleRate = "%i" % self.fSampleRate
+        bufferSize = "%i" % self.fBufferSize
+        channels = "%i" % self.fChannels
+
+        if self.fUseZita:
+            self.fProcIn.start("env", env + ["zita-a2j", "-d", "hw:Loopback,1,0", "-r", sampleRate, "-p", bufferSize, "-j", "alsa2jack", "-c", channels])
+            self.fProcOut.start("env", env + ["zita-j2a", "-d", "hw:Loopback,1,1", "-r", sampleRate, "-p", bufferSize, "-j", "jack2alsa", "-c", channels])
+        else:
+            self.fProcIn.start("env", env + ["alsa_in",  "-d", "cloop", sampleRate, "-p", bufferSize, "-j", "alsa2jack", "-q", "1", "-c", channels])
+            self.fProcOut.start("env", env + ["alsa_out", "-d", "ploop", sampleRate, "-p", bufferSize, "-j", "jack2alsa", "-q", "1", "-c", channels])
+
+        # ports are connected when the bridges register them
+        self.fStableTimer.start()
+
+    # --------------------------------------------------
+    # connect bridge ports as soon as they appear
+
+    def systemChannel(self, bridgeChannel: int) -> int:
+        return self.fChannelMap.get(bridgeChannel, bridgeChannel)
+
+    def connectLater(self, sourcePort: str, destinationPort: str):
+        '''ports of a bridge are registered before its client
+        is activated, connections are made by slot_connectPending.'''
+        if (self.fGraph.port(sourcePort) is None
+                or self.fGraph.port(destinationPort) is None
+                or self.fGraph.is_connected(sourcePort, destinationPort)):
+            return
 
-# --------------------------------------------------
-# listen to jack buffer-size and sample-rate changes
+        self.fPendingConnections.setdefault((sourcePort, destinationPort), 0)
+        if not self.fConnectTimer.isActive():
+            self.fConnectTimer.start()
 
-def buffer_size_callback(newBufferSize, arg):
-    global doRunNow, bufferSize
-    bufferSize = newBufferSize
-    doRunNow = True
-    return 0
+    @pyqtSlot()
+    def slot_connectPending(self):
+        if not self.fClient:
+            self.fPendingConnections.clear()
+            self.fConnectTimer.stop()
+            return
 
-def sample_rate_callback(newSampleRate, arg):
-    global doRunNow, sampleRate
-    sampleRate = newSampleRate
-    doRunNow = True
-    return 0
+        for ports, attempts in list(self.fPendingConnections.items()):
+            ret = jacklib.connect(self.fClient, *ports)
+            if ret in (0, errno.EEXIST):
+                del self.fPendingConnections[ports]
+            elif attempts + 1 >= CONNECT_RETRY_MAX:
+                _logger.warning(
+                    f"Unable to connect {ports[0]} to {ports[1]} ({ret})")
+                del self.fPendingConnections[ports]
+            else:
+                self.fPendingConnections[ports] = attempts + 1
 
-# --------------------------------------------------
-# listen to jack2 master switch
+        if not self.fPendingConnections:
+            self.fConnectTimer.stop()
 
-def client_registration_callback(clientName, register, arg):
-    global doLoop, doRunNow, reactivateCounter, useZita
+    def connectAllBridgePorts(self):
+        'after lost JACK events, the graph has been scanned again'
+        for port in self.fGraph.ports():
+            self.portRegistered(port.name)
 
-    if clientName in (b"alsa2jack", b"jack2alsa") and not register:
-        if doRunNow or not doLoop:
+    def portRegistered(self, portName: str):
+        clientName, colon, shortName = portName.partition(":")
+        prefix, underscore, number = shortName.rpartition("_")
+        if not number.isdigit():
+            return
+        channel = int(number)
+
+        if clientName == "alsa2jack" and prefix == "capture":
+            if 0 < self.systemChannel(channel):
+                self.connectLater(
+                    portName, "system:playback_%i" % self.systemChannel(channel))
+
+        elif clientName == "jack2alsa" and prefix == "playback":
+            if 0 < self.systemChannel(channel):
+                self.connectLater(
+                    "system:capture_%i" % self.systemChannel(channel), portName)
+
+        elif clientName == "system":
+            # system ports re-created (driver restarted after the bridge)
+            for bridgeChannel in range(1, self.fChannels + 1):
+                if self.systemChannel(bridgeChannel) != channel:
+                    continue
+
+                if prefix == "playback":
+                    self.connectLater(
+                        "alsa2jack:capture_%i" % bridgeChannel, portName)
+                elif prefix == "capture":
+                    self.connectLater(
+                        portName, "jack2alsa:playback_%i" % bridgeChannel)
+
+    @pyqtSlot(int, QProcess.ExitStatus)
+    def slot_bridgeFinished(self, exitCode: int, exitStatus):
+        self.fLastExitCode = exitCode
+
+        if self.fRestarting or self.fRestartTimer.isActive():
             return
 
-        bridge_name = "zita-a2j/j2a" if useZita else "alsa_in/out"
-
-        if isKernelGood:
-            if reactivateCounter == -1:
-                reactivateCounter = 0
-                _logger.info(
-                    f"NOTICE: {bridge_name} has been stopped, "
-                    "waiting 5 secs to reactivate")
-        elif doLoop:
-            doLoop = False
+        if not isKernelGood:
             _logger.info(
-                f"NOTICE: {bridge_name} has been stopped, quitting now...")
-
-# --------------------------------------------------
-# listen to jack shutdown
+                f"NOTICE: {self.fBridgeName} has been stopped, quitting now...")
+            self.quit()
+            return
 
-def shutdown_callback(arg):
-    global doLoop
-    doLoop = False
+        _logger.info(
+            f"NOTICE: {self.fBridgeName} has been stopped, reactivating "
+            f"in {self.fRestartDelay} ms")
+        self.fStableTimer.stop()
+        self.fRestartTimer.start(self.fRestartDelay)
+        self.fRestartCount += 1
+        self.fRestartDelay = min(self.fRestartDelay * 2, RESTART_DELAY_MAX)
 
-# --------------------------------------------------
-# run alsa_in and alsa_out
-def run_alsa_bridge():
-    global reactivateCounter
-    global bufferSize, sampleRate, channels
-    global procIn, procOut
-    global useZita
-
-    if procIn.state() != QProcess.NotRunning:
-        procIn.terminate()
-        procIn.waitForFinished(1000)
-    if procOut.state() != QProcess.NotRunning:
-        procOut.terminate()
-        procOut.waitForFinished(1000)
-
-    reactivateCounter = -1
-
-    if useZita:
-        procIn.start("env",  ["JACK_SAMPLE_RATE=%i" % sampleRate, "JACK_PERIOD_SIZE=%i" % bufferSize, "zita-a2j", "-d", "hw:Loopback,1,0", "-r", "%i" % sampleRate, "-p", "%i" % bufferSize, "-j", "alsa2jack", "-c", "%i" % channels])
-        procOut.start("env", ["JACK_SAMPLE_RATE=%i" % sampleRate, "JACK_PERIOD_SIZE=%i" % bufferSize, "zita-j2a", "-d", "hw:Loopback,1,1", "-r", "%i" % sampleRate, "-p", "%i" % bufferSize, "-j", "jack2alsa", "-c", "%i" % channels])
-    else:
-        procIn.start("env",  ["JACK_SAMPLE_RATE=%i" % sampleRate, "JACK_PERIOD_SIZE=%i" % bufferSize, "alsa_in",  "-d", "cloop", "%i" % sampleRate, "-p", "%i" % bufferSize, "-j", "alsa2jack", "-q", "1", "-c", "%i" % channels])
-        procOut.start("env", ["JACK_SAMPLE_RATE=%i" % sampleRate, "JACK_PERIOD_SIZE=%i" % bufferSize, "alsa_out", "-d", "ploop", "%i" % sampleRate, "-p", "%i" % bufferSize, "-j", "jack2alsa", "-q", "1", "-c", "%i" % channels])
-
-    if procIn.waitForStarted():
-        sleep(1)
-        jacklib.connect(client, "alsa2jack:capture_1", "system:playback_1")
-        jacklib.connect(client, "alsa2jack:capture_2", "system:playback_2")
-
-    if procOut.waitForStarted():
-        sleep(1)
-        jacklib.connect(client, "system:capture_1", "jack2alsa:playback_1")
-        jacklib.connect(client, "system:capture_2", "jack2alsa:playback_2")
+    @pyqtSlot()
+    def slot_bridgeStable(self):
+        self.fRestartDelay = RESTART_DELAY_MIN
 
 
 if __name__ == '__main__':
+    # restarts, backoff and connections are logged at info level,
+    # they are the only diagnostics of the daemon
+    logging.basicConfig(
+        level=logging.INFO,
+        format="caleson-aloop-daemon: %(levelname)s: %(message)s")
+
+    useZita = False
+    channels = 2
+    channelMap = dict[int, int]()
+
     for i in range(len(sys.argv)):
         if i == 0:
             continue
@@ -162,70 +495,24 @@ if __name__ == '__main__':
 
             if chStr.isdigit():
                 channels = int(chStr)
+        elif argv.startswith("--channel-map="):
+            # bridge:system pairs, as "1:3,2:4"
+            for pair in argv.replace("--channel-map=", "").split(","):
+                bridgeCh, colon, systemCh = pair.partition(":")
+                if bridgeCh.isdigit() and systemCh.isdigit():
+                    channelMap[int(bridgeCh)] = int(systemCh)
+                else:
+                    _logger.warning(f"Invalid channel map pair '{pair}'")
 
-    # Init JACK client
-    client = jacklib.client_open(
-        "caleson-aloop-daemon", jacklib.JackUseExactName, None)
-
-    if not client:
-        _logger.error("caleson-aloop-daemon is already running, "
-                      "delete \"/tmp/.caleson-aloop-daemon.x\" to close it")
-        quit()
+    app = QCoreApplication(sys.argv)
 
-    if jacklib.JACK2:
-        jacklib.set_client_registration_callback(
-            client, client_registration_callback, None)
+    daemon = AloopDaemon(channels, useZita, channelMap)
+    daemon.installSignalHandlers()
 
-    jacklib.set_buffer_size_callback(client, buffer_size_callback, None)
-    jacklib.set_sample_rate_callback(client, sample_rate_callback, None)
-    jacklib.on_shutdown(client, shutdown_callback, None)
-    jacklib.activate(client)
-
-    # Quit when requested
-    signal(SIGINT, signal_handler)
-    signal(SIGTERM, signal_handler)
-
-    # Get initial values
-    sampleRate = jacklib.get_sample_rate(client)
-    bufferSize = jacklib.get_buffer_size(client)
-
-    # Create check file
-    if not os.path.exists(checkFile):
-        os.mknod(checkFile)
+    if not daemon.start():
+        sys.exit(1)
 
     # Keep running until told otherwise
-    firstStart = True
-    while doLoop and os.path.exists(checkFile):
-        if doRunNow:
-            if firstStart:
-                firstStart = False
-                bridge_name = "zita-a2j/j2a" if useZita else "alsa_in/out"
-                _logger.info(
-                    "caleson-aloop-daemon started, "
-                    f"using {bridge_name} and {channels} channels")
-
-            run_alsa_bridge()
-            doRunNow = False
-
-        elif isKernelGood and reactivateCounter >= 0:
-            if reactivateCounter == 5:
-                reactivateCounter = -1
-                doRunNow = True
-            else:
-                reactivateCounter += 1
-
-        sleep(1)
-
-    # Close JACK client
-    jacklib.deactivate(client)
-    jacklib.client_close(client)
-
-    if os.path.exists(checkFile):
-        os.remove(checkFile)
+    app.exec_()
 
-    if procIn.state() != QProcess.NotRunning:
-        procIn.terminate()
-        procIn.waitForFinished(1000)
-    if procOut.state() != QProcess.NotRunning:
-        procOut.terminate()
-        procOut.waitForFinished(1000)
+    daemon.close()
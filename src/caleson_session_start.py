@@ -5,21 +5,27 @@
 import logging
 import os
 import sys
-import time
 
 import dbus
 from PyQt5.QtCore import QCoreApplication
 
 # Imports (Custom Stuff)
+import aloop_control
 import pulse2jack_tool
+import tracing
 from shared_caleson import (
     QSettings, stopAllAudioProcesses, wantJackStart, AlsaFile,
     startAlsaAudioLoopBridge)
 from shared import VERSION, HOME
+from task_graph import Task, TaskGraph, TaskState
 
 
 _logger = logging.getLogger(__name__)
 
+# seconds given to the ALSA loop daemon to answer it is running,
+# the login sequence slept 0.5s after launching it
+ALSA_AUDIO_BRIDGE_READY_TIMEOUT = 1.0
+
 
 # Caleson Global Settings
 GlobalSettings = QSettings("Caleson", "GlobalSettings")
@@ -76,14 +82,56 @@ def startSession(systemStarted, secondSystemStartAttempt) -> bool:
         if started:
             return True
 
+    # Tasks start as soon as their dependencies are ready,
+    # bridges are started together once JACK is started.
+    graph = TaskGraph()
+
     # Kill all audio processes first
-    stopAllAudioProcesses()
+    graph.add(Task("stop-audio-processes", stopAllAudioProcesses))
+    graph.add(Task("dbus", connectDBus, ("stop-audio-processes",)))
+    graph.add(Task("jack", startJackWithRetry, ("dbus",),
+                   ready=lambda: bool(DBus.jack.IsStarted()),
+                   ready_timeout=2.0))
 
-    # Connect to DBus
+    # Start bridges according to user settings
+
+    # ALSA-Audio
+    if (GlobalSettings.value(
+                "ALSA-Audio/BridgeIndexType", AlsaFile.NONE.value, type=int)
+            == AlsaFile.LOOP.value):
+        graph.add(Task("alsa-audio-bridge", startAlsaAudioLoopBridge, ("jack",),
+                       ready=isAlsaAudioBridgeRunning,
+                       ready_timeout=ALSA_AUDIO_BRIDGE_READY_TIMEOUT))
+
+    # ALSA-MIDI
+    if GlobalSettings.value("A2J/AutoStart", True, type=bool):
+        graph.add(Task("a2j", startA2J, ("jack",)))
+
+    # PulseAudio
+    if GlobalSettings.value("Pulse2JACK/AutoStart", True, type=bool):
+        graph.add(Task("pulseaudio-bridge", startPulseBridges, ("jack",)))
+
+    with tracing.span("session start"):
+        report = graph.run()
+
+    # login-to-audio latency tracking
+    _logger.info(f"Session start times:\n{report.format()}")
+
+    if report.tasks["jack"].state is not TaskState.DONE:
+        _logger.warning("JACK Failed to Start")
+        return False
+
+    if not report.succeeded():
+        _logger.warning("JACK Started, but some bridges failed")
+    else:
+        _logger.info("JACK Started Successfully")
+    return True
+
+def connectDBus():
     DBus.bus  = dbus.SessionBus()
     DBus.jack = DBus.bus.get_object(
         "org.jackaudio.service", "/org/jackaudio/Controller")
-    
+
     try:
         DBus.a2j = dbus.Interface(
             DBus.bus.get_object("org.gna.home.a2jmidid", "/"),
@@ -91,7 +139,7 @@ def startSession(systemStarted, secondSystemStartAttempt) -> bool:
     except:
         DBus.a2j = None
 
-    
+def startJackWithRetry():
     try:
         startJack()
     except dbus.exceptions.DBusException as e:
@@ -102,57 +150,50 @@ def startSession(systemStarted, secondSystemStartAttempt) -> bool:
         # So, startJack failed, but we try one more time.
         startJack()
 
-    if not bool(DBus.jack.IsStarted()):
-        _logger.warning("JACK Failed to Start")
-        return False
-
-    # Start bridges according to user settings
-
-    # ALSA-Audio
-    if (GlobalSettings.value(
-                "ALSA-Audio/BridgeIndexType", AlsaFile.NONE.value, type=int)
-            == AlsaFile.LOOP.value):
-        startAlsaAudioLoopBridge()
-        time.sleep(0.5)
-
-    # ALSA-MIDI
-    if (GlobalSettings.value("A2J/AutoStart", True, type=bool)
-            and DBus.a2j and not bool(DBus.a2j.is_started())):
-        a2jExportHW = GlobalSettings.value(
-            "A2J/ExportHW", True, type=bool)
-        a2j_unique_port_names = GlobalSettings.value(
-            "A2J/UniquePortNames", True, type=bool)
-        DBus.a2j.set_hw_export(a2jExportHW)
-        DBus.a2j.set_disable_port_uniqueness(not a2j_unique_port_names)
-        DBus.a2j.start()
-
-    # PulseAudio
-    if GlobalSettings.value("Pulse2JACK/AutoStart", True, type=bool):
-        bridge_dicts = GlobalSettings.value("PulseAudio_bridges", type=list)
-        if not bridge_dicts:
-            bridge_dicts = [
-                {"type": "source",
-                "name": "PulseAudio JACK Source",
-                "channels": 2,
-                "connected": True},
-                {"type": "sink",
-                "name": "PulseAudio JACK Sink",
-                "channels": 2,
-                "connected": True}]
-            
-        pulse2jack_tool.replace_hotly(bridge_dicts)
-
-    _logger.info("JACK Started Successfully")
-    return True
+def isAlsaAudioBridgeRunning() -> bool:
+    # the daemon answers once its JACK client is open,
+    # and reports if alsa_in/alsa_out (or zita) are running
+    status = aloop_control.status()
+    return status is not None and bool(status.get("running"))
+
+def startA2J():
+    if not DBus.a2j or bool(DBus.a2j.is_started()):
+        return
+
+    a2jExportHW = GlobalSettings.value(
+        "A2J/ExportHW", True, type=bool)
+    a2j_unique_port_names = GlobalSettings.value(
+        "A2J/UniquePortNames", True, type=bool)
+    DBus.a2j.set_hw_export(a2jExportHW)
+    DBus.a2j.set_disable_port_uniqueness(not a2j_unique_port_names)
+    DBus.a2j.start()
+
+def startPulseBridges():
+    bridge_dicts = GlobalSettings.value("PulseAudio_bridges", type=list)
+    if not bridge_dicts:
+        bridge_dicts = [
+            {"type": "source",
+            "name": "PulseAudio JACK Source",
+            "channels": 2,
+            "connected": True},
+            {"type": "sink",
+            "name": "PulseAudio JACK Sink",
+            "channels": 2,
+            "connected": True}]
+
+    pulse2jack_tool.replace_hotly(bridge_dicts)
 
 def startJack():
     if not bool(DBus.jack.IsStarted()):
-        DBus.jack.StartServer()
+        with tracing.span("StartServer"):
+            DBus.jack.StartServer()
 
 def printArguments():
     sys.stderr.write("""\t-s|--start  \tStart session
 \t   --reset  \tForce-reset all JACK daemons and settings
 \t\t        (disables auto-start at login)
+\t   --profile[=FILE]
+\t\t        Write a trace of the startup (Chrome trace JSON)
 
 \t-h|--help   \tShow this help message
 \t-v|--version\tShow version
@@ -172,6 +213,9 @@ def printVersion():
 
 
 if __name__ == '__main__':
+    # --profile writes a trace of the session start
+    sys.argv = tracing.setup(sys.argv)
+
     # App initialization
     app = QCoreApplication(sys.argv)
     app.setApplicationName("Caleson")
@@ -0,0 +1,136 @@
+# Non blocking calls to jackdbus and a2jmidid.
+#
+# dbus-python calls made without reply_handler wait for the reply,
+# freezing the GUI if jackdbus is slow (StartServer on a busy device...).
+# Calls here return a concurrent.futures.Future, resolved by the DBus
+# main loop (so in the Qt main thread for Caleson).
+
+from concurrent.futures import Future
+import logging
+from typing import Any, Callable, Optional
+
+from shared_canvasjack import gDBus
+
+
+_logger = logging.getLogger(__name__)
+
+# timeouts in seconds
+DEFAULT_TIMEOUT = 5.0
+CALL_TIMEOUTS = {
+    'StartServer': 30.0,
+    'StopServer': 15.0,
+    'SwitchMaster': 15.0,
+    'start': 10.0,
+    'stop': 10.0,
+}
+
+
+class DBusUnavailable(Exception):
+    'The service to call is not (or no more) connected'
+
+
+def _resolved_future(value=None, error: Optional[Exception]=None) -> Future:
+    future = Future()
+    future.set_running_or_notify_cancel()
+    if error is None:
+        future.set_result(value)
+    else:
+        future.set_exception(error)
+    return future
+
+def call_async(proxy, method: str, *args,
+               timeout: Optional[float]=None) -> Future:
+    '''Call `method` on the DBus `proxy` without waiting for the reply.
+    The returned Future gets the reply value (a tuple if the method
+    returns many values) or the DBus exception.'''
+    if proxy is None:
+        return _resolved_future(error=DBusUnavailable(method))
+
+    if timeout is None:
+        timeout = CALL_TIMEOUTS.get(method, DEFAULT_TIMEOUT)
+
+    future = Future()
+    future.set_running_or_notify_cancel()
+
+    def reply_handler(*ret):
+        if not ret:
+            future.set_result(None)
+        elif len(ret) == 1:
+            future.set_result(ret[0])
+        else:
+            future.set_result(ret)
+
+    def error_handler(error: Exception):
+        _logger.debug(f"DBus call {method} failed: {error}")
+        future.set_exception(error)
+
+    try:
+        getattr(proxy, method)(
+            *args, reply_handler=reply_handler,
+            error_handler=error_handler, timeout=timeout)
+    except BaseException as e:
+        future.set_exception(e)
+
+    return future
+
+def jack_call(method: str, *args, timeout: Optional[float]=None) -> Future:
+    return call_async(gDBus.jack, method, *args, timeout=timeout)
+
+def patchbay_call(method: str, *args,
+                  timeout: Optional[float]=None) -> Future:
+    return call_async(gDBus.patchbay, method, *args, timeout=timeout)
+
+def a2j_call(method: str, *args, timeout: Optional[float]=None) -> Future:
+    return call_async(gDBus.a2j, method, *args, timeout=timeout)
+
+def on_done(future: Future,
+            callback: Optional[Callable[[Any], None]]=None,
+            errback: Optional[Callable[[BaseException], None]]=None):
+    '''Run `callback` with the result of `future`,
+    or `errback` with its exception.
+    Without errback, failures are only logged.'''
+    def done(fut: Future):
+        error = fut.exception()
+        if error is not None:
+            if errback is None:
+                _logger.warning(f"Asynchronous DBus call failed: {error}")
+            else:
+                errback(error)
+        elif callback is not None:
+            callback(fut.result())
+
+    future.add_done_callback(done)
+
+def then(future: Future, func: Callable[[Any], Any]) -> Future:
+    '''Returns a Future resolved with func(result of `future`).
+    If func returns a Future, its result is followed.
+    Exceptions are propagated to the returned Future.'''
+    out = Future()
+    out.set_running_or_notify_cancel()
+
+    def follow(fut: Future):
+        error = fut.exception()
+        if error is not None:
+            out.set_exception(error)
+        else:
+            out.set_result(fut.result())
+
+    def done(fut: Future):
+        error = fut.exception()
+        if error is not None:
+            out.set_exception(error)
+            return
+
+        try:
+            ret = func(fut.result())
+        except BaseException as e:
+            out.set_exception(e)
+            return
+
+        if isinstance(ret, Future):
+            ret.add_done_callback(follow)
+        else:
+            out.set_result(ret)
+
+    future.add_done_callback(done)
+    return out
@@ -1,21 +1,28 @@
 
 
+from concurrent.futures import Future, TimeoutError
 from enum import Enum
-import time
+import logging
+from typing import Any, Callable
 
 from PyQt5.QtCore import QThread, pyqtSignal, pyqtSlot, Qt
 from PyQt5.QtWidgets import QDialog, QMessageBox
 
 import pulse2jack_tool
+from main_thread_call import MainThreadCaller
 
 from shared_caleson import (
     GlobalSettings, tryCloseJackDBus,
     stopAllAudioProcesses, startAlsaAudioLoopBridge, AlsaFile)
 from shared_canvasjack import gDBus
+from dbus_async import jack_call, a2j_call, then
 
 import ui_caleson_rwait
 
 
+_logger = logging.getLogger(__name__)
+
+
 class Info(Enum):
     DBUS_CLOSE = 0
     STOPPING_AUDIO_PROCESSES = 1
@@ -31,46 +38,52 @@ class Info(Enum):
 class ForceRestartThread(QThread):
     progressChanged = pyqtSignal(int)
     display_info = pyqtSignal(int)
-    action_request = pyqtSignal(object)
 
     def __init__(self, parent):
         QThread.__init__(self, parent)
 
         self.m_wasStarted = False
-        self.action_request_finished = False
-        self.action_return_data = None
+        # created here, in the main thread
+        self.m_mainThread = MainThreadCaller(self)
 
     def wasJackStarted(self):
         return self.m_wasStarted
 
-    def startA2J(self):
+    def startA2J(self) -> Future:
         ' This function has to be run in main thread '
-        started = gDBus.a2j.is_started()
-        if (not gDBus.a2j.get_hw_export()
-                and GlobalSettings.value("A2J/AutoExport", True, type=bool)):
-            if started:
-                gDBus.a2j.stop()
-                started = False
-            gDBus.a2j.set_hw_export(True)
-            
-        if not started:
-            gDBus.a2j.start()
-
-    def _mainThreadAction(self, action, timeout: int) -> bool:
-        self.action_request_finished = False
-        self.action_request.emit(action)
-        
-        step_time = 50 # 50 ms
-        steps = int(timeout / step_time)
-        
-        for x in range(steps):
-            if self.action_request_finished:
-                break
-            time.sleep(step_time * 0.001)
-        else:
-            return False
-        
-        return True
+        states = {}
+
+        def started_received(started: bool) -> Future:
+            states['started'] = bool(started)
+            return a2j_call("get_hw_export")
+
+        def hw_export_received(hw_export: bool):
+            started = states['started']
+            # a2jmidid processes the calls in order
+            if (not hw_export
+                    and GlobalSettings.value("A2J/AutoExport", True, type=bool)):
+                if started:
+                    a2j_call("stop")
+                    started = False
+                a2j_call("set_hw_export", True)
+
+            if not started:
+                return a2j_call("start")
+
+        return then(then(a2j_call("is_started"), started_received),
+                    hw_export_received)
+
+    def _mainThreadAction(self, action: Callable[[], Any],
+                          timeout: float) -> tuple[bool, Any]:
+        '''run action in the main thread and wait for it (or for the reply
+        of the DBus call it returns). Returns (success, result)'''
+        try:
+            return True, self.m_mainThread.call(action, timeout)
+        except TimeoutError:
+            _logger.error(f"{action} timed out after {timeout}s")
+        except BaseException as e:
+            _logger.error(f"{action} failed: {e}")
+        return False, None
 
     def run(self):
         # Not started yet
@@ -79,8 +92,7 @@ class ForceRestartThread(QThread):
         self.display_info.emit(Info.DBUS_CLOSE.value)
 
         # Stop JACK safely first, if possible
-        self._mainThreadAction(tryCloseJackDBus, 10000)
-        dbus_closed = self.action_return_data
+        success, dbus_closed = self._mainThreadAction(tryCloseJackDBus, 10.0)
         if dbus_closed:
             gDBus.jack = None
 
@@ -94,7 +106,7 @@ class ForceRestartThread(QThread):
 
         # Connect to jackdbus
         self.display_info.emit(Info.DBUS_RECONNECT.value)
-        if not self._mainThreadAction(self.parent().DBusReconnect, 10000):
+        if not self._mainThreadAction(self.parent().DBusReconnect, 10.0)[0]:
             return
         
         if not gDBus.jack:
@@ -103,7 +115,8 @@ class ForceRestartThread(QThread):
         # Start it
         self.display_info.emit(Info.START_JACK.value)
         self.progressChanged.emit(70)
-        if not self._mainThreadAction(gDBus.jack.StartServer, 10000):
+        if not self._mainThreadAction(
+                lambda: jack_call("StartServer"), 10.0)[0]:
             return
 
         self.progressChanged.emit(90)
@@ -111,24 +124,24 @@ class ForceRestartThread(QThread):
         # If we made it this far, then JACK is started
         self.m_wasStarted = True
 
-        # Start bridges according to user settings
+        # Start bridges according to user settings, all at once:
+        # a2j is started by DBus calls resolved in the main thread,
+        # the ALSA daemon runs by itself, PulseAudio commands run here.
+
+        # ALSA-MIDI
+        a2jFuture = None
+        if GlobalSettings.value("A2J/AutoStart", True, type=bool):
+            self.display_info.emit(Info.BRIDGING_A2J.value)
+            a2jFuture = self.m_mainThread.submit(self.startA2J)
 
         # ALSA-Audio
         if (GlobalSettings.value("ALSA-Audio/BridgeIndexType", AlsaFile.NONE.value, type=int)
                 == AlsaFile.LOOP.value):
             self.display_info.emit(Info.BRIDGING_ALSA_AUDIO.value)
             startAlsaAudioLoopBridge()
-            time.sleep(0.5)
 
         self.progressChanged.emit(92)
-            
-        # ALSA-MIDI
-        if GlobalSettings.value("A2J/AutoStart", True, type=bool):
-            self.display_info.emit(Info.BRIDGING_A2J.value)
-            self._mainThreadAction(self.startA2J, 5000)
 
-        self.progressChanged.emit(96)
-        
         # PulseAudio
         if GlobalSettings.value("Pulse2JACK/AutoStart", True, type=bool):
             bridge_dicts = GlobalSettings.value("PulseAudio_bridges", type=list)
@@ -145,6 +158,16 @@ class ForceRestartThread(QThread):
             self.display_info.emit(Info.BRIDGING_PULSEAUDIO.value)
             pulse2jack_tool.replace_hotly(bridge_dicts)
 
+        self.progressChanged.emit(96)
+
+        if a2jFuture is not None:
+            try:
+                a2jFuture.result(5.0)
+            except TimeoutError:
+                _logger.error("a2j start timed out")
+            except BaseException as e:
+                _logger.error(f"a2j start failed: {e}")
+
         self.progressChanged.emit(100)
 
 
@@ -157,7 +180,6 @@ class ForceWaitDialog(QDialog):
         self.setWindowFlags(Qt.Dialog|Qt.WindowCloseButtonHint)
 
         self.rThread = ForceRestartThread(self)
-        self.rThread.action_request.connect(self.slot_actionRequest)
         self.rThread.display_info.connect(self.slot_displayInfo)
         self.rThread.start()
 
@@ -182,12 +204,6 @@ class ForceWaitDialog(QDialog):
             QMessageBox.critical(
                 self, self.tr("Error"), self.tr("Could not start JACK!"))
     
-    @pyqtSlot(object)
-    def slot_actionRequest(self, action):
-        ret = action()
-        self.rThread.action_return_data = ret
-        self.rThread.action_request_finished = True
-        
     @pyqtSlot(int)
     def slot_displayInfo(self, info_int: int):
         info = Info(info_int)
@@ -0,0 +1,262 @@
+# Dispatcher of JACK client notifications to any number of subscribers.
+# JACK notification threads only append a small record to a queue,
+# subscribers are called later, in a consumer thread
+# or in the Qt event loop.
+
+from collections import deque
+from dataclasses import dataclass, field
+import logging
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+from jacklib_helpers import jacklib
+
+
+_logger = logging.getLogger(__name__)
+
+# event kinds
+EVENT_XRUN = 0
+EVENT_BUFFER_SIZE = 1
+EVENT_SAMPLE_RATE = 2
+EVENT_CLIENT_REGISTRATION = 3
+EVENT_CLIENT_RENAME = 4
+EVENT_PORT_REGISTRATION = 5
+EVENT_PORT_CONNECT = 6
+EVENT_PORT_RENAME = 7
+EVENT_GRAPH_ORDER = 8
+EVENT_FREEWHEEL = 9
+EVENT_SHUTDOWN = 10
+# not a JACK callback, sent once the queue has room again
+# after events have been dropped, subscribers should re-read the state.
+EVENT_OVERFLOW = 11
+
+# {kind: (jack setter name, jacklib callback type name)}
+_JACK_CALLBACKS = {
+    EVENT_XRUN: ('jack_set_xrun_callback', 'JackXRunCallback'),
+    EVENT_BUFFER_SIZE: ('jack_set_buffer_size_callback',
+                        'JackBufferSizeCallback'),
+    EVENT_SAMPLE_RATE: ('jack_set_sample_rate_callback',
+                        'JackSampleRateCallback'),
+    EVENT_CLIENT_REGISTRATION: ('jack_set_client_registration_callback',
+                                'JackClientRegistrationCallback'),
+    EVENT_CLIENT_RENAME: ('jack_set_client_rename_callback',
+                          'JackClientRenameCallback'),
+    EVENT_PORT_REGISTRATION: ('jack_set_port_registration_callback',
+                              'JackPortRegistrationCallback'),
+    EVENT_PORT_CONNECT: ('jack_set_port_connect_callback',
+                         'JackPortConnectCallback'),
+    EVENT_PORT_RENAME: ('jack_set_port_rename_callback',
+                        'JackPortRenameCallback'),
+    EVENT_GRAPH_ORDER: ('jack_set_graph_order_callback',
+                        'JackGraphOrderCallback'),
+    EVENT_FREEWHEEL: ('jack_set_freewheel_callback',
+                      'JackFreewheelCallback'),
+    EVENT_SHUTDOWN: ('jack_on_shutdown', 'JackShutdownCallback'),
+}
+
+# JACK callbacks returning an int
+_RETURNS_INT = {EVENT_XRUN, EVENT_BUFFER_SIZE, EVENT_SAMPLE_RATE,
+                EVENT_CLIENT_RENAME, EVENT_PORT_RENAME, EVENT_GRAPH_ORDER}
+
+ALL_EVENTS = tuple(_JACK_CALLBACKS)
+
+# queued events, above this, new events are dropped
+DEFAULT_MAX_PENDING = 4096
+
+
+class JackEvent(NamedTuple):
+    kind: int
+    time: float
+    'time.monotonic() when JACK notified the event'
+    args: tuple
+    '''callback arguments, without the user arg.
+    JACK strings (client and port names) are decoded.'''
+
+
+@dataclass()
+class DispatcherStats:
+    enqueued: int = 0
+    delivered: int = 0
+    'events given to subscribers, once per event'
+    dropped: dict[int, int] = field(default_factory=dict)
+    'dropped events by kind, because the queue was full'
+    max_depth: int = 0
+    'highest count of pending events seen'
+    subscriber_errors: int = 0
+
+    def total_dropped(self) -> int:
+        return sum(self.dropped.values())
+
+
+def _decoded(arg):
+    if isinstance(arg, bytes):
+        return arg.decode('utf-8', errors='replace')
+    return arg
+
+
+class JackDispatcher:
+    '''Registers one ctypes callback (trampoline) per event kind
+    on a JACK client, and fans events out to subscribers.
+
+    Trampolines only append (kind, time, args) to a deque
+    and wake the consumer when the queue was empty.
+    Events are delivered, in order, by `process_pending`,
+    called either by the thread started with `start_thread`,
+    or from an event loop woken by the `wakeup` callable
+    (a Qt signal emit, connected to process_pending with a queued
+    connection). `wakeup` is called from JACK threads.'''
+
+    def __init__(self, wakeup: Optional[Callable[[], None]]=None,
+                 max_pending=DEFAULT_MAX_PENDING):
+        self.max_pending = max_pending
+        self.stats = DispatcherStats()
+
+        self._wakeup = wakeup
+        self._queue = deque()
+        self._overflowed = False
+
+        # {kind: tuple of callbacks}, tuples are replaced, never modified,
+        # so JACK threads can read them without lock.
+        self._subscribers = dict[int, tuple]()
+        self._lock = threading.Lock()
+
+        # ctypes objects must stay alive while the client is open
+        self._trampolines = dict[int, object]()
+
+        self._thread: Optional[threading.Thread] = None
+        self._thread_event = threading.Event()
+        self._stopping = False
+
+    # setup
+
+    def install(self, client, kinds=ALL_EVENTS) -> bool:
+        '''register trampolines for kinds on client,
+        must be called before jacklib.activate(client).
+        Returns False if one callback could not be registered.'''
+        ok = True
+
+        for kind in kinds:
+            setter_name, type_name = _JACK_CALLBACKS[kind]
+            setter = getattr(jacklib.jacklib, setter_name)
+            if setter is None:
+                # JACK2 only callback
+                _logger.debug(f"{setter_name} not available")
+                continue
+
+            trampoline = getattr(jacklib, type_name)(
+                self._make_trampoline(kind))
+            self._trampolines[kind] = trampoline
+
+            if setter(client, trampoline, None):
+                _logger.warning(f"{setter_name} failed")
+                ok = False
+
+        return ok
+
+    def _make_trampoline(self, kind: int):
+        queue = self._queue
+        stats = self.stats
+        subscribers = self._subscribers
+        returns_int = kind in _RETURNS_INT
+
+        # runs in a JACK thread, keep it short
+        def trampoline(*args):
+            if subscribers.get(kind):
+                if len(queue) >= self.max_pending:
+                    stats.dropped[kind] = stats.dropped.get(kind, 0) + 1
+                    self._overflowed = True
+                else:
+                    queue.append((kind, time.monotonic(), args[:-1]))
+                    stats.enqueued += 1
+                    if len(queue) == 1:
+                        self._wake()
+
+            if returns_int:
+                return 0
+
+        return trampoline
+
+    def _wake(self):
+        if self._wakeup is not None:
+            self._wakeup()
+        self._thread_event.set()
+
+    def subscribe(self, kind: int, callback: Callable[[JackEvent], None]):
+        'callback(event) will be called for each event of kind'
+        with self._lock:
+            self._subscribers[kind] = (
+                self._subscribers.get(kind, ()) + (callback,))
+
+    def unsubscribe(self, kind: int, callback: Callable[[JackEvent], None]):
+        with self._lock:
+            callbacks = list(self._subscribers.get(kind, ()))
+            if callback in callbacks:
+                callbacks.remove(callback)
+            self._subscribers[kind] = tuple(callbacks)
+
+    # consumer side
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def process_pending(self, max_events: Optional[int]=None) -> int:
+        '''deliver queued events to subscribers, in the caller thread.
+        Returns the number of delivered events.'''
+        queue = self._queue
+        stats = self.stats
+        delivered = 0
+
+        stats.max_depth = max(stats.max_depth, len(queue))
+
+        while queue and (max_events is None or delivered < max_events):
+            kind, event_time, args = queue.popleft()
+            self._deliver(JackEvent(
+                kind, event_time, tuple(_decoded(a) for a in args)))
+            delivered += 1
+
+        stats.delivered += delivered
+
+        if self._overflowed and not queue:
+            self._overflowed = False
+            self._deliver(JackEvent(EVENT_OVERFLOW, time.monotonic(), ()))
+
+        if queue:
+            # max_events reached, do not wait for a new event
+            self._wake()
+
+        return delivered
+
+    def _deliver(self, event: JackEvent):
+        for callback in self._subscribers.get(event.kind, ()):
+            try:
+                callback(event)
+            except BaseException:
+                self.stats.subscriber_errors += 1
+                _logger.exception(
+                    f"JACK event subscriber {callback} failed")
+
+    def start_thread(self, name='jack-dispatcher'):
+        'deliver events in a dedicated thread'
+        if self._thread is not None:
+            return
+
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def stop_thread(self, timeout=1.0):
+        if self._thread is None:
+            return
+
+        self._stopping = True
+        self._thread_event.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while not self._stopping:
+            self._thread_event.wait()
+            self._thread_event.clear()
+            self.process_pending()
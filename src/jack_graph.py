@@ -0,0 +1,323 @@
+# JACK graph model, built once with a full scan,
+# then kept current by the events of a JackDispatcher.
+
+from ctypes import c_void_p, cast
+from dataclasses import dataclass
+import logging
+from typing import Optional
+
+import jack_dispatcher
+from jack_dispatcher import JackDispatcher, JackEvent
+from jacklib_helpers import jacklib, c_char_p_p_to_list
+
+
+_logger = logging.getLogger(__name__)
+
+# port flags indexed by JackGraph.ports_with_flag
+INDEXED_FLAGS = (
+    0x1, # JackPortIsInput
+    0x2, # JackPortIsOutput
+    0x4, # JackPortIsPhysical
+    0x8, # JackPortCanMonitor
+    0x10, # JackPortIsTerminal
+)
+
+GRAPH_EVENTS = (jack_dispatcher.EVENT_PORT_REGISTRATION,
+                jack_dispatcher.EVENT_PORT_CONNECT,
+                jack_dispatcher.EVENT_PORT_RENAME,
+                jack_dispatcher.EVENT_CLIENT_REGISTRATION)
+
+
+def _str(value) -> str:
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    return value or ''
+
+
+@dataclass()
+class JackPort:
+    name: str
+    type: str
+    flags: int
+
+    @property
+    def client_name(self) -> str:
+        return self.name.partition(':')[0]
+
+    @property
+    def short_name(self) -> str:
+        return self.name.partition(':')[2]
+
+    def is_input(self) -> bool:
+        return bool(self.flags & 0x1)
+
+    def is_output(self) -> bool:
+        return bool(self.flags & 0x2)
+
+
+class JackGraph:
+    '''Ports and connections of the JACK graph, with indexed lookups.
+
+    `build` scans the graph once, then port registration, connection,
+    rename and client registration events received from the dispatcher
+    update the model, with no FFI call for most of them.
+    The model is updated in the dispatcher consumer thread (or event loop),
+    it must be read from there.
+
+    Subscribe to the dispatcher after `attach` to be notified
+    once the model is updated, `version` increases with each change.'''
+
+    def __init__(self, client):
+        self.client = client
+        self.version = 0
+
+        self._ports = dict[str, JackPort]()
+        # dicts used as ordered sets
+        self._by_client = dict[str, dict[str, JackPort]]()
+        self._by_type = dict[str, dict[str, JackPort]]()
+        self._by_flag = {flag: dict[str, JackPort]() for flag in INDEXED_FLAGS}
+        self._connections = dict[str, dict[str, None]]()
+        # {JACK port id: port name}, from events and from the port uuids
+        # of the initial scan. Ports with no known id (uuid not available)
+        # are found by a sweep when unregistered.
+        self._names_by_id = dict[int, str]()
+        self._names_without_id = set[str]()
+
+    # setup
+
+    def attach(self, dispatcher: JackDispatcher):
+        'follow events of dispatcher, installed on self.client'
+        for kind in GRAPH_EVENTS:
+            dispatcher.subscribe(kind, self._event_received)
+        dispatcher.subscribe(jack_dispatcher.EVENT_OVERFLOW,
+                             self._overflow_received)
+
+    def detach(self, dispatcher: JackDispatcher):
+        for kind in GRAPH_EVENTS:
+            dispatcher.unsubscribe(kind, self._event_received)
+        dispatcher.unsubscribe(jack_dispatcher.EVENT_OVERFLOW,
+                               self._overflow_received)
+
+    def build(self):
+        'full scan of the graph, should not be called from a JACK thread'
+        self._ports.clear()
+        self._by_client.clear()
+        self._by_type.clear()
+        for ports in self._by_flag.values():
+            ports.clear()
+        self._connections.clear()
+        self._names_by_id.clear()
+        self._names_without_id.clear()
+
+        for port_name in c_char_p_p_to_list(
+                jacklib.get_ports(self.client, '', '', 0)):
+            port_ptr = jacklib.port_by_name(self.client, port_name)
+            if not port_ptr:
+                continue
+
+            port = self._add_port(port_ptr)
+            if port is None:
+                continue
+
+            port_id = self._port_id(port_ptr)
+            if port_id is None:
+                self._names_without_id.add(port.name)
+            else:
+                self._names_by_id[port_id] = port.name
+
+            if not port.is_output():
+                continue
+
+            # connections are symmetric, outputs are enough
+            for other in c_char_p_p_to_list(
+                    jacklib.port_get_all_connections(self.client, port_ptr)):
+                self._connect(port.name, other)
+
+        self.version += 1
+
+    # lookups
+
+    def ports(self) -> list[JackPort]:
+        return list(self._ports.values())
+
+    def port(self, name: str) -> Optional[JackPort]:
+        return self._ports.get(name)
+
+    def port_by_id(self, port_id: int) -> Optional[JackPort]:
+        'port of a JACK port id, as given by port events'
+        name = self._names_by_id.get(port_id)
+        if name is None:
+            return None
+        return self._ports.get(name)
+
+    def clients(self) -> list[str]:
+        return list(self._by_client)
+
+    def ports_of_client(self, client_name: str) -> list[JackPort]:
+        return list(self._by_client.get(client_name, {}).values())
+
+    def ports_of_type(self, port_type: str) -> list[JackPort]:
+        return list(self._by_type.get(port_type, {}).values())
+
+    def ports_with_flag(self, flag: int) -> list[JackPort]:
+        'flag must be one of INDEXED_FLAGS'
+        return list(self._by_flag[flag].values())
+
+    def connections(self, port_name: str) -> list[str]:
+        return list(self._connections.get(port_name, {}))
+
+    def is_connected(self, port_name: str, other_name: str) -> bool:
+        return other_name in self._connections.get(port_name, {})
+
+    # model changes
+
+    def _add_port(self, port_ptr) -> Optional[JackPort]:
+        name = _str(jacklib.port_name(port_ptr))
+        if not name:
+            return None
+
+        self._remove_port(name)
+
+        port = JackPort(name=name,
+                        type=_str(jacklib.port_type(port_ptr)),
+                        flags=jacklib.port_flags(port_ptr))
+        self._insert_port(port)
+        return port
+
+    def _insert_port(self, port: JackPort):
+        self._ports[port.name] = port
+        self._by_client.setdefault(port.client_name, {})[port.name] = port
+        self._by_type.setdefault(port.type, {})[port.name] = port
+        for flag in INDEXED_FLAGS:
+            if port.flags & flag:
+                self._by_flag[flag][port.name] = port
+
+    def _remove_port(self, name: str):
+        port = self._ports.pop(name, None)
+        if port is None:
+            return
+
+        client_ports = self._by_client.get(port.client_name)
+        if client_ports is not None:
+            client_ports.pop(name, None)
+            if not client_ports:
+                del self._by_client[port.client_name]
+
+        type_ports = self._by_type.get(port.type)
+        if type_ports is not None:
+            type_ports.pop(name, None)
+            if not type_ports:
+                del self._by_type[port.type]
+
+        for ports in self._by_flag.values():
+            ports.pop(name, None)
+        self._names_without_id.discard(name)
+
+        for other in self._connections.pop(name, {}):
+            self._connections.get(other, {}).pop(name, None)
+
+    def _connect(self, port_name: str, other_name: str):
+        self._connections.setdefault(port_name, {})[other_name] = None
+        self._connections.setdefault(other_name, {})[port_name] = None
+
+    def _disconnect(self, port_name: str, other_name: str):
+        self._connections.get(port_name, {}).pop(other_name, None)
+        self._connections.get(other_name, {}).pop(port_name, None)
+
+    def _port_id(self, port_ptr) -> Optional[int]:
+        'JACK port id of port_ptr, from its uuid'
+        uuid = jacklib.port_uuid(port_ptr)
+        if not uuid:
+            return None
+
+        port_id = jacklib.port_id_from_uuid(uuid)
+        # check the uuid layout, port_by_id gives the same port
+        if (cast(jacklib.port_by_id(self.client, port_id), c_void_p).value
+                != cast(port_ptr, c_void_p).value):
+            return None
+        return port_id
+
+    def _name_of_id(self, port_id: int) -> str:
+        name = self._names_by_id.get(port_id)
+        if name is None:
+            port_ptr = jacklib.port_by_id(self.client, port_id)
+            if port_ptr:
+                name = _str(jacklib.port_name(port_ptr))
+                self._names_by_id[port_id] = name
+        return name or ''
+
+    def _sweep_ports(self):
+        '''remove ports with no known id which do not exist anymore,
+        for unregistered ports whose id was unknown
+        (only without port uuids)'''
+        for name in list(self._names_without_id):
+            if not jacklib.port_by_name(self.client, name):
+                self._remove_port(name)
+
+    def _overflow_received(self, event: JackEvent):
+        # events have been lost
+        self.build()
+
+    def _event_received(self, event: JackEvent):
+        if event.kind == jack_dispatcher.EVENT_PORT_REGISTRATION:
+            port_id, register = event.args
+
+            if register:
+                # port ids are reused, forget the old name
+                self._names_by_id.pop(port_id, None)
+                port_ptr = jacklib.port_by_id(self.client, port_id)
+                if not port_ptr:
+                    # already unregistered
+                    return
+                port = self._add_port(port_ptr)
+                if port is not None:
+                    self._names_by_id[port_id] = port.name
+            else:
+                name = self._names_by_id.pop(port_id, None)
+                if name is None:
+                    if self._names_without_id:
+                        self._sweep_ports()
+                else:
+                    self._remove_port(name)
+
+        elif event.kind == jack_dispatcher.EVENT_PORT_CONNECT:
+            port_id_a, port_id_b, connect = event.args
+            name_a = self._name_of_id(port_id_a)
+            name_b = self._name_of_id(port_id_b)
+            if not (name_a and name_b):
+                _logger.debug(
+                    f"connection of unknown ports {port_id_a} {port_id_b}")
+                return
+
+            if connect:
+                self._connect(name_a, name_b)
+            else:
+                self._disconnect(name_a, name_b)
+
+        elif event.kind == jack_dispatcher.EVENT_PORT_RENAME:
+            port_id, old_name, new_name = event.args
+            port = self._ports.get(old_name)
+            if port is None:
+                return
+
+            connections = list(self._connections.get(old_name, {}))
+            self._remove_port(old_name)
+            port.name = new_name
+            self._insert_port(port)
+            for other in connections:
+                self._connect(new_name, other)
+            self._names_by_id[port_id] = new_name
+
+        elif event.kind == jack_dispatcher.EVENT_CLIENT_REGISTRATION:
+            client_name, register = event.args
+            if register:
+                # its ports will come with their own events
+                return
+
+            for port in self.ports_of_client(client_name):
+                self._remove_port(port.name)
+            for port_id, name in list(self._names_by_id.items()):
+                if name.partition(':')[0] == client_name:
+                    del self._names_by_id[port_id]
+
+        self.version += 1
@@ -0,0 +1,209 @@
+# JACK status engine, follows the JACK server state
+# with a lightweight jacklib client instead of polling jackdbus.
+
+import logging
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+import jack_dispatcher
+from jack_dispatcher import JackDispatcher
+from jacklib_helpers import jacklib
+
+
+_logger = logging.getLogger(__name__)
+
+
+class JackStatusEngine(QObject):
+    '''Pushes JACK status changes to the GUI with Qt signals.
+
+    xruns, buffer size and sample rate are notified by JACK callbacks,
+    only the DSP load has to be polled, and it is polled
+    only while someone can see it (see `set_load_polling`).'''
+
+    CLIENT_NAME = "caleson-status"
+    LOAD_POLL_INTERVAL = 500 # ms
+
+    dsp_load_changed = pyqtSignal(float)
+    xruns_changed = pyqtSignal(int)
+    buffer_size_changed = pyqtSignal(int)
+    sample_rate_changed = pyqtSignal(int)
+    server_shutdown = pyqtSignal()
+
+    # emitted from the JACK notification thread when events are queued,
+    # received (queued) in the thread of this object.
+    _jack_events = pyqtSignal()
+
+    def __init__(self, parent=None):
+        QObject.__init__(self, parent)
+        self._client = None
+        self._load_polling = False
+
+        self._dsp_load = -1.0
+        self._xruns = 0
+        self._buffer_size = 0
+        self._sample_rate = 0
+
+        self._load_timer = QTimer(self)
+        self._load_timer.setInterval(self.LOAD_POLL_INTERVAL)
+        self._load_timer.timeout.connect(self._poll_dsp_load)
+
+        self._dispatcher = None
+        self._jack_events.connect(self._process_jack_events)
+
+    def is_active(self) -> bool:
+        return self._client is not None
+
+    def start(self) -> bool:
+        '''Open the status client on the running JACK server.
+        Returns False if jacklib or the server is not available.'''
+        if self._client is not None:
+            return True
+
+        if jacklib is None:
+            return False
+
+        client = jacklib.client_open(
+            self.CLIENT_NAME, jacklib.JackNoStartServer, None)
+        if not client:
+            _logger.warning(
+                f"Unable to open '{self.CLIENT_NAME}' JACK client")
+            return False
+
+        self._dispatcher = JackDispatcher(wakeup=self._jack_events.emit)
+        self._dispatcher.subscribe(
+            jack_dispatcher.EVENT_XRUN,
+            lambda event: self._xrun_received())
+        self._dispatcher.subscribe(
+            jack_dispatcher.EVENT_BUFFER_SIZE,
+            lambda event: self._buffer_size_received(event.args[0]))
+        self._dispatcher.subscribe(
+            jack_dispatcher.EVENT_SAMPLE_RATE,
+            lambda event: self._sample_rate_received(event.args[0]))
+        self._dispatcher.subscribe(
+            jack_dispatcher.EVENT_SHUTDOWN,
+            lambda event: self._shutdown_received())
+        self._dispatcher.install(
+            client, (jack_dispatcher.EVENT_XRUN,
+                     jack_dispatcher.EVENT_BUFFER_SIZE,
+                     jack_dispatcher.EVENT_SAMPLE_RATE,
+                     jack_dispatcher.EVENT_SHUTDOWN))
+
+        if jacklib.activate(client):
+            _logger.warning(
+                f"Unable to activate '{self.CLIENT_NAME}' JACK client")
+            jacklib.client_close(client)
+            self._dispatcher = None
+            return False
+
+        self._client = client
+        self._dsp_load = -1.0
+        # counted since activation, see set_xruns
+        self._xruns = 0
+        self._buffer_size = 0
+        self._sample_rate = 0
+        self._buffer_size_received(jacklib.get_buffer_size(client))
+        self._sample_rate_received(jacklib.get_sample_rate(client))
+        self._poll_dsp_load()
+
+        if self._load_polling:
+            self._load_timer.start()
+
+        return True
+
+    def stop(self):
+        self._load_timer.stop()
+
+        if self._client is None:
+            return
+
+        client = self._client
+        self._client = None
+        jacklib.deactivate(client)
+        jacklib.client_close(client)
+        self._dispatcher = None
+
+    def set_load_polling(self, active: bool):
+        '''DSP load is the only value without JACK callback,
+        poll it only when it is displayed.'''
+        self._load_polling = active
+
+        if not active:
+            self._load_timer.stop()
+        elif self._client is not None and not self._load_timer.isActive():
+            self._poll_dsp_load()
+            self._load_timer.start()
+
+    def set_xruns(self, xruns: int):
+        '''Our client only knows the xruns happened since its activation,
+        the total count of the server has to be given once here.'''
+        self._xruns = xruns
+        self.xruns_changed.emit(self._xruns)
+
+    def dsp_load(self) -> float:
+        return self._dsp_load
+
+    def xruns(self) -> int:
+        return self._xruns
+
+    def buffer_size(self) -> int:
+        return self._buffer_size
+
+    def sample_rate(self) -> int:
+        return self._sample_rate
+
+    def latency_ms(self) -> float:
+        'block latency, computed as jackdbus GetLatency does'
+        if not self._sample_rate:
+            return 0.0
+        return self._buffer_size / self._sample_rate * 1000.0
+
+    def dispatcher(self) -> 'JackDispatcher':
+        '''dispatcher of the status client xrun, buffer size, sample rate
+        and shutdown events, other components can subscribe to it
+        instead of opening their own client. None if not started.'''
+        return self._dispatcher
+
+    # Qt thread
+
+    @pyqtSlot()
+    def _process_jack_events(self):
+        if self._dispatcher is not None:
+            self._dispatcher.process_pending()
+
+    @pyqtSlot()
+    def _poll_dsp_load(self):
+        if self._client is None:
+            return
+
+        dsp_load = round(jacklib.cpu_load(self._client), 2)
+        if dsp_load != self._dsp_load:
+            self._dsp_load = dsp_load
+            self.dsp_load_changed.emit(dsp_load)
+
+    @pyqtSlot()
+    def _xrun_received(self):
+        self._xruns += 1
+        self.xruns_changed.emit(self._xruns)
+
+    @pyqtSlot(int)
+    def _buffer_size_received(self, buffer_size: int):
+        if buffer_size != self._buffer_size:
+            self._buffer_size = buffer_size
+            self.buffer_size_changed.emit(buffer_size)
+
+    @pyqtSlot(int)
+    def _sample_rate_received(self, sample_rate: int):
+        if sample_rate != self._sample_rate:
+            self._sample_rate = sample_rate
+            self.sample_rate_changed.emit(sample_rate)
+
+    @pyqtSlot()
+    def _shutdown_received(self):
+        self._load_timer.stop()
+
+        if self._client is not None:
+            # after a shutdown, the client still has to be closed
+            jacklib.client_close(self._client)
+            self._client = None
+
+        self.server_shutdown.emit()
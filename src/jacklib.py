@@ -27,20 +27,20 @@ from sys import platform
 
 try:
     if platform == "darwin":
-        jacklib = cdll.LoadLibrary("libjack.dylib")
+        _lib = cdll.LoadLibrary("libjack.dylib")
     elif platform in ("win32", "win64", "cygwin"):
-        jacklib = cdll.LoadLibrary("libjack.dll")
+        _lib = cdll.LoadLibrary("libjack.dll")
     else:
-        jacklib = cdll.LoadLibrary("libjack.so.0")
+        _lib = cdll.LoadLibrary("libjack.so.0")
 except:
-    jacklib = None
+    _lib = None
     raise ImportError("JACK is not available in this system")
 
 # ------------------------------------------------------------------------------------------------------------
 # JACK2 test
 
 try:
-    if jacklib.jack_get_version_string:
+    if _lib.jack_get_version_string:
         JACK2 = True
     else:
         JACK2 = False
@@ -74,6 +74,7 @@ jack_nframes_t = c_uint32
 jack_port_id_t = c_uint32
 jack_time_t = c_uint64
 jack_unique_t = c_uint64
+jack_uuid_t = c_uint64
 jack_midi_data_t = c_uchar
 jack_default_audio_sample_t = c_float
 
@@ -207,6 +208,22 @@ class jack_session_event_t(Structure):
         ("future", c_uint32)
     ]
 
+class jack_ringbuffer_data_t(Structure):
+    _fields_ = [
+        ("buf", c_void_p),
+        ("len", c_size_t)
+    ]
+
+class jack_ringbuffer_t(Structure):
+    _fields_ = [
+        ("buf", c_void_p),
+        ("write_ptr", c_size_t),
+        ("read_ptr", c_size_t),
+        ("size", c_size_t),
+        ("size_mask", c_size_t),
+        ("mlocked", c_int)
+    ]
+
 class jack_session_command_t(Structure):
     _fields_ = [
         ("uuid", c_char_p),
@@ -218,89 +235,107 @@ class jack_session_command_t(Structure):
 # ------------------------------------------------------------------------------------------------------------
 # Callbacks
 
-JackLatencyCallback = CFUNCTYPE(None, jack_latency_callback_mode_t, c_void_p)
-JackProcessCallback = CFUNCTYPE(c_int, jack_nframes_t, c_void_p)
-JackThreadCallback = CFUNCTYPE(c_void_p, c_void_p)
-JackThreadInitCallback = CFUNCTYPE(None, c_void_p)
-JackGraphOrderCallback = CFUNCTYPE(c_int, c_void_p)
-JackXRunCallback  = CFUNCTYPE(c_int, c_void_p)
-JackBufferSizeCallback = CFUNCTYPE(c_int, jack_nframes_t, c_void_p)
-JackSampleRateCallback = CFUNCTYPE(c_int, jack_nframes_t, c_void_p)
-JackPortRegistrationCallback = CFUNCTYPE(None, jack_port_id_t, c_int, c_void_p)
-JackClientRegistrationCallback = CFUNCTYPE(None, c_char_p, c_int, c_void_p)
-JackClientRenameCallback = CFUNCTYPE(c_int, c_char_p, c_char_p, c_void_p) # JACK2 only
-JackPortConnectCallback = CFUNCTYPE(None, jack_port_id_t, jack_port_id_t, c_int, c_void_p)
-JackPortRenameCallback = CFUNCTYPE(c_int, jack_port_id_t, c_char_p, c_char_p, c_void_p) # JACK2 only
-JackFreewheelCallback = CFUNCTYPE(None, c_int, c_void_p)
-JackShutdownCallback = CFUNCTYPE(None, c_void_p)
-JackInfoShutdownCallback = CFUNCTYPE(None, jack_status_t, c_char_p, c_void_p)
-JackSyncCallback = CFUNCTYPE(c_int, jack_transport_state_t, POINTER(jack_position_t), c_void_p)
-JackTimebaseCallback = CFUNCTYPE(None, jack_transport_state_t, jack_nframes_t, POINTER(jack_position_t), c_int, c_void_p)
-JackSessionCallback = CFUNCTYPE(None, POINTER(jack_session_event_t), c_void_p)
-JackCustomDataAppearanceCallback = CFUNCTYPE(None, c_char_p, c_char_p, jack_custom_change_t, c_void_p)
+# CFUNCTYPE types are built on first use, with _callback_type(name),
+# or as module attributes (jacklib.JackProcessCallback)
+_CALLBACK_SIGNATURES = {
+    "JackLatencyCallback": (None, jack_latency_callback_mode_t, c_void_p),
+    "JackProcessCallback": (c_int, jack_nframes_t, c_void_p),
+    "JackThreadCallback": (c_void_p, c_void_p),
+    "JackThreadInitCallback": (None, c_void_p),
+    "JackGraphOrderCallback": (c_int, c_void_p),
+    "JackXRunCallback": (c_int, c_void_p),
+    "JackBufferSizeCallback": (c_int, jack_nframes_t, c_void_p),
+    "JackSampleRateCallback": (c_int, jack_nframes_t, c_void_p),
+    "JackPortRegistrationCallback": (None, jack_port_id_t, c_int, c_void_p),
+    "JackClientRegistrationCallback": (None, c_char_p, c_int, c_void_p),
+    "JackClientRenameCallback": (c_int, c_char_p, c_char_p, c_void_p), # JACK2 only
+    "JackPortConnectCallback": (None, jack_port_id_t, jack_port_id_t, c_int, c_void_p),
+    "JackPortRenameCallback": (c_int, jack_port_id_t, c_char_p, c_char_p, c_void_p), # JACK2 only
+    "JackFreewheelCallback": (None, c_int, c_void_p),
+    "JackShutdownCallback": (None, c_void_p),
+    "JackInfoShutdownCallback": (None, jack_status_t, c_char_p, c_void_p),
+    "JackSyncCallback": (c_int, jack_transport_state_t, POINTER(jack_position_t), c_void_p),
+    "JackTimebaseCallback": (None, jack_transport_state_t, jack_nframes_t, POINTER(jack_position_t), c_int, c_void_p),
+    "JackSessionCallback": (None, POINTER(jack_session_event_t), c_void_p),
+    "JackCustomDataAppearanceCallback": (None, c_char_p, c_char_p, jack_custom_change_t, c_void_p),
+}
+
+def _callback_type(name):
+    callback_type = globals().get(name)
+    if callback_type is None:
+        callback_type = CFUNCTYPE(*_CALLBACK_SIGNATURES[name])
+        globals()[name] = callback_type
+    return callback_type
+
+def __getattr__(name):
+    if name in _CALLBACK_SIGNATURES:
+        return _callback_type(name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
 
 # ------------------------------------------------------------------------------------------------------------
-# Functions
-
-try:
-    jacklib.jack_get_version_string.argtypes = None
-    jacklib.jack_get_version_string.restype = c_char_p
-except:
-    jacklib.jack_get_version_string = None
-
-try:
-    jacklib.jack_client_open.argtypes = [c_char_p, jack_options_t, POINTER(jack_status_t), c_char_p]
-    jacklib.jack_client_open.restype = POINTER(jack_client_t)
-except:
-    jacklib.jack_client_open = None
-
-try:
-    jacklib.jack_client_rename.argtypes = [POINTER(jack_client_t), c_char_p]
-    jacklib.jack_client_rename.restype = c_char_p
-except:
-    jacklib.jack_client_rename = None
-
-try:
-    jacklib.jack_client_close.argtypes = [POINTER(jack_client_t)]
-    jacklib.jack_client_close.restype = c_int
-except:
-    jacklib.jack_client_close = None
-
-try:
-    jacklib.jack_client_name_size.argtypes = None
-    jacklib.jack_client_name_size.restype = c_int
-except:
-    jacklib.jack_client_name_size = None
-
-try:
-    jacklib.jack_get_client_name.argtypes = [POINTER(jack_client_t)]
-    jacklib.jack_get_client_name.restype = c_char_p
-except:
-    jacklib.jack_get_client_name = None
+# Lazy binding
+
+# {symbol name: (argtypes, restype)}, filled by _declare() in each section below.
+# Callback types in argtypes are given by name.
+_SIGNATURES = {}
+# symbols which may be missing, depending on JACK version
+_OPTIONAL = set()
+
+def _declare(signatures, optional=False):
+    _SIGNATURES.update(signatures)
+    if optional:
+        _OPTIONAL.update(signatures)
+
+def _ctype(ctype):
+    if isinstance(ctype, str):
+        return _callback_type(ctype)
+    return ctype
+
+class _LazyLibrary:
+    '''Resolves and types jack_* symbols on first access.
+    Bound symbols are stored as attributes, so __getattr__ runs once per symbol.
+    Missing optional symbols are None.'''
+
+    def __init__(self, lib):
+        self._lib = lib
+
+    def __getattr__(self, name):
+        if name not in _SIGNATURES:
+            # not declared, untyped as with ctypes
+            return getattr(self._lib, name)
+
+        argtypes, restype = _SIGNATURES[name]
+
+        try:
+            func = getattr(self._lib, name)
+        except AttributeError:
+            if name not in _OPTIONAL:
+                raise
+            func = None
+        else:
+            func.argtypes = [_ctype(t) for t in argtypes] if argtypes is not None else None
+            func.restype = _ctype(restype)
+
+        setattr(self, name, func)
+        return func
+
+jacklib = _LazyLibrary(_lib)
 
-try:
-    jacklib.jack_activate.argtypes = [POINTER(jack_client_t)]
-    jacklib.jack_activate.restype = c_int
-except:
-    jacklib.jack_activate = None
-
-try:
-    jacklib.jack_deactivate.argtypes = [POINTER(jack_client_t)]
-    jacklib.jack_deactivate.restype = c_int
-except:
-    jacklib.jack_deactivate = None
-
-try:
-    jacklib.jack_get_client_pid.argtypes = [c_char_p]
-    jacklib.jack_get_client_pid.restype = c_int
-except:
-    jacklib.jack_get_client_pid = None
+# ------------------------------------------------------------------------------------------------------------
+# Functions
 
-try:
-    jacklib.jack_is_realtime.argtypes = [POINTER(jack_client_t)]
-    jacklib.jack_is_realtime.restype = c_int
-except:
-    jacklib.jack_is_realtime = None
+_declare({
+    "jack_get_version_string": (None, c_char_p),
+    "jack_client_open": ([c_char_p, jack_options_t, POINTER(jack_status_t), c_char_p], POINTER(jack_client_t)),
+    "jack_client_rename": ([POINTER(jack_client_t), c_char_p], c_char_p),
+    "jack_client_close": ([POINTER(jack_client_t)], c_int),
+    "jack_client_name_size": (None, c_int),
+    "jack_get_client_name": ([POINTER(jack_client_t)], c_char_p),
+    "jack_activate": ([POINTER(jack_client_t)], c_int),
+    "jack_deactivate": ([POINTER(jack_client_t)], c_int),
+    "jack_get_client_pid": ([c_char_p], c_int),
+    "jack_is_realtime": ([POINTER(jack_client_t)], c_int),
+}, optional=True)
 
 def get_version_string(): # JACK2 only
     if jacklib.jack_get_version_string:
@@ -358,23 +393,11 @@ def is_realtime(client):
 global _thread_callback
 _thread_callback = None
 
-try:
-    jacklib.jack_cycle_wait.argtypes = [POINTER(jack_client_t)]
-    jacklib.jack_cycle_wait.restype = jack_nframes_t
-except:
-    jacklib.jack_cycle_wait = None
-
-try:
-    jacklib.jack_cycle_signal.argtypes = [POINTER(jack_client_t), c_int]
-    jacklib.jack_cycle_signal.restype = None
-except:
-    jacklib.jack_cycle_signal = None
-
-try:
-    jacklib.jack_set_process_thread.argtypes = [POINTER(jack_client_t), JackThreadCallback, c_void_p]
-    jacklib.jack_set_process_thread.restype = c_int
-except:
-    jacklib.jack_set_process_thread = None
+_declare({
+    "jack_cycle_wait": ([POINTER(jack_client_t)], jack_nframes_t),
+    "jack_cycle_signal": ([POINTER(jack_client_t), c_int], None),
+    "jack_set_process_thread": ([POINTER(jack_client_t), "JackThreadCallback", c_void_p], c_int),
+}, optional=True)
 
 def cycle_wait(client):
     if jacklib.jack_cycle_wait:
@@ -388,7 +411,7 @@ def cycle_signal(client, status):
 def set_process_thread(client, thread_callback, arg):
     if jacklib.jack_set_process_thread:
         global _thread_callback
-        _thread_callback = JackThreadCallback(thread_callback)
+        _thread_callback = _callback_type("JackThreadCallback")(thread_callback)
         return jacklib.jack_set_process_thread(client, _thread_callback, arg)
     return -1
 
@@ -417,219 +440,138 @@ _client_registration_callback = _client_rename_callback = None
 _port_registration_callback = _port_connect_callback = _port_rename_callback = None
 _graph_callback = _xrun_callback = _latency_callback = None
 
-try:
-    jacklib.jack_set_thread_init_callback.argtypes = [POINTER(jack_client_t), JackThreadInitCallback, c_void_p]
-    jacklib.jack_set_thread_init_callback.restype = c_int
-except:
-    jacklib.jack_set_thread_init_callback = None
-
-try:
-    jacklib.jack_on_shutdown.argtypes = [POINTER(jack_client_t), JackShutdownCallback, c_void_p]
-    jacklib.jack_on_shutdown.restype = None
-except:
-    jacklib.jack_on_shutdown = None
-
-try:
-    jacklib.jack_on_info_shutdown.argtypes = [POINTER(jack_client_t), JackInfoShutdownCallback, c_void_p]
-    jacklib.jack_on_info_shutdown.restype = None
-except:
-    jacklib.jack_on_info_shutdown = None
-
-try:
-    jacklib.jack_set_process_callback.argtypes = [POINTER(jack_client_t), JackProcessCallback, c_void_p]
-    jacklib.jack_set_process_callback.restype = c_int
-except:
-    jacklib.jack_set_process_callback = None
-
-try:
-    jacklib.jack_set_freewheel_callback.argtypes = [POINTER(jack_client_t), JackFreewheelCallback, c_void_p]
-    jacklib.jack_set_freewheel_callback.restype = c_int
-except:
-    jacklib.jack_set_freewheel_callback = None
-
-try:
-    jacklib.jack_set_buffer_size_callback.argtypes = [POINTER(jack_client_t), JackBufferSizeCallback, c_void_p]
-    jacklib.jack_set_buffer_size_callback.restype = c_int
-except:
-    jacklib.jack_set_buffer_size_callback = None
-
-try:
-    jacklib.jack_set_sample_rate_callback.argtypes = [POINTER(jack_client_t), JackSampleRateCallback, c_void_p]
-    jacklib.jack_set_sample_rate_callback.restype = c_int
-except:
-    jacklib.jack_set_sample_rate_callback = None
-
-try:
-    jacklib.jack_set_client_registration_callback.argtypes = [POINTER(jack_client_t), JackClientRegistrationCallback, c_void_p]
-    jacklib.jack_set_client_registration_callback.restype = c_int
-except:
-    jacklib.jack_set_client_registration_callback = None
-
-try:
-    jacklib.jack_set_client_rename_callback.argtypes = [POINTER(jack_client_t), JackClientRenameCallback, c_void_p]
-    jacklib.jack_set_client_rename_callback.restype = c_int
-except:
-    jacklib.jack_set_client_rename_callback = None
-
-try:
-    jacklib.jack_set_port_registration_callback.argtypes = [POINTER(jack_client_t), JackPortRegistrationCallback, c_void_p]
-    jacklib.jack_set_port_registration_callback.restype = c_int
-except:
-    jacklib.jack_set_port_registration_callback = None
-
-try:
-    jacklib.jack_set_port_connect_callback.argtypes = [POINTER(jack_client_t), JackPortConnectCallback, c_void_p]
-    jacklib.jack_set_port_connect_callback.restype = c_int
-except:
-    jacklib.jack_set_port_connect_callback = None
-
-try:
-    jacklib.jack_set_port_rename_callback.argtypes = [POINTER(jack_client_t), JackPortRenameCallback, c_void_p]
-    jacklib.jack_set_port_rename_callback.restype = c_int
-except:
-    jacklib.jack_set_port_rename_callback = None
-
-try:
-    jacklib.jack_set_graph_order_callback.argtypes = [POINTER(jack_client_t), JackGraphOrderCallback, c_void_p]
-    jacklib.jack_set_graph_order_callback.restype = c_int
-except:
-    jacklib.jack_set_graph_order_callback = None
-
-try:
-    jacklib.jack_set_xrun_callback.argtypes = [POINTER(jack_client_t), JackXRunCallback, c_void_p]
-    jacklib.jack_set_xrun_callback.restype = c_int
-except:
-    jacklib.jack_set_xrun_callback = None
-
-try:
-    jacklib.jack_set_latency_callback.argtypes = [POINTER(jack_client_t), JackLatencyCallback, c_void_p]
-    jacklib.jack_set_latency_callback.restype = c_int
-except:
-    jacklib.jack_set_latency_callback = None
+_declare({
+    "jack_set_thread_init_callback": ([POINTER(jack_client_t), "JackThreadInitCallback", c_void_p], c_int),
+    "jack_on_shutdown": ([POINTER(jack_client_t), "JackShutdownCallback", c_void_p], None),
+    "jack_on_info_shutdown": ([POINTER(jack_client_t), "JackInfoShutdownCallback", c_void_p], None),
+    "jack_set_process_callback": ([POINTER(jack_client_t), "JackProcessCallback", c_void_p], c_int),
+    "jack_set_freewheel_callback": ([POINTER(jack_client_t), "JackFreewheelCallback", c_void_p], c_int),
+    "jack_set_buffer_size_callback": ([POINTER(jack_client_t), "JackBufferSizeCallback", c_void_p], c_int),
+    "jack_set_sample_rate_callback": ([POINTER(jack_client_t), "JackSampleRateCallback", c_void_p], c_int),
+    "jack_set_client_registration_callback": ([POINTER(jack_client_t), "JackClientRegistrationCallback", c_void_p], c_int),
+    "jack_set_client_rename_callback": ([POINTER(jack_client_t), "JackClientRenameCallback", c_void_p], c_int),
+    "jack_set_port_registration_callback": ([POINTER(jack_client_t), "JackPortRegistrationCallback", c_void_p], c_int),
+    "jack_set_port_connect_callback": ([POINTER(jack_client_t), "JackPortConnectCallback", c_void_p], c_int),
+    "jack_set_port_rename_callback": ([POINTER(jack_client_t), "JackPortRenameCallback", c_void_p], c_int),
+    "jack_set_graph_order_callback": ([POINTER(jack_client_t), "JackGraphOrderCallback", c_void_p], c_int),
+    "jack_set_xrun_callback": ([POINTER(jack_client_t), "JackXRunCallback", c_void_p], c_int),
+    "jack_set_latency_callback": ([POINTER(jack_client_t), "JackLatencyCallback", c_void_p], c_int),
+}, optional=True)
 
 def set_thread_init_callback(client, thread_init_callback, arg):
     if jacklib.jack_set_thread_init_callback:
         global _thread_init_callback
-        _thread_init_callback = JackThreadInitCallback(thread_init_callback)
+        _thread_init_callback = _callback_type("JackThreadInitCallback")(thread_init_callback)
         return jacklib.jack_set_thread_init_callback(client, _thread_init_callback, arg)
     return -1
 
 def on_shutdown(client, shutdown_callback, arg):
     if jacklib.jack_on_shutdown:
         global _shutdown_callback
-        _shutdown_callback = JackShutdownCallback(shutdown_callback)
+        _shutdown_callback = _callback_type("JackShutdownCallback")(shutdown_callback)
         jacklib.jack_on_shutdown(client, _shutdown_callback, arg)
 
 def on_info_shutdown(client, info_shutdown_callback, arg):
     if jacklib.jack_on_info_shutdown:
         global _info_shutdown_callback
-        _info_shutdown_callback = JackInfoShutdownCallback(info_shutdown_callback)
+        _info_shutdown_callback = _callback_type("JackInfoShutdownCallback")(info_shutdown_callback)
         jacklib.jack_on_info_shutdown(client, _info_shutdown_callback, arg)
 
 def set_process_callback(client, process_callback, arg):
     if jacklib.jack_set_process_callback:
         global _process_callback
-        _process_callback = JackProcessCallback(process_callback)
+        _process_callback = _callback_type("JackProcessCallback")(process_callback)
         return jacklib.jack_set_process_callback(client, _process_callback, arg)
     return -1
 
 def set_freewheel_callback(client, freewheel_callback, arg):
     if jacklib.jack_set_freewheel_callback:
         global _freewheel_callback
-        _freewheel_callback = JackFreewheelCallback(freewheel_callback)
+        _freewheel_callback = _callback_type("JackFreewheelCallback")(freewheel_callback)
         return jacklib.jack_set_freewheel_callback(client, _freewheel_callback, arg)
     return -1
 
 def set_buffer_size_callback(client, bufsize_callback, arg):
     if jacklib.jack_set_buffer_size_callback:
         global _bufsize_callback
-        _bufsize_callback = JackBufferSizeCallback(bufsize_callback)
+        _bufsize_callback = _callback_type("JackBufferSizeCallback")(bufsize_callback)
         return jacklib.jack_set_buffer_size_callback(client, _bufsize_callback, arg)
     return -1
 
 def set_sample_rate_callback(client, srate_callback, arg):
     if jacklib.jack_set_sample_rate_callback:
         global _srate_callback
-        _srate_callback = JackSampleRateCallback(srate_callback)
+        _srate_callback = _callback_type("JackSampleRateCallback")(srate_callback)
         return jacklib.jack_set_sample_rate_callback(client, _srate_callback, arg)
     return -1
 
 def set_client_registration_callback(client, client_registration_callback, arg):
     if jacklib.jack_set_client_registration_callback:
         global _client_registration_callback
-        _client_registration_callback = JackClientRegistrationCallback(client_registration_callback)
+        _client_registration_callback = _callback_type("JackClientRegistrationCallback")(client_registration_callback)
         return jacklib.jack_set_client_registration_callback(client, _client_registration_callback, arg)
     return -1
 
 def set_client_rename_callback(client, client_rename_callback, arg): # JACK2 only
     if jacklib.jack_set_client_rename_callback:
         global _client_rename_callback
-        _client_rename_callback = JackClientRenameCallback(client_rename_callback)
+        _client_rename_callback = _callback_type("JackClientRenameCallback")(client_rename_callback)
         return jacklib.jack_set_client_rename_callback(client, _client_rename_callback, arg)
     return -1
 
 def set_port_registration_callback(client, port_registration_callback, arg):
     if jacklib.jack_set_port_registration_callback:
         global _port_registration_callback
-        _port_registration_callback = JackPortRegistrationCallback(port_registration_callback)
+        _port_registration_callback = _callback_type("JackPortRegistrationCallback")(port_registration_callback)
         return jacklib.jack_set_port_registration_callback(client, _port_registration_callback, arg)
     return -1
 
 def set_port_connect_callback(client, connect_callback, arg):
     if jacklib.jack_set_port_connect_callback:
         global _port_connect_callback
-        _port_connect_callback = JackPortConnectCallback(connect_callback)
+        _port_connect_callback = _callback_type("JackPortConnectCallback")(connect_callback)
         return jacklib.jack_set_port_connect_callback(client, _port_connect_callback, arg)
     return -1
 
 def set_port_rename_callback(client, rename_callback, arg): # JACK2 only
     if jacklib.jack_set_port_rename_callback:
         global _port_rename_callback
-        _port_rename_callback = JackPortRenameCallback(rename_callback)
+        _port_rename_callback = _callback_type("JackPortRenameCallback")(rename_callback)
         return jacklib.jack_set_port_rename_callback(client, _port_rename_callback, arg)
     return -1
 
 def set_graph_order_callback(client, graph_callback, arg):
     if jacklib.jack_set_graph_order_callback:
         global _graph_callback
-        _graph_callback = JackGraphOrderCallback(graph_callback)
+        _graph_callback = _callback_type("JackGraphOrderCallback")(graph_callback)
         return jacklib.jack_set_graph_order_callback(client, _graph_callback, arg)
     return -1
 
 def set_xrun_callback(client, xrun_callback, arg):
     if jacklib.jack_set_xrun_callback:
         global _xrun_callback
-        _xrun_callback = JackXRunCallback(xrun_callback)
+        _xrun_callback = _callback_type("JackXRunCallback")(xrun_callback)
         return jacklib.jack_set_xrun_callback(client, _xrun_callback, arg)
     return -1
 
 def set_latency_callback(client, latency_callback, arg):
     if jacklib.jack_set_latency_callback:
         global _latency_callback
-        _latency_callback = JackLatencyCallback(latency_callback)
+        _latency_callback = _callback_type("JackLatencyCallback")(latency_callback)
         return jacklib.jack_set_latency_callback(client, _latency_callback, arg)
     return -1
 
 # ------------------------------------------------------------------------------------------------------------
 # Server Control
 
-jacklib.jack_set_freewheel.argtypes = [POINTER(jack_client_t), c_int]
-jacklib.jack_set_freewheel.restype = c_int
-
-jacklib.jack_set_buffer_size.argtypes = [POINTER(jack_client_t), jack_nframes_t]
-jacklib.jack_set_buffer_size.restype = c_int
-
-jacklib.jack_get_sample_rate.argtypes = [POINTER(jack_client_t)]
-jacklib.jack_get_sample_rate.restype = jack_nframes_t
-
-jacklib.jack_get_buffer_size.argtypes = [POINTER(jack_client_t)]
-jacklib.jack_get_buffer_size.restype = jack_nframes_t
-
-jacklib.jack_engine_takeover_timebase.argtypes = [POINTER(jack_client_t)]
-jacklib.jack_engine_takeover_timebase.restype = c_int
-
-jacklib.jack_cpu_load.argtypes = [POINTER(jack_client_t)]
-jacklib.jack_cpu_load.restype = c_float
+_declare({
+    "jack_set_freewheel": ([POINTER(jack_client_t), c_int], c_int),
+    "jack_set_buffer_size": ([POINTER(jack_client_t), jack_nframes_t], c_int),
+    "jack_get_sample_rate": ([POINTER(jack_client_t)], jack_nframes_t),
+    "jack_get_buffer_size": ([POINTER(jack_client_t)], jack_nframes_t),
+    "jack_engine_takeover_timebase": ([POINTER(jack_client_t)], c_int),
+    "jack_cpu_load": ([POINTER(jack_client_t)], c_float),
+})
 
 def set_freewheel(client, onoff):
     return jacklib.jack_set_freewheel(client, onoff)
@@ -652,96 +594,44 @@ def cpu_load(client):
 # ------------------------------------------------------------------------------------------------------------
 # Port Functions
 
-jacklib.jack_port_register.argtypes = [POINTER(jack_client_t), c_char_p, c_char_p, c_ulong, c_ulong]
-jacklib.jack_port_register.restype = POINTER(jack_port_t)
-
-jacklib.jack_port_unregister.argtypes = [POINTER(jack_client_t), POINTER(jack_port_t)]
-jacklib.jack_port_unregister.restype = c_int
-
-jacklib.jack_port_get_buffer.argtypes = [POINTER(jack_port_t), jack_nframes_t]
-jacklib.jack_port_get_buffer.restype = c_void_p
-
-jacklib.jack_port_name.argtypes = [POINTER(jack_port_t)]
-jacklib.jack_port_name.restype = c_char_p
-
-jacklib.jack_port_short_name.argtypes = [POINTER(jack_port_t)]
-jacklib.jack_port_short_name.restype = c_char_p
-
-jacklib.jack_port_flags.argtypes = [POINTER(jack_port_t)]
-jacklib.jack_port_flags.restype = c_int
-
-jacklib.jack_port_type.argtypes = [POINTER(jack_port_t)]
-jacklib.jack_port_type.restype = c_char_p
-
-if JACK2:
-    jacklib.jack_port_type_id.argtypes = [POINTER(jack_port_t)]
-    jacklib.jack_port_type_id.restype = jack_port_type_id_t
-
-jacklib.jack_port_is_mine.argtypes = [POINTER(jack_client_t), POINTER(jack_port_t)]
-jacklib.jack_port_is_mine.restype = c_int
-
-jacklib.jack_port_connected.argtypes = [POINTER(jack_port_t)]
-jacklib.jack_port_connected.restype = c_int
-
-jacklib.jack_port_connected_to.argtypes = [POINTER(jack_port_t), c_char_p]
-jacklib.jack_port_connected_to.restype = c_int
-
-jacklib.jack_port_get_connections.argtypes = [POINTER(jack_port_t)]
-jacklib.jack_port_get_connections.restype = POINTER(c_char_p)
-
-jacklib.jack_port_get_all_connections.argtypes = [POINTER(jack_client_t), POINTER(jack_port_t)]
-jacklib.jack_port_get_all_connections.restype = POINTER(c_char_p)
-
-jacklib.jack_port_tie.argtypes = [POINTER(jack_port_t), POINTER(jack_port_t)]
-jacklib.jack_port_tie.restype = c_int
-
-jacklib.jack_port_untie.argtypes = [POINTER(jack_port_t)]
-jacklib.jack_port_untie.restype = c_int
-
-jacklib.jack_port_set_name.argtypes = [POINTER(jack_port_t), c_char_p]
-jacklib.jack_port_set_name.restype = c_int
-
-jacklib.jack_port_set_alias.argtypes = [POINTER(jack_port_t), c_char_p]
-jacklib.jack_port_set_alias.restype = c_int
-
-jacklib.jack_port_unset_alias.argtypes = [POINTER(jack_port_t), c_char_p]
-jacklib.jack_port_unset_alias.restype = c_int
-
-jacklib.jack_port_get_aliases.argtypes = [POINTER(jack_port_t), POINTER(ARRAY(c_char_p, 2))]
-jacklib.jack_port_get_aliases.restype = c_int
-
-jacklib.jack_port_request_monitor.argtypes = [POINTER(jack_port_t), c_int]
-jacklib.jack_port_request_monitor.restype = c_int
-
-jacklib.jack_port_request_monitor_by_name.argtypes = [POINTER(jack_client_t), c_char_p, c_int]
-jacklib.jack_port_request_monitor_by_name.restype = c_int
-
-jacklib.jack_port_ensure_monitor.argtypes = [POINTER(jack_port_t), c_int]
-jacklib.jack_port_ensure_monitor.restype = c_int
-
-jacklib.jack_port_monitoring_input.argtypes = [POINTER(jack_port_t)]
-jacklib.jack_port_monitoring_input.restype = c_int
-
-jacklib.jack_connect.argtypes = [POINTER(jack_client_t), c_char_p, c_char_p]
-jacklib.jack_connect.restype = c_int
-
-jacklib.jack_disconnect.argtypes = [POINTER(jack_client_t), c_char_p, c_char_p]
-jacklib.jack_disconnect.restype = c_int
-
-jacklib.jack_port_disconnect.argtypes = [POINTER(jack_client_t), POINTER(jack_port_t)]
-jacklib.jack_port_disconnect.restype = c_int
-
-jacklib.jack_port_name_size.argtypes = None
-jacklib.jack_port_name_size.restype = c_int
-
-jacklib.jack_port_type_size.argtypes = None
-jacklib.jack_port_type_size.restype = c_int
-
-try:
-    jacklib.jack_port_type_get_buffer_size.argtypes = [POINTER(jack_client_t), c_char_p]
-    jacklib.jack_port_type_get_buffer_size.restype = c_size_t
-except:
-    jacklib.jack_port_type_get_buffer_size = None
+_declare({
+    "jack_port_register": ([POINTER(jack_client_t), c_char_p, c_char_p, c_ulong, c_ulong], POINTER(jack_port_t)),
+    "jack_port_unregister": ([POINTER(jack_client_t), POINTER(jack_port_t)], c_int),
+    "jack_port_get_buffer": ([POINTER(jack_port_t), jack_nframes_t], c_void_p),
+    "jack_port_name": ([POINTER(jack_port_t)], c_char_p),
+    "jack_port_short_name": ([POINTER(jack_port_t)], c_char_p),
+    "jack_port_flags": ([POINTER(jack_port_t)], c_int),
+    "jack_port_type": ([POINTER(jack_port_t)], c_char_p),
+})
+_declare({
+    "jack_port_type_id": ([POINTER(jack_port_t)], jack_port_type_id_t), # JACK2 only
+    "jack_port_uuid": ([POINTER(jack_port_t)], jack_uuid_t),
+}, optional=True)
+_declare({
+    "jack_port_is_mine": ([POINTER(jack_client_t), POINTER(jack_port_t)], c_int),
+    "jack_port_connected": ([POINTER(jack_port_t)], c_int),
+    "jack_port_connected_to": ([POINTER(jack_port_t), c_char_p], c_int),
+    "jack_port_get_connections": ([POINTER(jack_port_t)], POINTER(c_char_p)),
+    "jack_port_get_all_connections": ([POINTER(jack_client_t), POINTER(jack_port_t)], POINTER(c_char_p)),
+    "jack_port_tie": ([POINTER(jack_port_t), POINTER(jack_port_t)], c_int),
+    "jack_port_untie": ([POINTER(jack_port_t)], c_int),
+    "jack_port_set_name": ([POINTER(jack_port_t), c_char_p], c_int),
+    "jack_port_set_alias": ([POINTER(jack_port_t), c_char_p], c_int),
+    "jack_port_unset_alias": ([POINTER(jack_port_t), c_char_p], c_int),
+    "jack_port_get_aliases": ([POINTER(jack_port_t), POINTER(ARRAY(c_char_p, 2))], c_int),
+    "jack_port_request_monitor": ([POINTER(jack_port_t), c_int], c_int),
+    "jack_port_request_monitor_by_name": ([POINTER(jack_client_t), c_char_p, c_int], c_int),
+    "jack_port_ensure_monitor": ([POINTER(jack_port_t), c_int], c_int),
+    "jack_port_monitoring_input": ([POINTER(jack_port_t)], c_int),
+    "jack_connect": ([POINTER(jack_client_t), c_char_p, c_char_p], c_int),
+    "jack_disconnect": ([POINTER(jack_client_t), c_char_p, c_char_p], c_int),
+    "jack_port_disconnect": ([POINTER(jack_client_t), POINTER(jack_port_t)], c_int),
+    "jack_port_name_size": (None, c_int),
+    "jack_port_type_size": (None, c_int),
+})
+_declare({
+    "jack_port_type_get_buffer_size": ([POINTER(jack_client_t), c_char_p], c_size_t),
+}, optional=True)
 
 def port_register(client, port_name, port_type, flags, buffer_size):
     return jacklib.jack_port_register(client, port_name.encode("utf-8"), port_type.encode("utf-8"), flags, buffer_size)
@@ -767,6 +657,15 @@ def port_type(port):
 def port_type_id(port): # JACK2 only
     return jacklib.jack_port_type_id(port)
 
+def port_uuid(port):
+    if jacklib.jack_port_uuid:
+        return jacklib.jack_port_uuid(port)
+    return 0
+
+def port_id_from_uuid(uuid):
+    # JACK1 and JACK2 make port uuids as (type << 32) | (port id + 1)
+    return (uuid & 0xffffffff) - 1
+
 def port_is_mine(client, port):
     return jacklib.jack_port_is_mine(client, port)
 
@@ -842,32 +741,19 @@ def port_type_get_buffer_size(client, port_type):
 # ------------------------------------------------------------------------------------------------------------
 # Latency Functions
 
-jacklib.jack_port_set_latency.argtypes = [POINTER(jack_port_t), jack_nframes_t]
-jacklib.jack_port_set_latency.restype = None
-
-try:
-    jacklib.jack_port_get_latency_range.argtypes = [POINTER(jack_port_t), jack_latency_callback_mode_t, POINTER(jack_latency_range_t)]
-    jacklib.jack_port_get_latency_range.restype = None
-except:
-    jacklib.jack_port_get_latency_range = None
-
-try:
-    jacklib.jack_port_set_latency_range.argtypes = [POINTER(jack_port_t), jack_latency_callback_mode_t, POINTER(jack_latency_range_t)]
-    jacklib.jack_port_set_latency_range.restype = None
-except:
-    jacklib.jack_port_set_latency_range = None
-
-jacklib.jack_recompute_total_latencies.argtypes = [POINTER(jack_client_t)]
-jacklib.jack_recompute_total_latencies.restype = c_int
-
-jacklib.jack_port_get_latency.argtypes = [POINTER(jack_port_t)]
-jacklib.jack_port_get_latency.restype = jack_nframes_t
-
-jacklib.jack_port_get_total_latency.argtypes = [POINTER(jack_client_t), POINTER(jack_port_t)]
-jacklib.jack_port_get_total_latency.restype = jack_nframes_t
-
-jacklib.jack_recompute_total_latency.argtypes = [POINTER(jack_client_t), POINTER(jack_port_t)]
-jacklib.jack_recompute_total_latency.restype = c_int
+_declare({
+    "jack_port_set_latency": ([POINTER(jack_port_t), jack_nframes_t], None),
+})
+_declare({
+    "jack_port_get_latency_range": ([POINTER(jack_port_t), jack_latency_callback_mode_t, POINTER(jack_latency_range_t)], None),
+    "jack_port_set_latency_range": ([POINTER(jack_port_t), jack_latency_callback_mode_t, POINTER(jack_latency_range_t)], None),
+}, optional=True)
+_declare({
+    "jack_recompute_total_latencies": ([POINTER(jack_client_t)], c_int),
+    "jack_port_get_latency": ([POINTER(jack_port_t)], jack_nframes_t),
+    "jack_port_get_total_latency": ([POINTER(jack_client_t), POINTER(jack_port_t)], jack_nframes_t),
+    "jack_recompute_total_latency": ([POINTER(jack_client_t), POINTER(jack_port_t)], c_int),
+})
 
 def port_set_latency(port, nframes):
     jacklib.jack_port_set_latency(port, nframes)
@@ -895,14 +781,11 @@ def recompute_total_latency(client, port):
 # ------------------------------------------------------------------------------------------------------------
 # Port Searching
 
-jacklib.jack_get_ports.argtypes = [POINTER(jack_client_t), c_char_p, c_char_p, c_ulong]
-jacklib.jack_get_ports.restype = POINTER(c_char_p)
-
-jacklib.jack_port_by_name.argtypes = [POINTER(jack_client_t), c_char_p]
-jacklib.jack_port_by_name.restype = POINTER(jack_port_t)
-
-jacklib.jack_port_by_id.argtypes = [POINTER(jack_client_t), jack_port_id_t]
-jacklib.jack_port_by_id.restype = POINTER(jack_port_t)
+_declare({
+    "jack_get_ports": ([POINTER(jack_client_t), c_char_p, c_char_p, c_ulong], POINTER(c_char_p)),
+    "jack_port_by_name": ([POINTER(jack_client_t), c_char_p], POINTER(jack_port_t)),
+    "jack_port_by_id": ([POINTER(jack_client_t), jack_port_id_t], POINTER(jack_port_t)),
+})
 
 def get_ports(client, port_name_pattern, type_name_pattern, flags):
     return jacklib.jack_get_ports(client, port_name_pattern.encode("utf-8"), type_name_pattern.encode("utf-8"), flags)
@@ -916,29 +799,19 @@ def port_by_id(client, port_id):
 # ------------------------------------------------------------------------------------------------------------
 # Time Functions
 
-jacklib.jack_frames_since_cycle_start.argtypes = [POINTER(jack_client_t)]
-jacklib.jack_frames_since_cycle_start.restype = jack_nframes_t
-
-jacklib.jack_frame_time.argtypes = [POINTER(jack_client_t)]
-jacklib.jack_frame_time.restype = jack_nframes_t
-
-jacklib.jack_last_frame_time.argtypes = [POINTER(jack_client_t)]
-jacklib.jack_last_frame_time.restype = jack_nframes_t
-
-try: # JACK_OPTIONAL_WEAK_EXPORT
-    jacklib.jack_get_cycle_times.argtypes = [POINTER(jack_client_t), POINTER(jack_nframes_t), POINTER(jack_time_t), POINTER(jack_time_t), POINTER(c_float)]
-    jacklib.jack_get_cycle_times.restype = c_int
-except:
-    jacklib.jack_get_cycle_times = None
-
-jacklib.jack_frames_to_time.argtypes = [POINTER(jack_client_t), jack_nframes_t]
-jacklib.jack_frames_to_time.restype = jack_time_t
-
-jacklib.jack_time_to_frames.argtypes = [POINTER(jack_client_t), jack_time_t]
-jacklib.jack_time_to_frames.restype = jack_nframes_t
-
-jacklib.jack_get_time.argtypes = None
-jacklib.jack_get_time.restype = jack_time_t
+_declare({
+    "jack_frames_since_cycle_start": ([POINTER(jack_client_t)], jack_nframes_t),
+    "jack_frame_time": ([POINTER(jack_client_t)], jack_nframes_t),
+    "jack_last_frame_time": ([POINTER(jack_client_t)], jack_nframes_t),
+})
+_declare({
+    "jack_get_cycle_times": ([POINTER(jack_client_t), POINTER(jack_nframes_t), POINTER(jack_time_t), POINTER(jack_time_t), POINTER(c_float)], c_int), # JACK_OPTIONAL_WEAK_EXPORT
+}, optional=True)
+_declare({
+    "jack_frames_to_time": ([POINTER(jack_client_t), jack_nframes_t], jack_time_t),
+    "jack_time_to_frames": ([POINTER(jack_client_t), jack_time_t], jack_nframes_t),
+    "jack_get_time": (None, jack_time_t),
+})
 
 def frames_since_cycle_start(client):
     return jacklib.jack_frames_since_cycle_start(client)
@@ -971,8 +844,9 @@ def get_time():
 # ------------------------------------------------------------------------------------------------------------
 # Misc
 
-jacklib.jack_free.argtypes = [c_void_p]
-jacklib.jack_free.restype = None
+_declare({
+    "jack_free": ([c_void_p], None),
+})
 
 def free(ptr):
     return jacklib.jack_free(ptr)
@@ -984,42 +858,25 @@ global _sync_callback
 global _timebase_callback
 _sync_callback = _timebase_callback = None
 
-jacklib.jack_release_timebase.argtypes = [POINTER(jack_client_t)]
-jacklib.jack_release_timebase.restype = c_int
-
-jacklib.jack_set_sync_callback.argtypes = [POINTER(jack_client_t), JackSyncCallback, c_void_p]
-jacklib.jack_set_sync_callback.restype = c_int
-
-jacklib.jack_set_sync_timeout.argtypes = [POINTER(jack_client_t), jack_time_t]
-jacklib.jack_set_sync_timeout.restype = c_int
-
-jacklib.jack_set_timebase_callback.argtypes = [POINTER(jack_client_t), c_int, JackTimebaseCallback, c_void_p]
-jacklib.jack_set_timebase_callback.restype = c_int
-
-jacklib.jack_transport_locate.argtypes = [POINTER(jack_client_t), jack_nframes_t]
-jacklib.jack_transport_locate.restype = c_int
-
-jacklib.jack_transport_query.argtypes = [POINTER(jack_client_t), POINTER(jack_position_t)]
-jacklib.jack_transport_query.restype = jack_transport_state_t
-
-jacklib.jack_get_current_transport_frame.argtypes = [POINTER(jack_client_t)]
-jacklib.jack_get_current_transport_frame.restype = jack_nframes_t
-
-jacklib.jack_transport_reposition.argtypes = [POINTER(jack_client_t), POINTER(jack_position_t)]
-jacklib.jack_transport_reposition.restype = c_int
-
-jacklib.jack_transport_start.argtypes = [POINTER(jack_client_t)]
-jacklib.jack_transport_start.restype = None
-
-jacklib.jack_transport_stop.argtypes = [POINTER(jack_client_t)]
-jacklib.jack_transport_stop.restype = None
+_declare({
+    "jack_release_timebase": ([POINTER(jack_client_t)], c_int),
+    "jack_set_sync_callback": ([POINTER(jack_client_t), "JackSyncCallback", c_void_p], c_int),
+    "jack_set_sync_timeout": ([POINTER(jack_client_t), jack_time_t], c_int),
+    "jack_set_timebase_callback": ([POINTER(jack_client_t), c_int, "JackTimebaseCallback", c_void_p], c_int),
+    "jack_transport_locate": ([POINTER(jack_client_t), jack_nframes_t], c_int),
+    "jack_transport_query": ([POINTER(jack_client_t), POINTER(jack_position_t)], jack_transport_state_t),
+    "jack_get_current_transport_frame": ([POINTER(jack_client_t)], jack_nframes_t),
+    "jack_transport_reposition": ([POINTER(jack_client_t), POINTER(jack_position_t)], c_int),
+    "jack_transport_start": ([POINTER(jack_client_t)], None),
+    "jack_transport_stop": ([POINTER(jack_client_t)], None),
+})
 
 def release_timebase(client):
     return jacklib.jack_release_timebase(client)
 
 def set_sync_callback(client, sync_callback, arg):
     global _sync_callback
-    _sync_callback = JackSyncCallback(sync_callback)
+    _sync_callback = _callback_type("JackSyncCallback")(sync_callback)
     return jacklib.jack_set_sync_callback(client, _sync_callback, arg)
 
 def set_sync_timeout(client, timeout):
@@ -1027,7 +884,7 @@ def set_sync_timeout(client, timeout):
 
 def set_timebase_callback(client, conditional, timebase_callback, arg):
     global _timebase_callback
-    _timebase_callback = JackTimebaseCallback(timebase_callback)
+    _timebase_callback = _callback_type("JackTimebaseCallback")(timebase_callback)
     return jacklib.jack_set_timebase_callback(client, conditional, _timebase_callback, arg)
 
 def transport_locate(client, frame):
@@ -1051,26 +908,15 @@ def transport_stop(client):
 # ------------------------------------------------------------------------------------------------------------
 # MIDI
 
-jacklib.jack_midi_get_event_count.argtypes = [c_void_p]
-jacklib.jack_midi_get_event_count.restype = jack_nframes_t
-
-jacklib.jack_midi_event_get.argtypes = [POINTER(jack_midi_event_t), c_void_p, c_uint32]
-jacklib.jack_midi_event_get.restype = c_int
-
-jacklib.jack_midi_clear_buffer.argtypes = [c_void_p]
-jacklib.jack_midi_clear_buffer.restype = None
-
-jacklib.jack_midi_max_event_size.argtypes = [c_void_p]
-jacklib.jack_midi_max_event_size.restype = c_size_t
-
-jacklib.jack_midi_event_reserve.argtypes = [c_void_p, jack_nframes_t, c_size_t]
-jacklib.jack_midi_event_reserve.restype = POINTER(jack_midi_data_t)
-
-jacklib.jack_midi_event_write.argtypes = [c_void_p, jack_nframes_t, POINTER(jack_midi_data_t), c_size_t]
-jacklib.jack_midi_event_write.restype = c_int
-
-jacklib.jack_midi_get_lost_event_count.argtypes = [c_void_p]
-jacklib.jack_midi_get_lost_event_count.restype = c_uint32
+_declare({
+    "jack_midi_get_event_count": ([c_void_p], jack_nframes_t),
+    "jack_midi_event_get": ([POINTER(jack_midi_event_t), c_void_p, c_uint32], c_int),
+    "jack_midi_clear_buffer": ([c_void_p], None),
+    "jack_midi_max_event_size": ([c_void_p], c_size_t),
+    "jack_midi_event_reserve": ([c_void_p, jack_nframes_t, c_size_t], POINTER(jack_midi_data_t)),
+    "jack_midi_event_write": ([c_void_p, jack_nframes_t, POINTER(jack_midi_data_t), c_size_t], c_int),
+    "jack_midi_get_lost_event_count": ([c_void_p], c_uint32),
+})
 
 def midi_get_event_count(port_buffer):
     return jacklib.jack_midi_get_event_count(port_buffer)
@@ -1094,75 +940,88 @@ def midi_get_lost_event_count(port_buffer):
     return jacklib.jack_midi_get_lost_event_count(port_buffer)
 
 # ------------------------------------------------------------------------------------------------------------
-# Session
+# Ringbuffer
 
-global _session_callback
-_session_callback = None
+_declare({
+    "jack_ringbuffer_create": ([c_size_t], POINTER(jack_ringbuffer_t)),
+    "jack_ringbuffer_free": ([POINTER(jack_ringbuffer_t)], None),
+    "jack_ringbuffer_get_read_vector": ([POINTER(jack_ringbuffer_t), POINTER(jack_ringbuffer_data_t)], None),
+    "jack_ringbuffer_get_write_vector": ([POINTER(jack_ringbuffer_t), POINTER(jack_ringbuffer_data_t)], None),
+    "jack_ringbuffer_read": ([POINTER(jack_ringbuffer_t), c_void_p, c_size_t], c_size_t),
+    "jack_ringbuffer_peek": ([POINTER(jack_ringbuffer_t), c_void_p, c_size_t], c_size_t),
+    "jack_ringbuffer_read_advance": ([POINTER(jack_ringbuffer_t), c_size_t], None),
+    "jack_ringbuffer_read_space": ([POINTER(jack_ringbuffer_t)], c_size_t),
+    "jack_ringbuffer_mlock": ([POINTER(jack_ringbuffer_t)], c_int),
+    "jack_ringbuffer_reset": ([POINTER(jack_ringbuffer_t)], None),
+    "jack_ringbuffer_write": ([POINTER(jack_ringbuffer_t), c_void_p, c_size_t], c_size_t),
+    "jack_ringbuffer_write_advance": ([POINTER(jack_ringbuffer_t), c_size_t], None),
+    "jack_ringbuffer_write_space": ([POINTER(jack_ringbuffer_t)], c_size_t),
+})
 
-try:
-    jacklib.jack_set_session_callback.argtypes = [POINTER(jack_client_t), JackSessionCallback, c_void_p]
-    jacklib.jack_set_session_callback.restype = c_int
-except:
-    jacklib.jack_set_session_callback = None
+def ringbuffer_create(sz):
+    return jacklib.jack_ringbuffer_create(sz)
 
-try:
-    jacklib.jack_session_reply.argtypes = [POINTER(jack_client_t), POINTER(jack_session_event_t)]
-    jacklib.jack_session_reply.restype = c_int
-except:
-    jacklib.jack_session_reply = None
+def ringbuffer_free(rb):
+    jacklib.jack_ringbuffer_free(rb)
 
-try:
-    jacklib.jack_session_event_free.argtypes = [POINTER(jack_session_event_t)]
-    jacklib.jack_session_event_free.restype = None
-except:
-    jacklib.jack_session_event_free = None
+def ringbuffer_get_read_vector(rb, vec):
+    # vec is a (jack_ringbuffer_data_t * 2) array
+    jacklib.jack_ringbuffer_get_read_vector(rb, vec)
 
-try:
-    jacklib.jack_client_get_uuid.argtypes = [POINTER(jack_client_t)]
-    jacklib.jack_client_get_uuid.restype = c_char_p
-except:
-    jacklib.jack_client_get_uuid = None
+def ringbuffer_get_write_vector(rb, vec):
+    # vec is a (jack_ringbuffer_data_t * 2) array
+    jacklib.jack_ringbuffer_get_write_vector(rb, vec)
 
-try:
-    jacklib.jack_session_notify.argtypes = [POINTER(jack_client_t), c_char_p, jack_session_event_type_t, c_char_p]
-    jacklib.jack_session_notify.restype = POINTER(jack_session_command_t)
-except:
-    jacklib.jack_session_notify = None
+def ringbuffer_read(rb, dest, cnt):
+    return jacklib.jack_ringbuffer_read(rb, dest, cnt)
 
-try:
-    jacklib.jack_session_commands_free.argtypes = [POINTER(jack_session_command_t)]
-    jacklib.jack_session_commands_free.restype = None
-except:
-    jacklib.jack_session_commands_free = None
+def ringbuffer_peek(rb, dest, cnt):
+    return jacklib.jack_ringbuffer_peek(rb, dest, cnt)
 
-try:
-    jacklib.jack_get_uuid_for_client_name.argtypes = [POINTER(jack_client_t), c_char_p]
-    jacklib.jack_get_uuid_for_client_name.restype = c_char_p
-except:
-    jacklib.jack_get_uuid_for_client_name = None
+def ringbuffer_read_advance(rb, cnt):
+    jacklib.jack_ringbuffer_read_advance(rb, cnt)
 
-try:
-    jacklib.jack_get_client_name_by_uuid.argtypes = [POINTER(jack_client_t), c_char_p]
-    jacklib.jack_get_client_name_by_uuid.restype = c_char_p
-except:
-    jacklib.jack_get_client_name_by_uuid = None
+def ringbuffer_read_space(rb):
+    return jacklib.jack_ringbuffer_read_space(rb)
 
-try:
-    jacklib.jack_reserve_client_name.argtypes = [POINTER(jack_client_t), c_char_p, c_char_p]
-    jacklib.jack_reserve_client_name.restype = c_int
-except:
-    jacklib.jack_reserve_client_name = None
+def ringbuffer_mlock(rb):
+    return jacklib.jack_ringbuffer_mlock(rb)
 
-try:
-    jacklib.jack_client_has_session_callback.argtypes = [POINTER(jack_client_t), c_char_p]
-    jacklib.jack_client_has_session_callback.restype = c_int
-except:
-    jacklib.jack_client_has_session_callback = None
+def ringbuffer_reset(rb):
+    jacklib.jack_ringbuffer_reset(rb)
+
+def ringbuffer_write(rb, src, cnt):
+    return jacklib.jack_ringbuffer_write(rb, src, cnt)
+
+def ringbuffer_write_advance(rb, cnt):
+    jacklib.jack_ringbuffer_write_advance(rb, cnt)
+
+def ringbuffer_write_space(rb):
+    return jacklib.jack_ringbuffer_write_space(rb)
+
+# ------------------------------------------------------------------------------------------------------------
+# Session
+
+global _session_callback
+_session_callback = None
+
+_declare({
+    "jack_set_session_callback": ([POINTER(jack_client_t), "JackSessionCallback", c_void_p], c_int),
+    "jack_session_reply": ([POINTER(jack_client_t), POINTER(jack_session_event_t)], c_int),
+    "jack_session_event_free": ([POINTER(jack_session_event_t)], None),
+    "jack_client_get_uuid": ([POINTER(jack_client_t)], c_char_p),
+    "jack_session_notify": ([POINTER(jack_client_t), c_char_p, jack_session_event_type_t, c_char_p], POINTER(jack_session_command_t)),
+    "jack_session_commands_free": ([POINTER(jack_session_command_t)], None),
+    "jack_get_uuid_for_client_name": ([POINTER(jack_client_t), c_char_p], c_char_p),
+    "jack_get_client_name_by_uuid": ([POINTER(jack_client_t), c_char_p], c_char_p),
+    "jack_reserve_client_name": ([POINTER(jack_client_t), c_char_p, c_char_p], c_int),
+    "jack_client_has_session_callback": ([POINTER(jack_client_t), c_char_p], c_int),
+}, optional=True)
 
 def set_session_callback(client, session_callback, arg):
     if jacklib.jack_set_session_callback:
         global _session_callback
-        _session_callback = JackSessionCallback(session_callback)
+        _session_callback = _callback_type("JackSessionCallback")(session_callback)
         return jacklib.jack_set_session_callback(client, _session_callback, arg)
     return -1
 
@@ -1215,35 +1074,13 @@ def client_has_session_callback(client, client_name):
 global _custom_appearance_callback
 _custom_appearance_callback = None
 
-try:
-    jacklib.jack_custom_publish_data.argtypes = [POINTER(jack_client_t), c_char_p, c_void_p, c_size_t]
-    jacklib.jack_custom_publish_data.restype = c_int
-except:
-    jacklib.jack_custom_publish_data = None
-
-try:
-    jacklib.jack_custom_get_data.argtypes = [POINTER(jack_client_t), c_char_p, c_char_p, POINTER(c_void_p), POINTER(c_size_t)]
-    jacklib.jack_custom_get_data.restype = c_int
-except:
-    jacklib.jack_custom_get_data = None
-
-try:
-    jacklib.jack_custom_unpublish_data.argtypes = [POINTER(jack_client_t), c_char_p]
-    jacklib.jack_custom_unpublish_data.restype = c_int
-except:
-    jacklib.jack_custom_unpublish_data = None
-
-try:
-    jacklib.jack_custom_get_keys.argtypes = [POINTER(jack_client_t), c_char_p]
-    jacklib.jack_custom_get_keys.restype = POINTER(c_char_p)
-except:
-    jacklib.jack_custom_get_keys = None
-
-try:
-    jacklib.jack_custom_set_data_appearance_callback.argtypes = [POINTER(jack_client_t), JackCustomDataAppearanceCallback, c_void_p]
-    jacklib.jack_custom_set_data_appearance_callback.restype = c_int
-except:
-    jacklib.jack_custom_set_data_appearance_callback = None
+_declare({
+    "jack_custom_publish_data": ([POINTER(jack_client_t), c_char_p, c_void_p, c_size_t], c_int),
+    "jack_custom_get_data": ([POINTER(jack_client_t), c_char_p, c_char_p, POINTER(c_void_p), POINTER(c_size_t)], c_int),
+    "jack_custom_unpublish_data": ([POINTER(jack_client_t), c_char_p], c_int),
+    "jack_custom_get_keys": ([POINTER(jack_client_t), c_char_p], POINTER(c_char_p)),
+    "jack_custom_set_data_appearance_callback": ([POINTER(jack_client_t), "JackCustomDataAppearanceCallback", c_void_p], c_int),
+}, optional=True)
 
 def custom_publish_data(client, key, data, size):
     if jacklib.jack_custom_publish_data:
@@ -1275,6 +1112,6 @@ def custom_get_keys(client, client_name):
 def custom_set_data_appearance_callback(client, custom_callback, arg):
     if jacklib.jack_custom_set_data_appearance_callback:
         global _custom_appearance_callback
-        _custom_appearance_callback = JackCustomDataAppearanceCallback(custom_callback)
+        _custom_appearance_callback = _callback_type("JackCustomDataAppearanceCallback")(custom_callback)
         return jacklib.jack_custom_set_data_appearance_callback(client, _custom_appearance_callback, arg)
     return -1
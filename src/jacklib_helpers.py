@@ -16,6 +16,11 @@
 #
 # For a full copy of the GNU General Public License see the COPYING file
 
+# ------------------------------------------------------------------------------------------------------------
+# Imports (Global)
+
+from array import array
+
 # ------------------------------------------------------------------------------------------------------------
 # Try Import jacklib
 
@@ -24,6 +29,14 @@ try:
 except ImportError:
     jacklib = None
 
+# ------------------------------------------------------------------------------------------------------------
+# Try Import numpy (optional, for audio buffer arrays)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 # ------------------------------------------------------------------------------------------------------------
 # Get JACK error status as string
 
@@ -99,6 +112,58 @@ def voidptr2str(void_p):
 def translate_audio_port_buffer(void_p):
     return jacklib.cast(void_p, jacklib.POINTER(jacklib.jack_default_audio_sample_t))
 
+# ------------------------------------------------------------------------------------------------------------
+# Zero-copy views of JACK audio buffers
+# Views point to JACK memory, they are only valid during the current process cycle.
+
+def audio_buffer_memoryview(address, nframes):
+    # memoryview of nframes floats (format 'f') at address
+    c_array = (jacklib.jack_default_audio_sample_t * nframes).from_address(address)
+    return memoryview(c_array).cast("B").cast("f")
+
+def audio_buffer_array(address, nframes):
+    # numpy float32 array of nframes at address, None without numpy
+    if numpy is None:
+        return None
+    c_array = (jacklib.jack_default_audio_sample_t * nframes).from_address(address)
+    return numpy.frombuffer(c_array, dtype=numpy.float32, count=nframes)
+
+class AudioPortBuffer(object):
+    # Gets the buffer of an audio port at each cycle, as a numpy float32 array
+    # (or a memoryview if numpy is not available or use_numpy is False).
+    # JACK almost always returns the same address for a port,
+    # so views are only re-created when address or buffer size change:
+    # get() does not allocate in the process callback.
+
+    def __init__(self, port, use_numpy=True):
+        self.port = port
+        self.fUseNumpy = bool(use_numpy and numpy is not None)
+        self.fAddress = None
+        self.fNFrames = 0
+        self.fView = None
+
+    def get(self, nframes):
+        address = jacklib.port_get_buffer(self.port, nframes)
+
+        if not address:
+            return None
+
+        if address != self.fAddress or nframes != self.fNFrames:
+            self.fAddress = address
+            self.fNFrames = nframes
+            if self.fUseNumpy:
+                self.fView = audio_buffer_array(address, nframes)
+            else:
+                self.fView = audio_buffer_memoryview(address, nframes)
+
+        return self.fView
+
+    def reset(self):
+        # forget the view, to call when the port is unregistered
+        self.fAddress = None
+        self.fNFrames = 0
+        self.fView = None
+
 # ------------------------------------------------------------------------------------------------------------
 # Convert a JACK midi buffer into a python variable-size list
 
@@ -114,4 +179,217 @@ def translate_midi_event_buffer(void_p, size):
     elif size == 4:
         return (void_p[0], void_p[1], void_p[2], void_p[3])
     else:
-        return ()
+        # SysEx
+        return tuple(void_p[:size])
+
+# ------------------------------------------------------------------------------------------------------------
+# Bulk MIDI read/write
+# All events of a port buffer are stored in one preallocated bytearray,
+# event i data is data[offsets[i]:offsets[i+1]], its frame time is times[i].
+
+MIDI_BULK_DATA_SIZE = 65536
+MIDI_BULK_MAX_EVENTS = 4096
+
+class MidiBulkReader(object):
+    # Reads all events of a MIDI port buffer with one read() call per cycle,
+    # without allocation. SysEx events are complete.
+    # Events not fitting in the buffers are counted in fOverflows.
+
+    def __init__(self, data_size=MIDI_BULK_DATA_SIZE, max_events=MIDI_BULK_MAX_EVENTS):
+        self.data = bytearray(data_size)
+        self.times = array("I", bytes(4 * max_events))
+        self.offsets = array("I", bytes(4 * (max_events + 1)))
+        self.count = 0
+
+        self.fDataAddress = jacklib.addressof((jacklib.c_char * data_size).from_buffer(self.data))
+        self.fMaxEvents = max_events
+        self.fEvent = jacklib.jack_midi_event_t()
+        self.fOverflows = 0
+
+    def read(self, port_buffer):
+        # drains port_buffer, returns the number of events read
+        event = self.fEvent
+        times = self.times
+        offsets = self.offsets
+        dataSize = len(self.data)
+        offset = 0
+        count = 0
+
+        for i in range(jacklib.midi_get_event_count(port_buffer)):
+            if jacklib.midi_event_get(event, port_buffer, i) != 0:
+                continue
+
+            size = event.size
+            if count == self.fMaxEvents or offset + size > dataSize:
+                self.fOverflows += 1
+                continue
+
+            jacklib.memmove(self.fDataAddress + offset, event.buffer, size)
+            times[count] = event.time
+            offsets[count] = offset
+            offset += size
+            count += 1
+
+        offsets[count] = offset
+        self.count = count
+        return count
+
+    def event(self, index):
+        # returns (time, data memoryview) of event at index, valid until next read()
+        return (self.times[index],
+                memoryview(self.data)[self.offsets[index]:self.offsets[index+1]])
+
+    def events(self):
+        for i in range(self.count):
+            yield self.event(i)
+
+class MidiBulkWriter(object):
+    # Writes events stored as MidiBulkReader does into a MIDI port buffer,
+    # with one write() call per cycle.
+    # Events refused by JACK (buffer full) are counted in fLost.
+
+    def __init__(self):
+        self.fLost = 0
+        # last written data and its ctypes array, usually the same each cycle
+        self.fData = None
+        self.fCData = None
+
+    def write(self, port_buffer, data, times, offsets, count, clear=True):
+        # data is a bytearray (zero-copy) or bytes,
+        # returns the number of written events
+        if clear:
+            jacklib.midi_clear_buffer(port_buffer)
+
+        if count == 0:
+            return 0
+
+        if data is not self.fData:
+            # a bytearray is shared, not copied (and can not be resized anymore)
+            if isinstance(data, bytearray):
+                self.fCData = (jacklib.c_char * len(data)).from_buffer(data)
+            else:
+                self.fCData = (jacklib.c_char * len(data)).from_buffer_copy(data)
+            self.fData = data
+
+        dataAddress = jacklib.addressof(self.fCData)
+
+        written = 0
+        for i in range(count):
+            size = offsets[i+1] - offsets[i]
+            ptr = jacklib.midi_event_reserve(port_buffer, times[i], size)
+            if not ptr:
+                self.fLost += 1
+                continue
+
+            jacklib.memmove(ptr, dataAddress + offsets[i], size)
+            written += 1
+
+        return written
+
+    def write_from(self, port_buffer, reader, clear=True):
+        # forward all events read by a MidiBulkReader
+        return self.write(port_buffer, reader.data, reader.times, reader.offsets, reader.count, clear)
+
+# ------------------------------------------------------------------------------------------------------------
+# Ringbuffer wrapper
+# Lock-free single reader / single writer buffer, to get data out of the process callback.
+# Methods of one side (read or write) must only be called from one thread.
+
+class RingBuffer(object):
+    def __init__(self, size, mlock=False):
+        # size is rounded up to a power of two by JACK, one byte is never usable
+        self.fRingBuffer = jacklib.ringbuffer_create(size)
+        if not self.fRingBuffer:
+            raise MemoryError("jack_ringbuffer_create(%i) failed" % size)
+
+        # preallocated, filled by get_read_vector() and get_write_vector()
+        self.fReadVector = (jacklib.jack_ringbuffer_data_t * 2)()
+        self.fWriteVector = (jacklib.jack_ringbuffer_data_t * 2)()
+
+        if mlock:
+            self.mlock()
+
+    def close(self):
+        if self.fRingBuffer:
+            jacklib.ringbuffer_free(self.fRingBuffer)
+            self.fRingBuffer = None
+
+    def __del__(self):
+        if hasattr(self, "fRingBuffer"):
+            self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def size(self):
+        return self.fRingBuffer.contents.size
+
+    def mlock(self):
+        # lock the buffer memory, it will never be swapped
+        if jacklib.ringbuffer_mlock(self.fRingBuffer) != 0:
+            raise OSError("jack_ringbuffer_mlock failed")
+
+    def reset(self):
+        # not thread safe
+        jacklib.ringbuffer_reset(self.fRingBuffer)
+
+    def read_space(self):
+        return jacklib.ringbuffer_read_space(self.fRingBuffer)
+
+    def write_space(self):
+        return jacklib.ringbuffer_write_space(self.fRingBuffer)
+
+    # zero-copy access, the readable or writable area is given as
+    # two memoryviews (the second one is empty if the area does not wrap).
+    # Views are valid until read_advance() or write_advance().
+
+    def _vector_views(self, vector):
+        views = []
+        for data in vector:
+            if data.len and data.buf:
+                c_array = (jacklib.c_char * data.len).from_address(data.buf)
+                views.append(memoryview(c_array).cast("B"))
+            else:
+                views.append(memoryview(b""))
+        return tuple(views)
+
+    def get_read_vector(self):
+        jacklib.ringbuffer_get_read_vector(self.fRingBuffer, self.fReadVector)
+        return self._vector_views(self.fReadVector)
+
+    def get_write_vector(self):
+        jacklib.ringbuffer_get_write_vector(self.fRingBuffer, self.fWriteVector)
+        return self._vector_views(self.fWriteVector)
+
+    def read_advance(self, cnt):
+        jacklib.ringbuffer_read_advance(self.fRingBuffer, cnt)
+
+    def write_advance(self, cnt):
+        jacklib.ringbuffer_write_advance(self.fRingBuffer, cnt)
+
+    # copying access
+
+    def write(self, data):
+        # data is bytes-like, returns the number of bytes written
+        view = memoryview(data).cast("B")
+        if view.readonly:
+            c_data = (jacklib.c_char * len(view)).from_buffer_copy(view)
+        else:
+            c_data = (jacklib.c_char * len(view)).from_buffer(view)
+        return jacklib.ringbuffer_write(self.fRingBuffer, jacklib.addressof(c_data), len(view))
+
+    def read_into(self, buffer, peek=False):
+        # fills the writable bytes-like buffer, returns the number of bytes read
+        c_data = (jacklib.c_char * len(buffer)).from_buffer(buffer)
+        if peek:
+            return jacklib.ringbuffer_peek(self.fRingBuffer, jacklib.addressof(c_data), len(buffer))
+        return jacklib.ringbuffer_read(self.fRingBuffer, jacklib.addressof(c_data), len(buffer))
+
+    def read(self, cnt, peek=False):
+        # returns up to cnt bytes
+        buffer = bytearray(min(cnt, self.read_space()))
+        read = self.read_into(buffer, peek)
+        return bytes(buffer[:read])
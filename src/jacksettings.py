@@ -41,6 +41,11 @@ global gJackctl, gResetNeeded
 gJackctl = None
 gResetNeeded = False
 
+# jackdbus parameters cache, each DBus call here is a round trip.
+# containers: {container: list of parameter names}
+# values: {(container, parameter): (is_set, default, value)}
+_paramsCache = {'containers': {}, 'values': {}}
+
 _logger = logging.getLogger(__name__)
 
 
@@ -62,6 +67,8 @@ else:
 def initBus(bus) -> int:
     global gJackctl
 
+    invalidateCache()
+
     if not bus:
         gJackctl = None
         return 1
@@ -85,6 +92,83 @@ def setResetNeeded(yesNo: bool):
     global gResetNeeded
     gResetNeeded = yesNo
 
+# Cache functions
+def invalidateCache(container=None):
+    '''forget cached parameters of container,
+    or of all containers if container is None'''
+    if container is None:
+        _paramsCache['containers'].clear()
+        _paramsCache['values'].clear()
+        return
+
+    _paramsCache['containers'].pop(container, None)
+    for key in [k for k in _paramsCache['values'] if k[0] == container]:
+        del _paramsCache['values'][key]
+
+def readContainer(container) -> list[str]:
+    'parameter names of container, read once from jackdbus'
+    params = _paramsCache['containers'].get(container)
+    if params is not None:
+        return params
+
+    if gJackctl is None:
+        return []
+
+    try:
+        params = [str(p) for p in gJackctl.ReadContainer([container])[1]]
+    except:
+        return []
+
+    _paramsCache['containers'][container] = params
+    return params
+
+def getParameter(container, parameter):
+    'returns (is_set, default, value), or None if not readable'
+    key = (container, parameter)
+    param = _paramsCache['values'].get(key)
+    if param is not None:
+        return param
+
+    if gJackctl is None:
+        return None
+
+    try:
+        param = tuple(gJackctl.GetParameterValue([container, parameter]))
+    except:
+        return None
+
+    _paramsCache['values'][key] = param
+    return param
+
+def _setParameter(container, parameter, value) -> bool:
+    try:
+        ret = bool(gJackctl.SetParameterValue([container, parameter], value))
+    except:
+        _logger.warning(f"Failed to set JACK parameter {container}:{parameter}")
+        invalidateCache(container)
+        return False
+
+    param = _paramsCache['values'].get((container, parameter))
+    if ret and param is not None:
+        _paramsCache['values'][(container, parameter)] = (
+            True, param[1], value)
+    else:
+        _paramsCache['values'].pop((container, parameter), None)
+
+    if container == "engine" and parameter == "driver":
+        # driver container depends on the engine driver
+        invalidateCache("driver")
+
+    return ret
+
+def _resetParameter(container, parameter):
+    gJackctl.ResetParameterValue([container, parameter])
+
+    param = _paramsCache['values'].get((container, parameter))
+    if param is not None:
+        _paramsCache['values'][(container, parameter)] = (
+            False, param[1], param[1])
+
 # Helper functions
 def getBufferSize():
     return getDriverParameter("period", -1)
@@ -102,68 +186,167 @@ def setSampleRate(srate):
     return setDriverParameter("rate", dbus.UInt32(srate))
 
 # Helper functions (engine)
-def engineHasFeature(feature):
-    if gJackctl is None:
-        return False
-    try:
-        featureList = gJackctl.ReadContainer(["engine"])[1]
-    except:
-        featureList = ()
-    return bool(dbus.String(feature) in featureList)
+def engineHasFeature(feature) -> bool:
+    return bool(feature in readContainer("engine"))
 
 def getEngineParameter(parameter, fallback):
-    if gJackctl is None or not engineHasFeature(parameter):
+    if not engineHasFeature(parameter):
         return fallback
-    else:
-        try:
-            return gJackctl.GetParameterValue(["engine", parameter])[2]
-        except:
-            return fallback
+
+    param = getParameter("engine", parameter)
+    if param is None:
+        return fallback
+    return param[2]
 
 def setEngineParameter(parameter, value, optional=True):
     if not engineHasFeature(parameter):
         return False
     elif optional:
-        paramValueTry = gJackctl.GetParameterValue(["engine", parameter])
-        if paramValueTry is None:
+        param = getParameter("engine", parameter)
+        if param is None:
             return False
-        paramValue = paramValueTry[2]
-        if value != paramValue:
-            return bool(gJackctl.SetParameterValue(["engine", parameter], value))
+        if value != param[2]:
+            return _setParameter("engine", parameter, value)
         else:
             return False
     else:
-        return bool(gJackctl.SetParameterValue(["engine", parameter], value))
+        return _setParameter("engine", parameter, value)
+
+def resetEngineParameter(parameter):
+    if engineHasFeature(parameter):
+        _resetParameter("engine", parameter)
 
 # Helper functions (driver)
 def driverHasFeature(feature) -> bool:
-    if gJackctl is None:
-        return False
-    try:
-        featureList = gJackctl.ReadContainer(["driver"])[1]
-    except:
-        featureList = ()
-    return bool(dbus.String(feature) in featureList)
+    return bool(feature in readContainer("driver"))
 
 def getDriverParameter(parameter, fallback):
-    if gJackctl is None or not driverHasFeature(parameter):
+    if not driverHasFeature(parameter):
         return fallback
-    else:
-        try:
-            return gJackctl.GetParameterValue(["driver", parameter])[2]
-        except:
-            return fallback
+
+    param = getParameter("driver", parameter)
+    if param is None:
+        return fallback
+    return param[2]
 
 def setDriverParameter(parameter, value, optional=True):
     if not driverHasFeature(parameter):
         return False
     elif optional:
-        if value != gJackctl.GetParameterValue(["driver", parameter])[2]:
-            return bool(gJackctl.SetParameterValue(["driver", parameter], value))
+        param = getParameter("driver", parameter)
+        if param is None:
+            return False
+        if value != param[2]:
+            return _setParameter("driver", parameter, value)
         else:
             return False
     else:
-        return bool(gJackctl.SetParameterValue(["driver", parameter], value))
+        return _setParameter("driver", parameter, value)
+
+def resetDriverParameter(parameter):
+    if driverHasFeature(parameter):
+        _resetParameter("driver", parameter)
+
+
+class ParametersTransaction:
+    '''Snapshot of jackdbus parameters taken when the dialog loads them.
+    Values are staged from the widgets, only the ones differing
+    from the snapshot are applied on commit, and all of them
+    are restored if one fails.'''
+
+    _RESET = object()
+
+    def __init__(self):
+        # {(container, parameter): (is_set, default, value)}
+        self._snapshot = {}
+        # {(container, parameter): value or _RESET}
+        self._staged = {}
+
+    def snapshot(self, container):
+        for key in [k for k in self._snapshot if k[0] == container]:
+            del self._snapshot[key]
+        for key in [k for k in self._staged if k[0] == container]:
+            del self._staged[key]
+
+        for parameter in readContainer(container):
+            param = getParameter(container, parameter)
+            if param is not None:
+                self._snapshot[(container, parameter)] = param
+
+    def stage(self, container, parameter, value):
+        if parameter in readContainer(container):
+            self._staged[(container, parameter)] = value
+
+    def stageReset(self, container, parameter):
+        if parameter in readContainer(container):
+            self._staged[(container, parameter)] = self._RESET
+
+    def diff(self) -> dict:
+        'staged changes, in staging order'
+        changes = {}
+
+        for key, value in self._staged.items():
+            param = self._snapshot.get(key)
+            if param is None:
+                param = getParameter(*key)
+                if param is None:
+                    continue
+
+            if value is self._RESET:
+                if param[0]:
+                    changes[key] = value
+            elif value != param[2]:
+                changes[key] = value
+
+        return changes
+
+    def commit(self) -> bool:
+        '''apply the staged changes.
+        Returns False if one failed, in this case applied ones
+        have been rolled back.'''
+        applied = []
+        success = True
+
+        for key, value in self.diff().items():
+            container, parameter = key
+            try:
+                if value is self._RESET:
+                    _resetParameter(container, parameter)
+                elif not _setParameter(container, parameter, value):
+                    success = False
+            except:
+                success = False
+
+            if not success:
+                _logger.error(
+                    f"Failed to apply JACK parameter {container}:{parameter}, "
+                    "rolling back")
+                break
+
+            applied.append(key)
+
+        if not success:
+            for key in reversed(applied):
+                container, parameter = key
+                param = self._snapshot.get(key)
+                if param is None:
+                    continue
+                try:
+                    if param[0]:
+                        _setParameter(container, parameter, param[2])
+                    else:
+                        _resetParameter(container, parameter)
+                except:
+                    _logger.error(
+                        f"Failed to restore JACK parameter {container}:{parameter}")
+        else:
+            for key in applied:
+                param = getParameter(*key)
+                if param is not None:
+                    self._snapshot[key] = param
+
+        self._staged.clear()
+        return success
 
 
 # JACK Settings Dialog
@@ -182,10 +365,13 @@ class JackSettingsW(QDialog):
             QTimer.singleShot(0, self.slot_closeWithError)
             return
 
+        # parameters may have been changed by another jackdbus client
+        invalidateCache()
+
         # -------------------------------------------------------------
         # Align driver text and hide non available ones
 
-        driverList = gJackctl.ReadContainer(["drivers"])[1]
+        driverList = readContainer("drivers")
         fontMetris = QFontMetrics(self.ui.obj_server_driver.font())
         maxWidth = 75
 
@@ -199,7 +385,7 @@ class JackSettingsW(QDialog):
             if itemWidth > maxWidth:
                 maxWidth = itemWidth
 
-            if dbus.String(itexText.lower()) not in driverList:
+            if itexText.lower() not in driverList:
                 self.ui.obj_server_driver.hideRow(i)
 
         #self.ui.obj_server_driver.setMinimumWidth(maxWidth)
@@ -223,6 +409,7 @@ class JackSettingsW(QDialog):
 
         # Load initial settings
         self.fDriverName = ""
+        self.fTransaction = ParametersTransaction()
         self.fBrokenServerClockSource = False
 
         self.checkEngine()
@@ -230,8 +417,7 @@ class JackSettingsW(QDialog):
         self.loadDriverSettings(True) # reset because we'll change it below
 
         # Load selected JACK driver
-        self.fDriverName = str(
-            gJackctl.GetParameterValue(["engine", "driver"])[2])
+        self.fDriverName = str(getEngineParameter("driver", ""))
         for i in range(self.ui.obj_server_driver.rowCount()):
             if (self.ui.obj_server_driver.item(i, 0).text().lower()
                     == self.fDriverName):
@@ -277,33 +463,32 @@ class JackSettingsW(QDialog):
 
     def saveServerSettings(self):
         # always reset server name
-        if engineHasFeature("name"):
-            setEngineParameter("name", "default", True)
+        self.fTransaction.stage("engine", "name", dbus.String("default"))
 
         if self.ui.obj_server_realtime.isEnabled():
             value = dbus.Boolean(self.ui.obj_server_realtime.isChecked())
-            setEngineParameter("realtime", value, True)
+            self.fTransaction.stage("engine", "realtime", value)
 
         if self.ui.obj_server_realtime_priority.isEnabled():
             value = dbus.Int32(self.ui.obj_server_realtime_priority.value())
-            setEngineParameter("realtime-priority", value, True)
+            self.fTransaction.stage("engine", "realtime-priority", value)
 
         if self.ui.obj_server_temporary.isEnabled():
             value = dbus.Boolean(self.ui.obj_server_temporary.isChecked())
-            setEngineParameter("temporary", value, True)
+            self.fTransaction.stage("engine", "temporary", value)
 
         if self.ui.obj_server_verbose.isEnabled():
             value = dbus.Boolean(self.ui.obj_server_verbose.isChecked())
-            setEngineParameter("verbose", value, True)
+            self.fTransaction.stage("engine", "verbose", value)
 
         if self.ui.obj_server_alias.isEnabled():
             value = dbus.Boolean(self.ui.obj_server_alias.isChecked())
-            setEngineParameter("alias", value, True)
+            self.fTransaction.stage("engine", "alias", value)
 
         if self.ui.obj_server_client_timeout.isEnabled():
             value = dbus.Int32(int(
                 self.ui.obj_server_client_timeout.currentText()))
-            setEngineParameter("client-timeout", value, True)
+            self.fTransaction.stage("engine", "client-timeout", value)
 
         if self.ui.obj_server_clock_source.isEnabled():
             if self.ui.obj_server_clock_source_system.isChecked():
@@ -328,19 +513,19 @@ class JackSettingsW(QDialog):
                     "Cannot save clock-source value")
 
             if value != None:
-                setEngineParameter("clock-source", value, True)
+                self.fTransaction.stage("engine", "clock-source", value)
 
         if self.ui.obj_server_port_max.isEnabled():
             value = dbus.UInt32(int(self.ui.obj_server_port_max.currentText()))
-            setEngineParameter("port-max", value, True)
+            self.fTransaction.stage("engine", "port-max", value)
 
         if self.ui.obj_server_replace_registry.isEnabled():
             value = dbus.Boolean(self.ui.obj_server_replace_registry.isChecked())
-            setEngineParameter("replace-registry", value, True)
+            self.fTransaction.stage("engine", "replace-registry", value)
 
         if self.ui.obj_server_sync.isEnabled():
             value = dbus.Boolean(self.ui.obj_server_sync.isChecked())
-            setEngineParameter("sync", value, True)
+            self.fTransaction.stage("engine", "sync", value)
 
         if self.ui.obj_server_self_connect_mode.isEnabled():
             if self.ui.obj_server_self_connect_mode_0.isChecked():
@@ -360,32 +545,23 @@ class JackSettingsW(QDialog):
                     "Cannot save self-connect-mode value")
 
             if value != None:
-                setEngineParameter("self-connect-mode", value, True)
+                self.fTransaction.stage("engine", "self-connect-mode", value)
 
     def loadServerSettings(self, reset=False, forceReset=False):
         global gJackctl
 
-        settings = gJackctl.ReadContainer(["engine"])
+        for attribute in readContainer("engine"):
+            valueTry = getParameter("engine", attribute)
+            if valueTry is None:
+                continue
 
-        for i in range(len(settings[1])):
-            attribute = str(settings[1][i])
             if reset:
-                valueTry = gJackctl.GetParameterValue(["engine", attribute])
-
-                if valueTry is None:
-                    continue
-                else:
-                    value = valueTry[1]
+                value = valueTry[1]
 
                 if forceReset and attribute != "driver":
-                    gJackctl.ResetParameterValue(["engine", attribute])
+                    resetEngineParameter(attribute)
             else:
-                valueTry = gJackctl.GetParameterValue(["engine", attribute])
-
-                if valueTry is None:
-                    continue
-                else:
-                    value = valueTry[2]
+                value = valueTry[2]
 
             if attribute == "name":
                 pass # Don't allow to change this
@@ -460,6 +636,8 @@ class JackSettingsW(QDialog):
                     "JackSettingsW::loadServerSettings() - "
                     f"Unimplemented server attribute '{attribute}', "
                     f"value: '{str(value)}'")
+
+        self.fTransaction.snapshot("engine")
                 
 
     # Driver calls
@@ -475,11 +653,10 @@ class JackSettingsW(QDialog):
 
         if self.ui.obj_driver_device.isEnabled():
             value = dbus.String(self.ui.obj_driver_device.currentText().split(" [")[0])
-            if value != gJackctl.GetParameterValue(["driver", "device"])[2]:
-                gJackctl.SetParameterValue(["driver", "device"], value)
+            self.fTransaction.stage("driver", "device", value)
 
         elif resetIfNeeded:
-            gJackctl.ResetParameterValue(["driver", "device"])
+            self.fTransaction.stageReset("driver", "device")
 
         if self.ui.obj_driver_capture.isEnabled():
             if self.fDriverName == "alsa":
@@ -495,10 +672,10 @@ class JackSettingsW(QDialog):
                     "Cannot save capture value")
 
             if value != None:
-                setDriverParameter("capture", value, True)
+                self.fTransaction.stage("driver", "capture", value)
 
         elif resetIfNeeded:
-            gJackctl.ResetParameterValue(["driver", "capture"])
+            self.fTransaction.stageReset("driver", "capture")
 
         if self.ui.obj_driver_playback.isEnabled():
             if self.fDriverName == "alsa":
@@ -517,46 +694,46 @@ class JackSettingsW(QDialog):
                     "Cannot save playback value")
 
             if value != None:
-                setDriverParameter("playback", value, True)
+                self.fTransaction.stage("driver", "playback", value)
 
         elif resetIfNeeded:
-            gJackctl.ResetParameterValue(["driver", "playback"])
+            self.fTransaction.stageReset("driver", "playback")
 
         if self.ui.obj_driver_rate.isEnabled():
             value = dbus.UInt32(int(self.ui.obj_driver_rate.currentText()))
-            setDriverParameter("rate", value, True)
+            self.fTransaction.stage("driver", "rate", value)
 
         if self.ui.obj_driver_period.isEnabled():
             value = dbus.UInt32(int(self.ui.obj_driver_period.currentText()))
-            setDriverParameter("period", value, True)
+            self.fTransaction.stage("driver", "period", value)
 
         if self.ui.obj_driver_nperiods.isEnabled():
             value = dbus.UInt32(self.ui.obj_driver_nperiods.value())
-            setDriverParameter("nperiods", value, True)
+            self.fTransaction.stage("driver", "nperiods", value)
 
         if self.ui.obj_driver_hwmon.isEnabled():
             value = dbus.Boolean(self.ui.obj_driver_hwmon.isChecked())
-            setDriverParameter("hwmon", value, True)
+            self.fTransaction.stage("driver", "hwmon", value)
 
         if self.ui.obj_driver_hwmeter.isEnabled():
             value = dbus.Boolean(self.ui.obj_driver_hwmeter.isChecked())
-            setDriverParameter("hwmeter", value, True)
+            self.fTransaction.stage("driver", "hwmeter", value)
 
         if self.ui.obj_driver_duplex.isEnabled():
             value = dbus.Boolean(self.ui.obj_driver_duplex.isChecked())
-            setDriverParameter("duplex", value, True)
+            self.fTransaction.stage("driver", "duplex", value)
 
         if self.ui.obj_driver_hw_alias.isEnabled():
             value = dbus.Boolean(self.ui.obj_driver_hw_alias.isChecked())
-            setDriverParameter("hw-alias", value, True)
+            self.fTransaction.stage("driver", "hw-alias", value)
 
         if self.ui.obj_driver_softmode.isEnabled():
             value = dbus.Boolean(self.ui.obj_driver_softmode.isChecked())
-            setDriverParameter("softmode", value, True)
+            self.fTransaction.stage("driver", "softmode", value)
 
         if self.ui.obj_driver_monitor.isEnabled():
             value = dbus.Boolean(self.ui.obj_driver_monitor.isChecked())
-            setDriverParameter("monitor", value, True)
+            self.fTransaction.stage("driver", "monitor", value)
 
         if self.ui.obj_driver_dither.isEnabled():
             if self.ui.obj_driver_dither.currentIndex() == 0:
@@ -574,27 +751,27 @@ class JackSettingsW(QDialog):
                     "Cannot save dither value")
 
             if value != None:
-                setDriverParameter("dither", value, True)
+                self.fTransaction.stage("driver", "dither", value)
 
         if self.ui.obj_driver_inchannels.isEnabled():
             value = dbus.UInt32(self.ui.obj_driver_inchannels.value())
-            setDriverParameter("inchannels", value, True)
+            self.fTransaction.stage("driver", "inchannels", value)
 
         if self.ui.obj_driver_outchannels.isEnabled():
             value = dbus.UInt32(self.ui.obj_driver_outchannels.value())
-            setDriverParameter("outchannels", value, True)
+            self.fTransaction.stage("driver", "outchannels", value)
 
         if self.ui.obj_driver_shorts.isEnabled():
             value = dbus.Boolean(self.ui.obj_driver_shorts.isChecked())
-            setDriverParameter("shorts", value, True)
+            self.fTransaction.stage("driver", "shorts", value)
 
         if self.ui.obj_driver_input_latency.isEnabled():
             value = dbus.UInt32(self.ui.obj_driver_input_latency.value())
-            setDriverParameter("input-latency", value, True)
+            self.fTransaction.stage("driver", "input-latency", value)
 
         if self.ui.obj_driver_output_latency.isEnabled():
             value = dbus.UInt32(self.ui.obj_driver_output_latency.value())
-            setDriverParameter("output-latency", value, True)
+            self.fTransaction.stage("driver", "output-latency", value)
 
         if self.ui.obj_driver_midi_driver.isEnabled():
             if self.ui.obj_driver_midi_driver.currentIndex() == 0:
@@ -611,39 +788,40 @@ class JackSettingsW(QDialog):
 
             if value != None:
                 if driverHasFeature("midi"):
-                    setDriverParameter("midi", value, True)
+                    self.fTransaction.stage("driver", "midi", value)
                 else:
-                    setDriverParameter("midi-driver", value, True)
+                    self.fTransaction.stage("driver", "midi-driver", value)
 
         if self.ui.obj_driver_wait.isEnabled():
             value = dbus.UInt32(self.ui.obj_driver_wait.value())
-            setDriverParameter("wait", value, True)
+            self.fTransaction.stage("driver", "wait", value)
 
         if self.ui.obj_driver_verbose.isEnabled():
             value = dbus.UInt32(self.ui.obj_driver_verbose.value())
-            setDriverParameter("verbose", value, True)
+            self.fTransaction.stage("driver", "verbose", value)
 
         if self.ui.obj_driver_snoop.isEnabled():
             value = dbus.Boolean(self.ui.obj_driver_snoop.isChecked())
-            setDriverParameter("snoop", value, True)
+            self.fTransaction.stage("driver", "snoop", value)
 
         if self.ui.obj_driver_channels.isEnabled():
             value = dbus.Int32(self.ui.obj_driver_channels.value())
-            setDriverParameter("channels", value, True)
+            self.fTransaction.stage("driver", "channels", value)
 
     def loadDriverSettings(self, reset=False, forceReset=False):
         global gJackctl
 
-        settings = gJackctl.ReadContainer(["driver"])
+        for attribute in readContainer("driver"):
+            valueTry = getParameter("driver", attribute)
+            if valueTry is None:
+                continue
 
-        for i in range(len(settings[1])):
-            attribute = str(settings[1][i])
             if reset:
-                value = gJackctl.GetParameterValue(["driver", attribute])[1]
+                value = valueTry[1]
                 if forceReset:
-                    gJackctl.ResetParameterValue(["driver", attribute])
+                    resetDriverParameter(attribute)
             else:
-                value = gJackctl.GetParameterValue(["driver", attribute])[2]
+                value = valueTry[2]
 
             if attribute == "device":
                 self.setComboBoxValue(self.ui.obj_driver_device, str(value), True)
@@ -732,6 +910,8 @@ class JackSettingsW(QDialog):
                     f", value: '{str(value)}'"
                 )
 
+        self.fTransaction.snapshot("driver")
+
     # -----------------------------------------------------------------
     # Helper functions
 
@@ -801,11 +981,13 @@ class JackSettingsW(QDialog):
 
         # Save previous settings
         self.saveDriverSettings(False)
+        if not self.fTransaction.commit():
+            self.showApplyError()
 
         # Set new Jack driver
         self.fDriverName = dbus.String(
             self.ui.obj_server_driver.item(row, 0).text().lower())
-        gJackctl.SetParameterValue(["engine", "driver"], self.fDriverName)
+        setEngineParameter("driver", self.fDriverName, False)
 
         # Add device list
         self.ui.obj_driver_device.clear()
@@ -933,6 +1115,14 @@ class JackSettingsW(QDialog):
     def slot_saveJackSettings(self):
         self.saveServerSettings()
         self.saveDriverSettings(True)
+        if not self.fTransaction.commit():
+            self.showApplyError()
+
+    def showApplyError(self):
+        QMessageBox.warning(
+            self, self.tr("Error"),
+            self.tr("Failed to apply JACK settings, "
+                    "previous settings have been restored."))
 
     @pyqtSlot()
     def slot_resetJackSettings(self):
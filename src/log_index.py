@@ -0,0 +1,230 @@
+# Line offsets index of a log file, stored on disk.
+# Lets a view read any line of a huge log file
+# without keeping the file contents (nor the offsets) in memory.
+
+from array import array
+from heapq import merge
+import os
+import struct
+import tempfile
+from typing import Iterable, Optional
+
+import log_parser
+
+
+class _EventRows:
+    '''rows of the notable lines of one level or kind,
+    with their timestamps, stored in a temporary file.
+    Rows and timestamps only grow, so they are searched by bisection.'''
+
+    RECORD = struct.Struct('=Qd')
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile(prefix='caleson-log-events-')
+        self._fd = self._file.fileno()
+        self.count = 0
+        'records readable by the view'
+
+    def close(self):
+        self._file.close()
+
+    def append(self, records: list[tuple[int, float]]):
+        data = b''.join([self.RECORD.pack(*record) for record in records])
+        os.pwrite(self._fd, data, self.count * self.RECORD.size)
+        # set once written, the view reads below count
+        self.count += len(records)
+
+    def _record(self, i: int) -> tuple[int, float]:
+        return self.RECORD.unpack(
+            os.pread(self._fd, self.RECORD.size, i * self.RECORD.size))
+
+    def _bisect(self, value, field: int, lo: int, hi: int) -> int:
+        'first record in [lo, hi[ whose field is >= value'
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record(mid)[field] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def rows(self, first_row: int, end_row: Optional[int],
+             since: Optional[float]) -> array:
+        'rows in [first_row, end_row[, written at or after since'
+        # the follower may append while we read
+        length = self.count
+        start = self._bisect(first_row, 0, 0, length)
+        if since is not None:
+            start = max(start, self._bisect(since, 1, 0, length))
+        end = length
+        if end_row is not None:
+            end = self._bisect(end_row, 0, start, length)
+
+        rows = array('Q')
+        if end <= start:
+            return rows
+
+        data = os.pread(self._fd, (end - start) * self.RECORD.size,
+                        start * self.RECORD.size)
+        rows.extend([row for row, time in self.RECORD.iter_unpack(data)])
+        return rows
+
+
+class LogIndex:
+    '''Index of the complete lines of one opened log file.
+
+    Offsets are written in a temporary file by the follower thread
+    (`append_line_starts`), and read by the view with `line`.
+    The follower tells the view how many lines are readable,
+    the view never reads above this count, so no lock is needed.
+
+    Entry n of the index file is the offset of line n,
+    entry n+1 its end (after its newline).
+    A new LogIndex is created each time the log file is re-opened
+    (rotation, truncation).
+
+    Parsed infos of each line (level, kind, highlight span)
+    are stored the same way, and rows of notable lines
+    (warnings, errors, events) are indexed by level and kind,
+    with their timestamps, in one temporary file per level or kind.'''
+
+    ENTRY_SIZE = 8
+    INFO_SIZE = 4
+
+    def __init__(self, log_fd: int, first_offset=0):
+        # our own descriptor, the follower may close its own
+        self._log_fd = os.dup(log_fd)
+
+        self._index_file = tempfile.TemporaryFile(prefix='caleson-log-index-')
+        self._index_fd = self._index_file.fileno()
+        self._info_file = tempfile.TemporaryFile(prefix='caleson-log-infos-')
+        self._info_fd = self._info_file.fileno()
+        self._written = 0
+        self.append_line_starts(array('Q', [first_offset]))
+
+        # {level or kind: rows}, notable lines only
+        self._by_level = dict[int, _EventRows]()
+        self._by_kind = dict[int, _EventRows]()
+
+    def close(self):
+        if self._log_fd >= 0:
+            os.close(self._log_fd)
+            self._log_fd = -1
+
+        self._index_file.close()
+        self._info_file.close()
+        for event_rows in (list(self._by_level.values())
+                           + list(self._by_kind.values())):
+            event_rows.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except:
+            pass
+
+    # follower side
+
+    def append_line_starts(self, starts: array):
+        '''append the offsets following the last complete line.
+        Each offset is the end of a new complete line.'''
+        if not starts:
+            return
+        os.pwrite(self._index_fd, starts.tobytes(),
+                  self._written * self.ENTRY_SIZE)
+        self._written += len(starts)
+
+    def append_parsed_lines(self, first_row: int,
+                            lines: list['log_parser.ParsedLine'],
+                            timestamps: Iterable[float]):
+        '''store infos of lines starting at first_row,
+        must be called before append_line_starts for the same lines.
+        timestamps are the line times, or the previous known time.'''
+        infos = array('I', [line.pack() for line in lines])
+        os.pwrite(self._info_fd, infos.tobytes(), first_row * self.INFO_SIZE)
+
+        by_level = dict[int, list[tuple[int, float]]]()
+        by_kind = dict[int, list[tuple[int, float]]]()
+
+        for row, line, timestamp in zip(
+                range(first_row, first_row + len(lines)), lines, timestamps):
+            if line.level != log_parser.LEVEL_INFO:
+                by_level.setdefault(line.level, []).append((row, timestamp))
+
+            if line.kind != log_parser.KIND_NONE:
+                by_kind.setdefault(line.kind, []).append((row, timestamp))
+
+        for records_by_key, by_key in ((by_level, self._by_level),
+                                       (by_kind, self._by_kind)):
+            for key, records in records_by_key.items():
+                event_rows = by_key.get(key)
+                if event_rows is None:
+                    event_rows = by_key[key] = _EventRows()
+                event_rows.append(records)
+
+    def line_count(self) -> int:
+        'only reliable in the follower thread'
+        return self._written - 1
+
+    # view side
+
+    def _entries(self, first: int, count: int) -> array:
+        data = os.pread(self._index_fd, count * self.ENTRY_SIZE,
+                        first * self.ENTRY_SIZE)
+        entries = array('Q')
+        entries.frombytes(data[:len(data) - len(data) % self.ENTRY_SIZE])
+        return entries
+
+    def line_range(self, line: int) -> Optional[tuple[int, int]]:
+        entries = self._entries(line, 2)
+        if len(entries) < 2:
+            return None
+        return entries[0], entries[1]
+
+    def line_info(self, line: int) -> tuple[int, int, int]:
+        'returns level, kind and highlight span start of line'
+        data = os.pread(self._info_fd, self.INFO_SIZE, line * self.INFO_SIZE)
+        if len(data) < self.INFO_SIZE:
+            return (log_parser.LEVEL_INFO, log_parser.KIND_NONE,
+                    log_parser.NO_SPAN)
+        return log_parser.unpack(array('I', data)[0])
+
+    def event_rows(self, levels=(), kinds=(), since: Optional[float]=None,
+                   first_row=0, end_row: Optional[int]=None) -> list[int]:
+        '''sorted rows of lines with one of levels or one of kinds,
+        written at or after since (a timestamp), in [first_row, end_row[.'''
+        selections = list[array]()
+
+        for keys, by_key in ((levels, self._by_level),
+                             (kinds, self._by_kind)):
+            for key in keys:
+                event_rows = by_key.get(key)
+                if event_rows is None:
+                    continue
+                selections.append(
+                    event_rows.rows(first_row, end_row, since))
+
+        out = list[int]()
+        for row in merge(*selections):
+            if not out or out[-1] != row:
+                out.append(row)
+        return out
+
+    def line(self, line: int) -> bytes:
+        'line contents, without the newline'
+        line_range = self.line_range(line)
+        if line_range is None:
+            return b''
+
+        start, end = line_range
+        if end <= start:
+            return b''
+
+        # pread and not mmap, a mapped page after the end of a file
+        # truncated under our feet (purge, logrotate copytruncate)
+        # would kill the process with SIGBUS.
+        # A short read means the file has been truncated.
+        data = os.pread(self._log_fd, end - start, start)
+        if len(data) < end - start:
+            return b''
+        return data[:-1]
@@ -0,0 +1,122 @@
+# Parser of jackdbus, a2jmidid and LASH log lines.
+# Each line is tokenized once, in the log reader thread.
+
+from datetime import datetime
+import re
+from typing import Optional
+
+
+# levels
+LEVEL_INFO = 0
+LEVEL_WARNING = 1
+LEVEL_ERROR = 2
+
+# event kinds
+KIND_NONE = 0
+KIND_SEPARATOR = 1
+KIND_CONNECT = 2
+KIND_DISCONNECT = 3
+KIND_PORT_CREATED = 4
+KIND_PORT_DELETED = 5
+KIND_XRUN = 6
+
+NO_SPAN = 0xFFFF
+
+# terminal colors, with or without the escape char
+ANSI_RE = re.compile(r"\x1b?\[[0-9;]*m")
+
+# ctime() timestamp prefix ("Sat Oct 17 12:34:56 2026: ")
+TIME_RE = re.compile(
+    r"^\w{3} (\w{3}) +(\d{1,2}) (\d{2}):(\d{2}):(\d{2}) (\d{4}): ")
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+          "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# markers searched after a ": ", in this order.
+# The highlighted span starts at the space before the marker.
+_MARKERS = (
+    (": ERROR: ", LEVEL_ERROR, KIND_NONE),
+    (": error: ", LEVEL_ERROR, KIND_NONE),
+    (": WARNING: ", LEVEL_WARNING, KIND_NONE),
+    (": ------------------", LEVEL_INFO, KIND_SEPARATOR),
+    (": Connecting ", LEVEL_INFO, KIND_CONNECT),
+    (": Disconnecting ", LEVEL_INFO, KIND_DISCONNECT),
+    (": port created: ", LEVEL_INFO, KIND_PORT_CREATED),
+    (": port deleted: ", LEVEL_INFO, KIND_PORT_DELETED),
+)
+
+# "JackEngine::XRun", "JackAudioDriver::ProcessGraphAsync"...
+_SOURCE_RE = re.compile(r"(\w+)::")
+
+
+def strip_ansi(text: str) -> str:
+    return ANSI_RE.sub("", text)
+
+def parse_time(text: str) -> Optional[datetime]:
+    match = TIME_RE.match(text)
+    if match is None:
+        return None
+
+    month, day, hour, minute, second, year = match.groups()
+    if month not in MONTHS:
+        return None
+
+    try:
+        return datetime(int(year), MONTHS.index(month) + 1, int(day),
+                        int(hour), int(minute), int(second))
+    except ValueError:
+        return None
+
+
+class ParsedLine:
+    __slots__ = ('text', 'time', 'source', 'level', 'kind', 'span_start')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.time: Optional[datetime] = None
+        self.source = ''
+        self.level = LEVEL_INFO
+        self.kind = KIND_NONE
+        self.span_start = NO_SPAN
+
+    def pack(self) -> int:
+        'level, kind and span start packed in 32 bits'
+        return (min(self.span_start, NO_SPAN) << 16
+                | self.level << 8 | self.kind)
+
+
+def unpack(info: int) -> tuple[int, int, int]:
+    'returns level, kind, span_start'
+    return (info >> 8) & 0xFF, info & 0xFF, info >> 16
+
+def parse_line(raw: str) -> ParsedLine:
+    line = ParsedLine(strip_ansi(raw))
+    text = line.text
+
+    match = TIME_RE.match(text)
+    if match is None:
+        message_start = 0
+    else:
+        line.time = parse_time(text)
+        message_start = match.end()
+
+    for marker, level, kind in _MARKERS:
+        pos = text.find(marker)
+        if pos >= 0:
+            line.level = level
+            line.kind = kind
+            line.span_start = pos + 1
+            if pos + 1 == message_start - 1:
+                # marker just after the timestamp
+                message_start = pos + len(marker)
+            break
+
+    source_match = _SOURCE_RE.match(text, message_start)
+    if source_match is not None:
+        line.source = source_match.group(1)
+
+    if line.kind == KIND_NONE and 'xrun' in text.lower():
+        line.kind = KIND_XRUN
+        if line.span_start == NO_SPAN and message_start:
+            line.span_start = message_start - 1
+
+    return line
@@ -18,203 +18,455 @@
 # For a full copy of the GNU General Public License see the COPYING file
 
 # Imports (Global)
+from array import array
+from bisect import bisect_left
+from datetime import datetime
 import os
 import sys
+import time
+from typing import Optional
 
 from PyQt5.QtCore import (
-    pyqtSlot, pyqtSignal, Qt, QFile, QIODevice, QMutex, QMutexLocker,
-    QTextStream, QThread, QSettings)
-from PyQt5.QtGui import QPalette, QSyntaxHighlighter, QIcon
-from PyQt5.QtWidgets import QDialog
+    pyqtSlot, pyqtSignal, Qt, QAbstractListModel, QFileSystemWatcher,
+    QModelIndex, QObject, QThread, QSettings, QT_TRANSLATE_NOOP)
+from PyQt5.QtGui import QColor, QPalette, QIcon, QKeySequence
+from PyQt5.QtWidgets import (
+    QApplication, QDialog, QListView, QShortcut, QStyle,
+    QStyledItemDelegate, QStyleOptionViewItem)
 
 # Imports (Custom Stuff)
 
 import ui_logs
+import log_parser
+from log_index import LogIndex
 from shared import HOME, VERSION, getIcon, setUpSignals
 from shared_i18n import setup_i18n
 
 # Fix log text output (get rid of terminal colors stuff)
 
 def fixLogText(text: str) -> str:
-    return text.replace(
-        "[1m[31m", "").replace("[1m[33m", "").replace(
-            "[31m", "").replace("[33m", "").replace("[0m", "")
-
-# Syntax Highlighter for JACK
-
-class SyntaxHighlighter_JACK(QSyntaxHighlighter):
-    def __init__(self, parent):
-        QSyntaxHighlighter.__init__(self, parent)
-
-        self.fPalette = parent.palette()
-
-    def highlightBlock(self, text: str):
-        if ": ERROR: " in text:
-            self.setFormat(text.find(" ERROR: "), len(text), Qt.red)
-        elif ": WARNING: " in text:
-            self.setFormat(text.find(" WARNING: "), len(text), Qt.darkRed)
-        elif ": ------------------" in text:
-            self.setFormat(
-                text.find(" ------------------"),
-                len(text),
-                self.fPalette.color(QPalette.Active, QPalette.Mid))
-        elif ": Connecting " in text:
-            self.setFormat(
-                text.find(" Connecting "),
-                len(text),
-                self.fPalette.color(QPalette.Active, QPalette.Link))
-        elif ": Disconnecting " in text:
-            self.setFormat(
-                text.find(" Disconnecting "),
-                len(text),
-                self.fPalette.color(QPalette.Active, QPalette.LinkVisited))
-
-# Syntax Highlighter for A2J
-
-class SyntaxHighlighter_A2J(QSyntaxHighlighter):
-    def __init__(self, parent):
-        QSyntaxHighlighter.__init__(self, parent)
-
-        self.fPalette = parent.palette()
-
-    def highlightBlock(self, text):
-        if ": error: " in text:
-            self.setFormat(text.find(" error: "), len(text), Qt.red)
-        elif ": WARNING: " in text:
-            self.setFormat(text.find(" WARNING: "), len(text), Qt.darkRed)
-        elif ": ----------------------------" in text:
-            self.setFormat
-            (text.find("----------------------------"),
-             len(text),
-             self.fPalette.color(QPalette.Active, QPalette.Mid))
-        elif ": port created: " in text:
-            self.setFormat(
-                text.find(" port created: "),
-                len(text),
-                self.fPalette.color(QPalette.Active, QPalette.Link))
-        elif ": port deleted: " in text:
-            self.setFormat(
-                text.find(" port deleted: "),
-                len(text),
-                self.fPalette.color(QPalette.Active, QPalette.LinkVisited))
-
-# Syntax Highlighter for LASH
-
-class SyntaxHighlighter_LASH(QSyntaxHighlighter):
-    def __init__(self, parent):
-        QSyntaxHighlighter.__init__(self, parent)
-
-        self.fPalette = parent.palette()
-
-    def highlightBlock(self, text):
-        if ": ERROR: " in text:
-            self.setFormat(text.find(" ERROR: "), len(text), Qt.red)
-        elif ": WARNING: " in text:
-            self.setFormat(text.find(" WARNING: "), len(text), Qt.darkRed)
-        elif ": ------------------" in text:
-            self.setFormat(
-                text.find(" ------------------"),
-                len(text),
-                self.fPalette.color(QPalette.Active, QPalette.Mid))
-
-
-# Lock-less file read thread
+    return log_parser.strip_ansi(text)
+
+# Line colors, from the parsed level and kind
+
+def lineColor(palette: QPalette, level: int, kind: int) -> Optional[QColor]:
+    if level == log_parser.LEVEL_ERROR:
+        return QColor(Qt.red)
+    if level == log_parser.LEVEL_WARNING:
+        return QColor(Qt.darkRed)
+    if kind == log_parser.KIND_XRUN:
+        return QColor(Qt.darkYellow)
+    if kind == log_parser.KIND_SEPARATOR:
+        return palette.color(QPalette.Active, QPalette.Mid)
+    if kind in (log_parser.KIND_CONNECT, log_parser.KIND_PORT_CREATED):
+        return palette.color(QPalette.Active, QPalette.Link)
+    if kind in (log_parser.KIND_DISCONNECT, log_parser.KIND_PORT_DELETED):
+        return palette.color(QPalette.Active, QPalette.LinkVisited)
+    return None
+
+# Line filters: name, levels, kinds, max age in seconds
+
+LINE_FILTERS = (
+    (QT_TRANSLATE_NOOP("LogsW", "All lines"), None, None, None),
+    (QT_TRANSLATE_NOOP("LogsW", "Errors"),
+     (log_parser.LEVEL_ERROR,), (), None),
+    (QT_TRANSLATE_NOOP("LogsW", "Warnings and errors"),
+     (log_parser.LEVEL_WARNING, log_parser.LEVEL_ERROR), (), None),
+    (QT_TRANSLATE_NOOP("LogsW", "Xruns"),
+     (), (log_parser.KIND_XRUN,), None),
+    (QT_TRANSLATE_NOOP("LogsW", "Xruns in the last hour"),
+     (), (log_parser.KIND_XRUN,), 3600),
+    (QT_TRANSLATE_NOOP("LogsW", "Connections"),
+     (), (log_parser.KIND_CONNECT, log_parser.KIND_DISCONNECT,
+          log_parser.KIND_PORT_CREATED, log_parser.KIND_PORT_DELETED), None),
+)
+
+# Paints the highlighted part of the lines
+
+class LogLineDelegate(QStyledItemDelegate):
+    def paint(self, painter, option, index):
+        span = index.data(LogModel.SpanRole)
+        if span is None:
+            QStyledItemDelegate.paint(self, painter, option, index)
+            return
+
+        spanStart, color = span
+
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        text = opt.text
+        opt.text = ""
+
+        widget = opt.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, widget)
+
+        margin = style.pixelMetric(QStyle.PM_FocusFrameHMargin, None, widget) + 1
+        rect = style.subElementRect(
+            QStyle.SE_ItemViewItemText, opt, widget).adjusted(
+                margin, 0, -margin, 0)
+
+        painter.save()
+        if opt.state & QStyle.State_Selected:
+            painter.setPen(opt.palette.color(QPalette.HighlightedText))
+            painter.drawText(rect, Qt.AlignLeft | Qt.AlignVCenter, text)
+        else:
+            prefix = text[:spanStart]
+            painter.setPen(opt.palette.color(QPalette.Text))
+            painter.drawText(rect, Qt.AlignLeft | Qt.AlignVCenter, prefix)
+            rect.setLeft(rect.left() + opt.fontMetrics.horizontalAdvance(prefix))
+            painter.setPen(color)
+            painter.drawText(rect, Qt.AlignLeft | Qt.AlignVCenter,
+                             text[spanStart:])
+        painter.restore()
+
+# Log file follower, wakes only when the file is modified
+
+class LogTail(QObject):
+    READ_CHUNK_SIZE = 4*1024*1024 # 4Mb
+
+    # a new LogIndex, the file has been (re)opened
+    indexReplaced = pyqtSignal(object)
+    # LogIndex, number of complete lines indexed
+    linesIndexed = pyqtSignal(object, int)
+
+    def __init__(self, path: str, parent=None):
+        QObject.__init__(self, parent)
+
+        self.fPath = path
+        self.fFile = None
+        self.fInode = None
+        self.fIndex: Optional[LogIndex] = None
+        self.fOffset = 0
+        self.fLineStart = 0
+        self.fPending = b""
+        self.fLastTime = 0.0
+
+        self.fWatcher = QFileSystemWatcher(self)
+        self.fWatcher.fileChanged.connect(self.slot_fileChanged)
+        self.fWatcher.directoryChanged.connect(self.slot_directoryChanged)
+
+    def start(self):
+        # the directory is watched to see the file re-created
+        # after a rotation or a deletion
+        self.fWatcher.addPath(os.path.dirname(self.fPath))
+        self.openFile()
+        self.readNewData()
+
+    def stop(self):
+        self.closeFile()
+        self.fWatcher.removePaths(
+            self.fWatcher.files() + self.fWatcher.directories())
+
+    def openFile(self):
+        self.closeFile()
+
+        try:
+            self.fFile = open(self.fPath, 'rb')
+            stat = os.fstat(self.fFile.fileno())
+        except OSError:
+            self.fFile = None
+            return
+
+        self.fInode = stat.st_ino
+        self.fOffset = 0
+        self.fLineStart = 0
+        self.fPending = b""
+        self.fLastTime = 0.0
+        self.fIndex = LogIndex(self.fFile.fileno())
+        self.indexReplaced.emit(self.fIndex)
+
+        if self.fPath not in self.fWatcher.files():
+            self.fWatcher.addPath(self.fPath)
+
+    def closeFile(self):
+        if self.fFile is not None:
+            self.fFile.close()
+            self.fFile = None
+        self.fInode = None
+        self.fIndex = None
+
+    def checkFile(self):
+        '''reopen the file if it has been rotated, re-created or truncated'''
+        try:
+            stat = os.stat(self.fPath)
+        except OSError:
+            # removed, we will be notified by the directory watcher
+            self.closeFile()
+            return
+
+        if (self.fFile is None or stat.st_ino != self.fInode
+                or stat.st_size < self.fOffset):
+            self.openFile()
+
+    def readNewData(self):
+        if self.fFile is None:
+            return
+
+        self.fFile.seek(self.fOffset)
+
+        while True:
+            data = self.fFile.read(self.READ_CHUNK_SIZE)
+            if not data:
+                break
+
+            self.fOffset += len(data)
+            data = self.fPending + data
+
+            # keep the unfinished last line for the next read
+            lastNewLine = data.rfind(b"\n")
+            if lastNewLine < 0:
+                self.fPending = data
+                continue
+
+            self.fPending = data[lastNewLine+1:]
+            rawLines = data[:lastNewLine].split(b"\n")
+
+            # parse each line once, here in the reader thread
+            starts = array('Q')
+            parsedLines = list[log_parser.ParsedLine]()
+            timestamps = array('d')
+            pos = self.fLineStart
+
+            for rawLine in rawLines:
+                pos += len(rawLine) + 1
+                starts.append(pos)
+
+                parsedLine = log_parser.parse_line(
+                    rawLine.decode("utf-8", errors="replace"))
+                if parsedLine.time is not None:
+                    self.fLastTime = parsedLine.time.timestamp()
+                parsedLines.append(parsedLine)
+                timestamps.append(self.fLastTime)
+
+            self.fLineStart = pos
+            self.fIndex.append_parsed_lines(
+                self.fIndex.line_count(), parsedLines, timestamps)
+            self.fIndex.append_line_starts(starts)
+            self.linesIndexed.emit(self.fIndex, self.fIndex.line_count())
+
+    @pyqtSlot(str)
+    def slot_fileChanged(self, path: str):
+        self.checkFile()
+        self.readNewData()
+
+    @pyqtSlot(str)
+    def slot_directoryChanged(self, path: str):
+        if self.fFile is None or not os.path.exists(self.fPath):
+            self.checkFile()
+            self.readNewData()
+
+# File read thread, sleeping until log files are modified
 
 class LogsReadThread(QThread):
-    MAX_INITIAL_SIZE = 2*1024*1024 # 2Mb
-
-    updateLogs = pyqtSignal()
-
-    def __init__(self, parent):
+    def __init__(self, parent, models: dict):
         QThread.__init__(self, parent)
 
-        self.fCloseNow = False
-        self.fPurgeLogs = False
-        self.fRealParent = parent
-
-        # -------------------------------------------------------------
-        # Take some values from Logs Window
-
-        self.LOG_FILE_JACK = LogsW.LOG_FILE_JACK
-        self.LOG_FILE_A2J = LogsW.LOG_FILE_A2J
-
-        # -------------------------------------------------------------
-        # Init logs
-
-        if self.LOG_FILE_JACK is not None:
-            self.fLogFileJACK = QFile(self.LOG_FILE_JACK)
-            self.fLogFileJACK.open(QIODevice.ReadOnly)
-            self.fLogStreamJACK = QTextStream(self.fLogFileJACK)
-            self.fLogStreamJACK.setCodec("UTF-8")
-
-            if self.fLogFileJACK.size() > self.MAX_INITIAL_SIZE:
-                self.fLogStreamJACK.seek(
-                    self.fLogFileJACK.size() - self.MAX_INITIAL_SIZE)
-
-        if self.LOG_FILE_A2J is not None:
-            self.fLogFileA2J = QFile(self.LOG_FILE_A2J)
-            self.fLogFileA2J.open(QIODevice.ReadOnly)
-            self.fLogStreamA2J = QTextStream(self.fLogFileA2J)
-            self.fLogStreamA2J.setCodec("UTF-8")
-
-            if self.fLogFileA2J.size() > self.MAX_INITIAL_SIZE:
-                self.fLogStreamA2J.seek(
-                    self.fLogFileA2J.size() - self.MAX_INITIAL_SIZE)
+        # {log file path: LogModel}
+        self.fModels = models
 
     def closeNow(self):
-        self.fCloseNow = True
+        self.quit()
 
     def purgeLogs(self):
-        self.fPurgeLogs = True
+        # models must not read the old index of truncated files,
+        # followers see the truncation and send new indexes.
+        for logFile, model in self.fModels.items():
+            model.slot_indexReplaced(None)
+            try:
+                open(logFile, 'w').close()
+            except OSError:
+                pass
 
     def run(self):
         # -------------------------------------------------------------
-        # Read logs and set text in main thread
-
-        while not self.fCloseNow:
-            if self.fPurgeLogs:
-                if self.LOG_FILE_JACK:
-                    self.fLogStreamJACK.flush()
-                    self.fLogFileJACK.close()
-                    self.fLogFileJACK.open(QIODevice.WriteOnly)
-                    self.fLogFileJACK.close()
-                    self.fLogFileJACK.open(QIODevice.ReadOnly)
-
-                if self.LOG_FILE_A2J:
-                    self.fLogStreamA2J.flush()
-                    self.fLogFileA2J.close()
-                    self.fLogFileA2J.open(QIODevice.WriteOnly)
-                    self.fLogFileA2J.close()
-                    self.fLogFileA2J.open(QIODevice.ReadOnly)
-
-                self.fPurgeLogs = False
+        # Follow logs, living in this thread
 
-            else:
-                if self.LOG_FILE_JACK:
-                    textJACK = fixLogText(
-                        self.fLogStreamJACK.readAll()).strip()
-                else:
-                    textJACK = ""
+        tails = list[LogTail]()
 
-                if self.LOG_FILE_A2J:
-                    textA2J = fixLogText(self.fLogStreamA2J.readAll()).strip()
-                else:
-                    textA2J = ""
+        for logFile, model in self.fModels.items():
+            tail = LogTail(logFile)
+            # models live in the main thread, connections are queued
+            tail.indexReplaced.connect(model.slot_indexReplaced)
+            tail.linesIndexed.connect(model.slot_linesIndexed)
+            tails.append(tail)
 
-                self.fRealParent.setLogsText(textJACK, textA2J)
-                self.updateLogs.emit()
+        for tail in tails:
+            tail.start()
 
-            if not self.fCloseNow:
-                self.sleep(1)
+        self.exec_()
 
         # -------------------------------------------------------------
         # Close logs before closing thread
 
-        if self.LOG_FILE_JACK:
-            self.fLogFileJACK.close()
+        for tail in tails:
+            tail.stop()
+
+# Model of a log file, only visible lines are read
+
+class LogModel(QAbstractListModel):
+    CACHE_SIZE = 4096 # lines
+
+    # (span start, QColor) or None
+    SpanRole = Qt.UserRole + 1
+
+    def __init__(self, palette: QPalette, parent=None):
+        QAbstractListModel.__init__(self, parent)
+
+        self.fPalette = palette
+        self.fIndex: Optional[LogIndex] = None
+        self.fLineCount = 0
+        self.fCache = dict[int, tuple[str, int, int, int]]()
+
+        # filter is (levels, kinds, since timestamp)
+        self.fFilter = None
+        # file lines shown when filtered
+        self.fFilterRows = list[int]()
+
+    @pyqtSlot(object)
+    def slot_indexReplaced(self, index: Optional[LogIndex]):
+        self.beginResetModel()
+        self.fIndex = index
+        self.fLineCount = 0
+        self.fCache.clear()
+        self.fFilterRows.clear()
+        self.endResetModel()
+
+    @pyqtSlot(object, int)
+    def slot_linesIndexed(self, index: LogIndex, lineCount: int):
+        if index is not self.fIndex or lineCount <= self.fLineCount:
+            return
+
+        if self.fFilter is None:
+            self.beginInsertRows(QModelIndex(), self.fLineCount, lineCount - 1)
+            self.fLineCount = lineCount
+            self.endInsertRows()
+            return
+
+        levels, kinds, since = self.fFilter
+        newRows = index.event_rows(levels, kinds, since,
+                                   self.fLineCount, lineCount)
+        self.fLineCount = lineCount
+
+        if newRows:
+            first = len(self.fFilterRows)
+            self.beginInsertRows(QModelIndex(), first, first + len(newRows) - 1)
+            self.fFilterRows += newRows
+            self.endInsertRows()
+
+    def setFilter(self, levels: Optional[tuple], kinds: Optional[tuple],
+                  maxAge: Optional[int]):
+        self.beginResetModel()
+
+        if levels is None and kinds is None:
+            self.fFilter = None
+            self.fFilterRows.clear()
+        else:
+            since = None if maxAge is None else time.time() - maxAge
+            self.fFilter = (levels, kinds, since)
+            if self.fIndex is None:
+                self.fFilterRows = list[int]()
+            else:
+                self.fFilterRows = self.fIndex.event_rows(
+                    levels, kinds, since, 0, self.fLineCount)
+
+        self.endResetModel()
+
+    def lineRow(self, row: int) -> int:
+        '''line number in file of the row'''
+        if self.fFilter is None:
+            return row
+        if 0 <= row < len(self.fFilterRows):
+            return self.fFilterRows[row]
+        return -1
+
+    def rowForLine(self, line: int) -> int:
+        '''row of the line, or of the next shown line if filtered'''
+        if self.fFilter is None:
+            return line
+        return min(bisect_left(self.fFilterRows, line),
+                   len(self.fFilterRows) - 1)
+
+    def lineData(self, line: int) -> tuple[str, int, int, int]:
+        '''text, level, kind and span start of a file line'''
+        lineData = self.fCache.get(line)
+        if lineData is not None:
+            return lineData
+
+        if self.fIndex is None or not 0 <= line < self.fLineCount:
+            return ("", log_parser.LEVEL_INFO, log_parser.KIND_NONE,
+                    log_parser.NO_SPAN)
+
+        if len(self.fCache) >= self.CACHE_SIZE:
+            self.fCache.clear()
+
+        text = fixLogText(
+            self.fIndex.line(line).decode("utf-8", errors="replace"))
+        lineData = (text,) + self.fIndex.line_info(line)
+        self.fCache[line] = lineData
+        return lineData
+
+    def lineText(self, line: int) -> str:
+        return self.lineData(line)[0]
+
+    def lineCount(self) -> int:
+        return self.fLineCount
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        if self.fFilter is not None:
+            return len(self.fFilterRows)
+        return self.fLineCount
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == Qt.DisplayRole:
+            return self.lineText(self.lineRow(index.row()))
+
+        if role == self.SpanRole:
+            text, level, kind, spanStart = self.lineData(
+                self.lineRow(index.row()))
+            if spanStart == log_parser.NO_SPAN:
+                return None
+            color = lineColor(self.fPalette, level, kind)
+            if color is None:
+                return None
+            return (spanStart, color)
+
+        return None
+
+    def lineAtTime(self, wanted: datetime) -> int:
+        '''first file line written at or after wanted,
+        lines are supposed to be chronologically ordered'''
+        low, high = 0, self.fLineCount
+
+        while low < high:
+            mid = (low + high) // 2
+            for line in range(mid, high):
+                lineTime = log_parser.parse_time(self.lineText(line))
+                if lineTime is not None:
+                    break
+            else:
+                # no timestamp between mid and high
+                high = mid
+                continue
+
+            if lineTime < wanted:
+                low = line + 1
+            else:
+                high = mid
+
+        return min(low, self.fLineCount - 1)
 
-        if self.LOG_FILE_A2J:
-            self.fLogFileA2J.close()
+    def lastTime(self) -> Optional[datetime]:
+        for line in range(self.fLineCount - 1, -1, -1):
+            lineTime = log_parser.parse_time(self.lineText(line))
+            if lineTime is not None:
+                return lineTime
+        return None
 
 # ------------------------------------------------------------------------------------------------------------
 # Logs Window
@@ -242,12 +494,6 @@ class LogsW(QDialog):
 
         self.loadSettings()
 
-        self.fFirstRun = True
-        self.fTextLock = QMutex()
-
-        self.fTextJACK = ""
-        self.fTextA2J = ""
-
         # -------------------------------------------------------------
         # Set-up GUI
 
@@ -270,62 +516,126 @@ class LogsW(QDialog):
         # -------------------------------------------------------------
         # Init logs viewers
 
-        if self.LOG_FILE_JACK:
-            self.fSyntaxJACK = SyntaxHighlighter_JACK(self.ui.pte_jack)
-            self.fSyntaxJACK.setDocument(self.ui.pte_jack.document())
+        # {tab widget: view}
+        self.fViews = dict[object, QListView]()
+        models = dict[str, LogModel]()
+
+        for logFile, tab, view in (
+                (self.LOG_FILE_JACK, self.ui.tab_jack, self.ui.lv_jack),
+                (self.LOG_FILE_A2J, self.ui.tab_a2j, self.ui.lv_a2j)):
+            if not logFile:
+                continue
+
+            model = LogModel(view.palette(), self)
+            view.setModel(model)
+            view.setItemDelegate(LogLineDelegate(view))
+            view.setUniformItemSizes(True)
+            view.setSelectionMode(QListView.ExtendedSelection)
+            self.fViews[tab] = view
+            models[logFile] = model
+
+            self.followBottom(view, model)
 
-        if self.LOG_FILE_A2J:
-            self.fSyntaxA2J = SyntaxHighlighter_A2J(self.ui.pte_a2j)
-            self.fSyntaxA2J.setDocument(self.ui.pte_a2j.document())
+            copyShortcut = QShortcut(QKeySequence.Copy, view)
+            copyShortcut.activated.connect(
+                lambda view=view: self.copySelectedLines(view))
 
         # -------------------------------------------------------------
         # Init file read thread
 
-        self.fReadThread = LogsReadThread(self)
+        self.fReadThread = LogsReadThread(self, models)
         self.fReadThread.start(QThread.IdlePriority)
 
         # -------------------------------------------------------------
         # Set-up connections
 
         self.ui.b_purge.clicked.connect(self.slot_purgeLogs)
-        self.fReadThread.updateLogs.connect(self.slot_updateLogs)
+        self.ui.le_goto.returnPressed.connect(self.slot_goto)
+
+        for name, levels, kinds, maxAge in LINE_FILTERS:
+            self.ui.cb_filter.addItem(self.tr(name))
+        self.ui.cb_filter.currentIndexChanged.connect(self.slot_filterChanged)
 
         # -------------------------------------------------------------
 
-    def setLogsText(self, textJACK, textA2J):
-        QMutexLocker(self.fTextLock)
+    def followBottom(self, view: QListView, model: LogModel):
+        '''keep the view at bottom when lines are added,
+        if it was at bottom'''
+        atBottom = [True]
 
-        self.fTextJACK = textJACK
-        self.fTextA2J = textA2J
+        def aboutToInsert(*args):
+            scrollBar = view.verticalScrollBar()
+            atBottom[0] = bool(scrollBar.value() == scrollBar.maximum())
 
-    @pyqtSlot()
-    def slot_updateLogs(self):
-        QMutexLocker(self.fTextLock)
+        def inserted(*args):
+            if atBottom[0]:
+                view.scrollToBottom()
 
-        if self.fFirstRun:
-            self.ui.pte_jack.clear()
-            self.ui.pte_a2j.clear()
+        model.rowsAboutToBeInserted.connect(aboutToInsert)
+        model.rowsInserted.connect(inserted)
+        model.modelReset.connect(lambda: atBottom.__setitem__(0, True))
 
-        if self.LOG_FILE_JACK and self.fTextJACK:
-            self.ui.pte_jack.appendPlainText(self.fTextJACK)
+    def copySelectedLines(self, view: QListView):
+        rows = sorted([index.row() for index in view.selectedIndexes()])
+        model = view.model()
+        QApplication.clipboard().setText(
+            "\n".join([model.lineText(model.lineRow(row)) for row in rows]))
 
-        if self.LOG_FILE_A2J and self.fTextA2J:
-            self.ui.pte_a2j.appendPlainText(self.fTextA2J)
+    def currentView(self) -> Optional[QListView]:
+        return self.fViews.get(self.ui.tabWidget.currentWidget())
 
-        if self.fFirstRun:
-            self.ui.pte_jack.horizontalScrollBar().setValue(0)
-            self.ui.pte_jack.verticalScrollBar().setValue(
-                self.ui.pte_jack.verticalScrollBar().maximum())
-            self.ui.pte_a2j.horizontalScrollBar().setValue(0)
-            self.ui.pte_a2j.verticalScrollBar().setValue(
-                self.ui.pte_a2j.verticalScrollBar().maximum())
-            self.fFirstRun = False
+    @pyqtSlot()
+    def slot_goto(self):
+        '''go to a line number, or a time as
+        "HH:MM[:SS]" (last day of the log) or "YYYY-MM-DD HH:MM[:SS]"'''
+        view = self.currentView()
+        if view is None:
+            return
+
+        model = view.model()
+        if not model.rowCount():
+            return
+
+        text = self.ui.le_goto.text().strip()
+
+        if text.isdigit():
+            line = max(0, min(int(text) - 1, model.lineCount() - 1))
+        else:
+            wanted = None
+            for timeFormat in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M",
+                               "%H:%M:%S", "%H:%M"):
+                try:
+                    wanted = datetime.strptime(text, timeFormat)
+                    break
+                except ValueError:
+                    continue
+
+            if wanted is None:
+                return
+
+            if wanted.year == 1900:
+                # only a time, take the date of the last log line
+                lastTime = model.lastTime()
+                if lastTime is None:
+                    return
+                wanted = datetime.combine(lastTime.date(), wanted.time())
+
+            line = model.lineAtTime(wanted)
+
+        index = model.index(model.rowForLine(line))
+        view.scrollTo(index, QListView.PositionAtTop)
+        view.setCurrentIndex(index)
+
+    @pyqtSlot(int)
+    def slot_filterChanged(self, filterIndex: int):
+        name, levels, kinds, maxAge = LINE_FILTERS[filterIndex]
+        for view in self.fViews.values():
+            view.model().setFilter(levels, kinds, maxAge)
+            view.scrollToBottom()
 
     @pyqtSlot()
     def slot_purgeLogs(self):
         self.fReadThread.purgeLogs()
-        self.ui.pte_jack.clear()
-        self.ui.pte_a2j.clear()
 
     def loadSettings(self):
         settings = QSettings("Caleson", "Caleson-Logs")
@@ -354,9 +664,6 @@ class LogsW(QDialog):
 # Allow to use this as a standalone app
 
 if __name__ == '__main__':
-    # Additional imports
-    from PyQt5.QtWidgets import QApplication
-
     # App initialization
     app = QApplication(sys.argv)
     app.setApplicationName("Caleson-Logs")
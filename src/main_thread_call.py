@@ -0,0 +1,89 @@
+# Calls from a worker thread to the Qt main thread, with a Future.
+# The worker waits on the Future (or not), the main thread resolves it
+# with the return value or the exception of the call.
+
+from concurrent.futures import Future
+import logging
+from typing import Any, Callable, Optional
+
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+
+
+_logger = logging.getLogger(__name__)
+
+class MainThreadCaller(QObject):
+    '''Runs callables in the thread of this object (create it in the
+    main thread).
+
+    If the callable returns a Future (an asynchronous DBus call from
+    dbus_async for example), the returned Future follows it.'''
+
+    # queued: emitted from workers, received in the main thread
+    _call_requested = pyqtSignal(object, object)
+
+    def __init__(self, parent: Optional[QObject]=None):
+        QObject.__init__(self, parent)
+        self._call_requested.connect(self._run)
+
+    def submit(self, action: Callable[[], Any]) -> Future:
+        'request action in the main thread, returns immediately'
+        future = Future()
+        future.set_running_or_notify_cancel()
+        self._call_requested.emit(action, future)
+        return future
+
+    def call(self, action: Callable[[], Any], timeout: float) -> Any:
+        '''run action in the main thread and return its result.
+        Raises its exception, or concurrent.futures.TimeoutError
+        if it is not done after timeout seconds.
+        Must not be called from the main thread.'''
+        return self.submit(action).result(timeout)
+
+    def on_done(self, future: Future,
+                callback: Optional[Callable[[Any], None]]=None,
+                errback: Optional[Callable[[BaseException], None]]=None):
+        '''Run `callback` with the result of `future`, or `errback` with
+        its exception, in the main thread, for futures resolved by worker
+        threads (ThreadPoolExecutor). dbus_async.on_done is enough for
+        futures resolved in the main thread.
+        Without errback, failures are only logged.'''
+        def done(fut: Future):
+            error = fut.exception()
+            if error is not None:
+                if errback is None:
+                    _logger.warning(f"Background task failed: {error}")
+                else:
+                    errback(error)
+            elif callback is not None:
+                callback(fut.result())
+
+        future.add_done_callback(
+            lambda fut: self.submit(lambda: done(fut)).add_done_callback(
+                self._log_failure))
+
+    @staticmethod
+    def _log_failure(future: Future):
+        error = future.exception()
+        if error is not None:
+            _logger.error(f"Main thread call failed: {error!r}")
+
+    @pyqtSlot(object, object)
+    def _run(self, action: Callable[[], Any], future: Future):
+        try:
+            ret = action()
+        except BaseException as e:
+            future.set_exception(e)
+            return
+
+        if not isinstance(ret, Future):
+            future.set_result(ret)
+            return
+
+        def follow(fut: Future):
+            error = fut.exception()
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(fut.result())
+
+        ret.add_done_callback(follow)
@@ -0,0 +1,220 @@
+# Client side copy of the jackdbus patchbay graph.
+# Kept current by the patchbay DBus signals, re-fetched only
+# when a signal has been missed (graph version gap).
+
+from concurrent.futures import Future
+import logging
+from typing import Optional
+
+from dbus_async import patchbay_call, then
+
+
+_logger = logging.getLogger(__name__)
+
+
+class PatchbayMirror:
+    '''Clients, ports and connections of the jackdbus patchbay.
+
+    jackdbus increments its graph version at each change and sends it
+    with each signal. `sync` calls GetGraph with the known version,
+    jackdbus then replies with empty lists if nothing changed
+    (it has no partial replies, a changed graph is sent entirely).
+    jackdbus rebuilds its patchbay at each server start, versions
+    restart then, so the mirror has to be cleared when the server stops.
+    Signals received during a sync are applied after it.'''
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        'graph version of the mirror, None if unknown'
+
+        self._clients = dict[int, str]()
+        self._client_ids = dict[str, int]()
+        # {client_id: {port_id: (port_name, flags, type)}}
+        self._ports = dict[int, dict[int, tuple[str, int, int]]]()
+        # {connection_id: (client1_id, port1_id, client2_id, port2_id)}
+        self._connections = dict[int, tuple[int, int, int, int]]()
+
+        self._syncing: Optional[Future] = None
+        self._sync_pending = False
+        # a reply to a sync started before a clear is ignored
+        self._sync_serial = 0
+        # signals received during a sync, (member, args)
+        self._queued = list[tuple[str, tuple]]()
+
+    # lookups
+
+    def client_id(self, client_name: str) -> Optional[int]:
+        return self._client_ids.get(client_name)
+
+    def has_client(self, client_name: str) -> bool:
+        return client_name in self._client_ids
+
+    def client_name(self, client_id: int) -> Optional[str]:
+        return self._clients.get(client_id)
+
+    def clients(self) -> dict[int, str]:
+        return dict(self._clients)
+
+    def ports(self, client_id: int) -> dict[int, tuple[str, int, int]]:
+        return dict(self._ports.get(client_id, {}))
+
+    def connections_count(self) -> int:
+        return len(self._connections)
+
+    def is_synced(self) -> bool:
+        'contents follow jackdbus (known version, no sync running)'
+        return self.version is not None and not self._sync_pending
+
+    # sync
+
+    def clear(self):
+        'forget everything, for a server stop or a new jackdbus service'
+        self._clear_graph()
+        self._queued.clear()
+        self._sync_serial += 1
+        self._sync_pending = False
+        self._syncing = None
+
+    def _clear_graph(self):
+        self.version = None
+        self._clients.clear()
+        self._client_ids.clear()
+        self._ports.clear()
+        self._connections.clear()
+
+    def sync(self) -> Future:
+        '''bring the mirror to the jackdbus graph version.
+        Returns a Future resolved with this mirror.'''
+        if self._sync_pending:
+            return self._syncing
+
+        self._sync_pending = True
+        self._sync_serial += 1
+        serial = self._sync_serial
+        self._syncing = then(
+            patchbay_call("GetGraph",
+                          self.version if self.version is not None else 0),
+            lambda graph: self._graph_received(serial, graph))
+        self._syncing.add_done_callback(
+            lambda future: self._sync_done(serial, future))
+        return self._syncing
+
+    def _sync_done(self, serial: int, future: Future):
+        if serial != self._sync_serial:
+            return
+
+        if future.exception() is not None:
+            self._sync_pending = False
+            self._queued.clear()
+
+    def _graph_received(self, serial: int, graph: tuple) -> 'PatchbayMirror':
+        if serial != self._sync_serial:
+            # the mirror has been cleared since, this graph is outdated
+            return self
+
+        version, clients, connections = graph
+        version = int(version)
+
+        if version == self.version:
+            _logger.debug(f"patchbay mirror up to date (version {version})")
+            self._apply_queued()
+            return self
+
+        self._clear_graph()
+        self.version = version
+
+        for client_id, client_name, ports in clients:
+            self._add_client(int(client_id), str(client_name))
+            for port_id, port_name, port_flags, port_type in ports:
+                self._ports[int(client_id)][int(port_id)] = (
+                    str(port_name), int(port_flags), int(port_type))
+
+        for (client1_id, client1_name, port1_id, port1_name,
+             client2_id, client2_name, port2_id, port2_name,
+             connection_id) in connections:
+            self._connections[int(connection_id)] = (
+                int(client1_id), int(port1_id),
+                int(client2_id), int(port2_id))
+
+        _logger.debug(
+            f"patchbay mirror fetched, version {version}, "
+            f"{len(self._clients)} clients")
+        self._apply_queued()
+        return self
+
+    def _apply_queued(self):
+        self._sync_pending = False
+        queued = self._queued
+        self._queued = []
+
+        for member, args in queued:
+            # already in the fetched graph
+            if int(args[0]) <= self.version:
+                continue
+            self.signal_received(member, args)
+
+    # DBus signals
+
+    def signal_received(self, member: str, args: tuple):
+        'apply a org.jackaudio.JackPatchbay signal'
+        if not args:
+            return
+
+        if self._sync_pending or self.version is None:
+            # applied once the graph is received, the reply may
+            # already contain this change or not.
+            self._queued.append((member, args))
+            self.sync()
+            return
+
+        version = int(args[0])
+        if version <= self.version:
+            return
+
+        if version != self.version + 1:
+            # we missed something, or jackdbus restarted
+            _logger.debug(
+                f"patchbay version gap ({self.version} -> {version}), "
+                "syncing")
+            self._queued.append((member, args))
+            self.sync()
+            return
+
+        self.version = version
+
+        if member == "ClientAppeared":
+            self._add_client(int(args[1]), str(args[2]))
+
+        elif member == "ClientDisappeared":
+            client_id = int(args[1])
+            client_name = self._clients.pop(client_id, None)
+            if client_name is not None \
+                    and self._client_ids.get(client_name) == client_id:
+                del self._client_ids[client_name]
+            self._ports.pop(client_id, None)
+
+        elif member == "PortAppeared":
+            client_id, port_id = int(args[1]), int(args[3])
+            self._ports.setdefault(client_id, {})[port_id] = (
+                str(args[4]), int(args[5]), int(args[6]))
+
+        elif member == "PortDisappeared":
+            self._ports.get(int(args[1]), {}).pop(int(args[3]), None)
+
+        elif member == "PortRenamed":
+            client_ports = self._ports.get(int(args[1]), {})
+            port = client_ports.get(int(args[3]))
+            if port is not None:
+                client_ports[int(args[3])] = (str(args[5]), port[1], port[2])
+
+        elif member == "PortsConnected":
+            self._connections[int(args[9])] = (
+                int(args[1]), int(args[3]), int(args[5]), int(args[7]))
+
+        elif member == "PortsDisconnected":
+            self._connections.pop(int(args[9]), None)
+
+    def _add_client(self, client_id: int, client_name: str):
+        self._clients[client_id] = client_name
+        self._client_ids[client_name] = client_id
+        self._ports.setdefault(client_id, {})
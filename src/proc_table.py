@@ -0,0 +1,131 @@
+# Process table read directly from /proc (Linux only).
+# Replaces 'ps' subprocesses, one scan answers all "is X running"
+# questions asked during the snapshot life time.
+
+from dataclasses import dataclass
+import logging
+import os
+import time
+from typing import Optional
+
+
+_logger = logging.getLogger(__name__)
+
+PROC_DIR = '/proc'
+
+# seconds a snapshot is considered valid
+DEFAULT_TTL = 0.25
+
+
+@dataclass()
+class ProcEntry:
+    pid: int
+    name: str
+    ppid: int
+    state: str
+
+
+def is_available() -> bool:
+    return os.path.isdir(os.path.join(PROC_DIR, 'self'))
+
+def read_proc(pid: int) -> Optional[ProcEntry]:
+    '''Returns the entry of pid, or None if it does not exist (anymore).
+    name is the kernel 'comm', truncated to 15 chars, as shown by ps.'''
+    try:
+        with open(os.path.join(PROC_DIR, str(pid), 'stat'), 'rb') as f:
+            stat = f.read().decode(errors='replace')
+    except OSError:
+        return None
+
+    # comm can contain spaces and parenthesis
+    name_start = stat.find('(')
+    name_end = stat.rfind(')')
+    if name_start < 0 or name_end < 0:
+        return None
+
+    fields = stat[name_end + 2:].split(' ')
+    try:
+        return ProcEntry(pid=pid,
+                         name=stat[name_start + 1:name_end],
+                         ppid=int(fields[1]),
+                         state=fields[0])
+    except (IndexError, ValueError):
+        return None
+
+def scan_procs(uid: Optional[int]=None) -> list[ProcEntry]:
+    '''all processes, or only those owned by uid if uid is not None'''
+    entries = list[ProcEntry]()
+
+    try:
+        dir_entries = os.scandir(PROC_DIR)
+    except OSError as e:
+        _logger.error(f"Unable to read {PROC_DIR}: {e}")
+        return entries
+
+    with dir_entries:
+        for dir_entry in dir_entries:
+            if not dir_entry.name.isdigit():
+                continue
+
+            if uid is not None:
+                try:
+                    if dir_entry.stat().st_uid != uid:
+                        continue
+                except OSError:
+                    # process exited during the scan
+                    continue
+
+            entry = read_proc(int(dir_entry.name))
+            if entry is not None:
+                entries.append(entry)
+
+    return entries
+
+def pid_exists(pid: int) -> bool:
+    'not cached, checks now if pid is running (zombies excluded)'
+    entry = read_proc(pid)
+    return entry is not None and entry.state != 'Z'
+
+
+class ProcTable:
+    '''Cached snapshot of the process table.
+    The snapshot is re-scanned when older than `ttl` seconds.'''
+
+    def __init__(self, uid: Optional[int]=None, ttl=DEFAULT_TTL):
+        self.uid = uid
+        self.ttl = ttl
+        self._entries = list[ProcEntry]()
+        self._by_name = dict[str, list[int]]()
+        self._scan_time = None
+
+    def invalidate(self):
+        self._scan_time = None
+
+    def snapshot(self, force=False) -> list[ProcEntry]:
+        now = time.monotonic()
+
+        if (force or self._scan_time is None
+                or now - self._scan_time > self.ttl):
+            self._entries = [e for e in scan_procs(self.uid)
+                             if e.state != 'Z']
+            self._by_name.clear()
+            for entry in self._entries:
+                self._by_name.setdefault(entry.name, []).append(entry.pid)
+            self._scan_time = now
+
+        return self._entries
+
+    def names(self) -> list[str]:
+        return [e.name for e in self.snapshot()]
+
+    def pids_of(self, name: str) -> list[int]:
+        self.snapshot()
+        return list(self._by_name.get(name[:15], []))
+
+    def is_running(self, name: str) -> bool:
+        self.snapshot()
+        return name[:15] in self._by_name
+
+
+# processes of the current user, shared by all callers
+user_procs = ProcTable(os.getuid())
@@ -0,0 +1,179 @@
+# Termination engine for audio processes (Linux only).
+# Processes to terminate are signaled at once, then we wait on their
+# pidfds until the last one exits, with a single deadline after which
+# remaining processes are killed. Processes to kill are killed
+# once the others have exited.
+
+from dataclasses import dataclass
+import logging
+import os
+import select
+import signal
+import time
+from typing import Iterable, Optional
+
+import proc_table
+
+
+_logger = logging.getLogger(__name__)
+
+# seconds given to SIGTERMed processes before SIGKILL
+TERM_TIMEOUT = 2.0
+# seconds given to the kernel to reap SIGKILLed processes
+KILL_TIMEOUT = 1.0
+# polling interval when pidfd is not available
+POLL_INTERVAL = 0.02
+
+
+@dataclass()
+class TerminationReport:
+    pid: int
+    name: str
+    signal: signal.Signals
+    'last signal sent'
+    duration: Optional[float] = None
+    'seconds from the first signal to the process exit, None if still alive'
+
+
+class _Target:
+    def __init__(self, pid: int, name: str):
+        self.report = TerminationReport(pid, name, signal.SIGTERM)
+        self.pidfd: Optional[int] = None
+        self.gone = False
+        'exited before we could open its pidfd, must not be signaled'
+
+        if hasattr(os, 'pidfd_open'):
+            try:
+                self.pidfd = os.pidfd_open(pid)
+            except ProcessLookupError:
+                # already gone, its pid may be reused now
+                self.gone = True
+            except OSError:
+                # kernel without pidfd support
+                pass
+
+    def send(self, sig: signal.Signals):
+        self.report.signal = sig
+        try:
+            if self.pidfd is not None and hasattr(signal, 'pidfd_send_signal'):
+                # can not hit another process if the pid has been reused
+                signal.pidfd_send_signal(self.pidfd, sig)
+            else:
+                os.kill(self.report.pid, sig)
+        except ProcessLookupError:
+            pass
+        except PermissionError:
+            _logger.warning(
+                f"Not allowed to send {sig.name} to "
+                f"{self.report.name} ({self.report.pid})")
+
+    def close(self):
+        if self.pidfd is not None:
+            os.close(self.pidfd)
+            self.pidfd = None
+
+
+def _wait(targets: list[_Target], start: float, deadline: float):
+    'wait until all targets exited or deadline is reached'
+    alive = [t for t in targets if t.report.duration is None]
+    if not alive:
+        return
+
+    poller = select.poll()
+    by_fd = dict[int, _Target]()
+    polled = list[_Target]()
+
+    for target in alive:
+        if target.pidfd is None:
+            polled.append(target)
+        else:
+            by_fd[target.pidfd] = target
+            poller.register(target.pidfd, select.POLLIN)
+
+    while by_fd or polled:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0.0:
+            break
+
+        timeout = remaining if not polled else min(remaining, POLL_INTERVAL)
+
+        for fd, event in poller.poll(timeout * 1000.0):
+            target = by_fd.pop(fd)
+            poller.unregister(fd)
+            target.report.duration = time.monotonic() - start
+
+        for target in polled.copy():
+            if not proc_table.pid_exists(target.report.pid):
+                polled.remove(target)
+                target.report.duration = time.monotonic() - start
+
+def terminate(term_names: Iterable[str], kill_names: Iterable[str]=(),
+              term_timeout=TERM_TIMEOUT,
+              kill_timeout=KILL_TIMEOUT) -> list[TerminationReport]:
+    '''Send SIGTERM to processes of the current user named in term_names,
+    all at once. Processes still alive after term_timeout are killed.
+    Then send SIGKILL to the ones named in kill_names.
+    Returns as soon as the last process exits.'''
+    table = proc_table.user_procs
+    table.invalidate()
+
+    term_targets = list[_Target]()
+    kill_targets = list[_Target]()
+
+    for names, targets in ((term_names, term_targets),
+                           (kill_names, kill_targets)):
+        for name in names:
+            for pid in table.pids_of(name):
+                target = _Target(pid, name)
+                if target.gone:
+                    continue
+                targets.append(target)
+
+    targets = term_targets + kill_targets
+    if not targets:
+        return []
+
+    try:
+        if term_targets:
+            start = time.monotonic()
+            for target in term_targets:
+                target.send(signal.SIGTERM)
+
+            _wait(term_targets, start, start + term_timeout)
+
+            stubborns = [t for t in term_targets if t.report.duration is None]
+            for target in stubborns:
+                _logger.warning(
+                    f"{target.report.name} ({target.report.pid}) "
+                    "did not stop, killing it")
+                target.send(signal.SIGKILL)
+
+            if stubborns:
+                _wait(term_targets, start, time.monotonic() + kill_timeout)
+
+        # as the killall fallback, processes to kill
+        # are killed only once the others have exited
+        if kill_targets:
+            start = time.monotonic()
+            for target in kill_targets:
+                target.send(signal.SIGKILL)
+
+            _wait(kill_targets, start, start + kill_timeout)
+    finally:
+        for target in targets:
+            target.close()
+
+    table.invalidate()
+
+    reports = [t.report for t in targets]
+    for report in reports:
+        if report.duration is None:
+            _logger.error(
+                f"{report.name} ({report.pid}) still alive after "
+                f"{report.signal.name}")
+        else:
+            _logger.info(
+                f"{report.name} ({report.pid}) stopped with "
+                f"{report.signal.name} in {report.duration * 1000.0:.1f} ms")
+
+    return reports
@@ -6,6 +6,8 @@ import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+from typing import Optional
 
 TMP_PA_CONTENTS = """
 .fail
@@ -32,6 +34,15 @@ load-module module-rescue-streams
 load-module module-always-sink
 """
 
+# seconds, a pactl command should not take more than that,
+# but it can hang if the daemon is stuck
+PACTL_TIMEOUT = 5.0
+PULSEAUDIO_START_TIMEOUT = 10.0
+
+# replace_hotly and get_existing_modules_in_dicts rewrite the config
+# files and may be called from different threads
+_pulse_lock = threading.Lock()
+
 PULSE_CONFIG_DIR = os.path.join(os.getenv('HOME'), '.pulse')
 if os.getenv('PULSE_CONFIG_DIR'):
     PULSE_CONFIG_DIR = os.getenv('PULSE_CONFIG_DIR')
@@ -59,12 +70,23 @@ class Bridge:
         if connected.lower() in ('false', 'no'):
             self.connected = 'no'
 
+    def key(self) -> tuple[str, str, str, str]:
+        return (self.type, self.name, self.channels, self.connected)
+
     def is_same_as(self, other: 'Bridge') -> bool:
-        return bool(
-            self.type == other.type
-            and self.name == other.name
-            and self.channels == other.channels
-            and self.connected == other.connected)
+        return self.key() == other.key()
+
+    def get_load_command(self) -> list[str]:
+        command = ['load-module', 'module-jack-%s' % self.type]
+
+        if self.channels and self.channels != "0":
+            command.append('channels="%s"' % self.channels)
+        if self.name:
+            command.append('client_name="%s"'
+                           % self.name.replace('"', '\\"'))
+        if self.connected:
+            command.append('connect="%s"' % self.connected)
+        return command
 
     def set_module_id(self, module_id: str):
         self.module_id = module_id
@@ -144,9 +166,15 @@ def start_pulseaudio():
     tmp_pa.writelines(TMP_PA_CONTENTS)
     tmp_pa.seek(0)
 
-    process = subprocess.run(["pulseaudio", "--daemonize", "--high-priority",
-                              "--realtime", "--exit-idle-time=-1",
-                              "--file=%s" % tmp_pa.name, "-n"])
+    try:
+        process = subprocess.run(
+            ["pulseaudio", "--daemonize", "--high-priority",
+             "--realtime", "--exit-idle-time=-1",
+             "--file=%s" % tmp_pa.name, "-n"],
+            timeout=PULSEAUDIO_START_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        sys.stdout.write("Failed to initialize PulseAudio (timeout)!\n")
+        return
 
     if process.returncode:
         sys.stdout.write("Failed to initialize PulseAudio!\n")
@@ -244,10 +272,11 @@ def get_existing_modules() -> list[Bridge]:
     """reads loaded pulseaudio modules
     and returns them in a list of Bridges"""
 
-    # will raise FileNotFoundError if pactl is missing
-    # or subprocess.CalledProcessError if pulseaudio is not running
+    # will raise FileNotFoundError if pactl is missing,
+    # subprocess.CalledProcessError if pulseaudio is not running
+    # or subprocess.TimeoutExpired if it does not answer
     pactl_contents = subprocess.check_output(
-        ['pactl', 'list', 'modules', 'short']).decode()
+        ['pactl', 'list', 'modules', 'short'], timeout=PACTL_TIMEOUT).decode()
 
     return pactl_contents_to_bridge_list(pactl_contents)
 
@@ -267,99 +296,261 @@ def get_save_string(existing_modules: list[Bridge]) -> str:
 
     return '\n'.join([b.get_save_string() for b in existing_modules]) 
 
-def unload_and_load_modules(
-        wanted_modules: list[Bridge], existing_modules: list[Bridge]):
-    """Unload unwanted PulseAudio JACK modules
-        and load wanted modules, skipping theses one already bridged"""
-
-    # disconnect unwanted modules
+class PlanStep:
+    KEEP = 'keep'
+    UNLOAD = 'unload'
+    LOAD = 'load'
+    SET_DEFAULT_SINK = 'set-default-sink'
+    SET_DEFAULT_SOURCE = 'set-default-source'
+
+    def __init__(self, action: str, bridge: Optional[Bridge]=None):
+        self.action = action
+        self.bridge = bridge
+
+    def get_command(self) -> Optional[list[str]]:
+        if self.action == self.UNLOAD:
+            return ['unload-module', self.bridge.module_id]
+        if self.action == self.LOAD:
+            return self.bridge.get_load_command()
+        if self.action == self.SET_DEFAULT_SINK:
+            return ['set-default-sink', 'jack_out']
+        if self.action == self.SET_DEFAULT_SOURCE:
+            return ['set-default-source', 'jack_in']
+        return None
+
+    def __str__(self) -> str:
+        if self.bridge is None:
+            return ' '.join(self.get_command())
+        return '%s module-jack-%s "%s"' % (
+            self.action, self.bridge.type, self.bridge.name)
+
+
+def plan_bridges(wanted_modules: list[Bridge],
+                 existing_modules: list[Bridge]) -> list[PlanStep]:
+    """Returns the ordered steps needed to go from existing bridges
+    to wanted bridges: keep, then unload, then load, then set-default.
+    Default sink/source are set only if a bridge of this type
+    has been loaded or unloaded."""
+    existing_by_key = dict[tuple, list[Bridge]]()
     for module in existing_modules:
-        for bridge in wanted_modules:
-            if bridge.is_same_as(module):
-                bridge.existing = True
-                sys.stderr.write(
-                    'keep module-jack-%s "%s" because it is already running\n'
-                    % (module.type, module.name))
-                break
-        else:
-            sys.stderr.write('unload module-jack-%s "%s"\n'
-                             % (module.type, module.name))
-            subprocess.run(['pactl', 'unload-module', module.module_id])
+        existing_by_key.setdefault(module.key(), []).append(module)
 
-    has_source = False
-    has_sink = False
+    keeps = list[PlanStep]()
+    loads = list[PlanStep]()
 
-    # connect new bridges
     for bridge in wanted_modules:
-        if bridge.type == 'source':
-            has_source = True
+        same_modules = existing_by_key.get(bridge.key())
+        if same_modules:
+            same_modules.pop(0)
+            keeps.append(PlanStep(PlanStep.KEEP, bridge))
         else:
-            has_sink = True
+            loads.append(PlanStep(PlanStep.LOAD, bridge))
 
-        if bridge.existing:
-            continue
+    unloads = [PlanStep(PlanStep.UNLOAD, module)
+               for modules in existing_by_key.values()
+               for module in modules]
 
-        sys.stderr.write(
-            'Adding module-jack-%s "%s"\n' % (bridge.type, bridge.name))
-        process_args = ['pactl', 'load-module',
-                        'module-jack-%s' % bridge.type]
+    changed_types = set([step.bridge.type for step in loads + unloads])
+    wanted_types = set([bridge.type for bridge in wanted_modules])
 
-        if bridge.channels and bridge.channels != "0":
-            process_args.append('channels="%s"' % bridge.channels)
-        if bridge.name:
-            process_args.append('client_name="%s"'
-                                % bridge.name.replace('"', '\\"'))
-        if bridge.connected:
-            process_args.append('connect="%s"' % bridge.connected)
+    defaults = list[PlanStep]()
+    if 'source' in changed_types & wanted_types:
+        defaults.append(PlanStep(PlanStep.SET_DEFAULT_SOURCE))
+    if 'sink' in changed_types & wanted_types:
+        defaults.append(PlanStep(PlanStep.SET_DEFAULT_SINK))
 
-        subprocess.run(process_args, stdout=subprocess.DEVNULL)
+    return keeps + unloads + loads + defaults
 
-    if has_source:
-        subprocess.run(['pactl', 'set-default-source', 'jack_in'])
-    if has_sink:
-        subprocess.run(['pactl', 'set-default-sink', 'jack_out'])
 
-def replace_hotly(bridge_dicts: list) -> int:
-    # init the pulse config files if needed
-    init_pulse_config_files()
+class PactlBackend:
+    """Runs each command in its own pactl process.
+    Slow, but works with any pulseaudio compatible server."""
+    name = 'pactl'
 
-    if not shutil.which('pactl'):
-        sys.stderr.write(
-            'pactl is missing, please install pulseaudio !\n')
-        return 1
+    def is_available(self) -> bool:
+        return bool(shutil.which('pactl'))
 
-    pactl_prc = subprocess.run(
-        ['pactl', 'list', 'modules', 'short'],
-        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    def _run_serie(self, commands: list[list[str]], results: list[bool]):
+        for command in commands:
+            try:
+                process = subprocess.run(
+                    ['pactl'] + command, stdout=subprocess.DEVNULL,
+                    timeout=PACTL_TIMEOUT)
+            except subprocess.TimeoutExpired as e:
+                sys.stderr.write(f'{e}\n')
+                results.append(False)
+                continue
+            results.append(not process.returncode)
+
+    def run(self, stages: list[list[list[str]]]) -> bool:
+        """Each stage is a list of series of commands.
+        Series of a stage run concurrently,
+        a stage starts when the previous one is finished."""
+        results = list[bool]()
+
+        for series in stages:
+            threads = [threading.Thread(target=self._run_serie,
+                                        args=(serie, results))
+                       for serie in series if serie]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        return all(results)
+
+
+class PacmdBackend:
+    """Sends all commands to the pulseaudio CLI interface
+    in one pacmd session, so one process for all commands.
+    Not available with pipewire-pulse."""
+    name = 'pacmd'
+
+    def is_available(self) -> bool:
+        return bool(shutil.which('pacmd'))
+
+    def run(self, stages: list[list[list[str]]]) -> Optional[bool]:
+        """Returns None if nothing has been sent to the daemon
+        (so pactl can run the commands instead),
+        else True if all commands succeeded."""
+        commands = [command for series in stages
+                    for serie in series for command in serie]
+        if not commands:
+            return True
+
+        script = '\n'.join([' '.join(command) for command in commands])
+
+        try:
+            process = subprocess.run(
+                ['pacmd'], input=script.encode() + b'\n',
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                timeout=10.0)
+        except OSError as e:
+            sys.stderr.write(f'pacmd session failed: {e}\n')
+            return None
+        except subprocess.TimeoutExpired as e:
+            # some commands may have been executed,
+            # running them again with pactl could load modules twice
+            sys.stderr.write(f'pacmd session failed: {e}\n')
+            return False
+
+        if process.returncode:
+            # daemon not reachable with pacmd, nothing has been done
+            sys.stderr.write(process.stderr.decode())
+            return None
+
+        success = True
+        output = process.stdout.decode()
+        for line in output.splitlines():
+            if 'failed' in line.lower() or line.startswith('Unknown command'):
+                sys.stderr.write(f'pacmd: {line}\n')
+                success = False
+
+        return success
+
+
+def plan_to_stages(plan: list[PlanStep]) -> list[list[list[str]]]:
+    """Groups plan commands in stages of independent series.
+    Sinks and sources are loaded concurrently, but bridges of the same
+    type stay ordered, so the first wanted sink is still 'jack_out'
+    and the first wanted source 'jack_in'."""
+    unloads = [s.get_command() for s in plan if s.action == PlanStep.UNLOAD]
+    sink_loads = [s.get_command() for s in plan
+                  if s.action == PlanStep.LOAD and s.bridge.type == 'sink']
+    source_loads = [s.get_command() for s in plan
+                    if s.action == PlanStep.LOAD and s.bridge.type == 'source']
+    defaults = [s.get_command() for s in plan
+                if s.action in (PlanStep.SET_DEFAULT_SINK,
+                                PlanStep.SET_DEFAULT_SOURCE)]
+
+    return [[[command] for command in unloads],
+            [sink_loads, source_loads],
+            [[command] for command in defaults]]
+
+def execute_plan(plan: list[PlanStep], dry_run=False) -> bool:
+    """Runs the plan commands in one pacmd session if possible,
+    fallbacks to pactl processes if pacmd could not send anything.
+    Returns True if all commands succeeded."""
+    for step in plan:
+        sys.stderr.write(f'{step}\n')
+
+    if dry_run:
+        return True
+
+    stages = plan_to_stages(plan)
+    if not any(stages):
+        return True
+
+    pacmd = PacmdBackend()
+    if pacmd.is_available():
+        success = pacmd.run(stages)
+        if success is not None:
+            return success
+
+    return PactlBackend().run(stages)
 
-    pactl_contents = pactl_prc.stdout.decode()
-    existing_modules = pactl_contents_to_bridge_list(pactl_contents)
-    
-    wanted_modules = []
-    for b_dict in bridge_dicts:
-        wanted_modules.append(
-            Bridge(b_dict['type'], b_dict['name'], 
+def unload_and_load_modules(
+        wanted_modules: list[Bridge], existing_modules: list[Bridge],
+        dry_run=False):
+    """Unload unwanted PulseAudio JACK modules
+        and load wanted modules, skipping theses one already bridged"""
+    execute_plan(plan_bridges(wanted_modules, existing_modules), dry_run)
+
+def bridges_from_dicts(bridge_dicts: list) -> list[Bridge]:
+    return [Bridge(b_dict['type'], b_dict['name'],
                    str(b_dict['channels']),
-                   'yes' if b_dict['connected'] else 'no'))
-        
-    #wanted_modules = get_wanted_bridges_from_str(input_string)
-    if pactl_prc.returncode:
-        start_pulseaudio()
-    #else:
-    unload_and_load_modules(wanted_modules, existing_modules)
+                   'yes' if b_dict['connected'] else 'no')
+            for b_dict in bridge_dicts]
+
+def list_modules_short() -> Optional[subprocess.CompletedProcess]:
+    """runs 'pactl list modules short',
+    returns None if pactl did not answer in time."""
+    try:
+        return subprocess.run(
+            ['pactl', 'list', 'modules', 'short'],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            timeout=PACTL_TIMEOUT)
+    except subprocess.TimeoutExpired as e:
+        sys.stderr.write(f'{e}\n')
+        return None
+
+def replace_hotly(bridge_dicts: list) -> int:
+    with _pulse_lock:
+        # init the pulse config files if needed
+        init_pulse_config_files()
+
+        if not shutil.which('pactl'):
+            sys.stderr.write(
+                'pactl is missing, please install pulseaudio !\n')
+            return 1
+
+        pactl_prc = list_modules_short()
+        if pactl_prc is None:
+            return 1
+
+        pactl_contents = pactl_prc.stdout.decode()
+        existing_modules = pactl_contents_to_bridge_list(pactl_contents)
+        wanted_modules = bridges_from_dicts(bridge_dicts)
+
+        if pactl_prc.returncode:
+            start_pulseaudio()
+
+        unload_and_load_modules(wanted_modules, existing_modules)
+        return 0
 
 def get_existing_modules_in_dicts() -> list:
-    # init the pulse config files if needed
-    init_pulse_config_files()
+    with _pulse_lock:
+        # init the pulse config files if needed
+        init_pulse_config_files()
 
-    if not shutil.which('pactl'):
-        sys.stderr.write(
-            'pactl is missing, please install pulseaudio !\n')
-        return []
+        if not shutil.which('pactl'):
+            sys.stderr.write(
+                'pactl is missing, please install pulseaudio !\n')
+            return []
 
-    pactl_prc = subprocess.run(
-        ['pactl', 'list', 'modules', 'short'],
-        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        pactl_prc = list_modules_short()
+        if pactl_prc is None:
+            return []
 
     pactl_contents = pactl_prc.stdout.decode()
     existing_modules = pactl_contents_to_bridge_list(pactl_contents)
@@ -373,34 +564,16 @@ def get_existing_modules_in_dicts() -> list:
     return return_list
 
 def set_bridges_from_dicts(bridge_dicts: list):
-    # init the pulse config files if needed
-    init_pulse_config_files()
-
-    if not shutil.which('pactl'):
-        sys.stderr.write(
-            'pactl is missing, please install pulseaudio !\n')
-        return 1
-
-    pactl_prc = subprocess.run(
-        ['pactl', 'list', 'modules', 'short'],
-        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
-
-    pactl_contents = pactl_prc.stdout.decode()
-    existing_modules = pactl_contents_to_bridge_list(pactl_contents)
-    wanted_modules = []
-    for b_dict in bridge_dicts:
-        connected = 'yes' if b_dict['connected'] else 'no'
-        bridge = Bridge(b_dict['type'], b_dict['name'],
-                        int(b_dict['channels']), connected)
-        
-    if pactl_prc.returncode:
-        start_pulseaudio()
-    #else:
-    unload_and_load_modules(wanted_modules, existing_modules)
+    return replace_hotly(bridge_dicts)
 
 
 if __name__ == '__main__':
-    if len(sys.argv) < 2:
+    args = sys.argv[1:]
+    dry_run = '--dry-run' in args
+    if dry_run:
+        args.remove('--dry-run')
+
+    if not args:
         sys.stderr.write('argument required.\n')
         sys.exit(1)
     
@@ -412,23 +585,21 @@ if __name__ == '__main__':
             'pactl is missing, please install pulseaudio !\n')
         sys.exit(1)
 
-    pactl_prc = subprocess.run(
-        ['pactl', 'list', 'modules', 'short'],
-        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    pactl_prc = list_modules_short()
+    if pactl_prc is None:
+        sys.exit(1)
 
     pactl_contents = pactl_prc.stdout.decode()
     existing_modules = pactl_contents_to_bridge_list(pactl_contents)
     
-    if sys.argv[1] == '--save':
+    if args[0] == '--save':
         if pactl_prc.returncode:
             sys.exit()
         sys.stdout.write(get_save_string(existing_modules))
         sys.stdout.write('\n')
         sys.exit()
     else:
-        wanted_modules = get_wanted_bridges_from_str(sys.argv[1])
-        if pactl_prc.returncode:
-            start_pulseaudio(wanted_modules)
-        else:
-            unload_and_load_modules(wanted_modules, existing_modules)
-    
+        wanted_modules = get_wanted_bridges_from_str(args[0])
+        if pactl_prc.returncode and not dry_run:
+            start_pulseaudio()
+        unload_and_load_modules(wanted_modules, existing_modules, dry_run)
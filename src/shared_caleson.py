@@ -21,12 +21,15 @@
 from enum import Enum
 import logging
 import os
+import shlex
 import time
 
 from PyQt5.QtCore import QProcess, QSettings
 
 # Imports (Custom Stuff)
 from shared import Platform, platform_
+import proc_table
+import proc_terminate
 
 
 _logger = logging.getLogger(__name__)
@@ -52,7 +55,10 @@ wantJackStart = os.path.exists(
 def getProcList() -> list[str]:
     retProcs = list[str]()
 
-    if platform_ in (Platform.LINUX, Platform.MACOS):
+    if platform_ is Platform.LINUX and proc_table.is_available():
+        retProcs = proc_table.user_procs.names()
+
+    elif platform_ in (Platform.LINUX, Platform.MACOS):
         process = QProcess()
         process.start("ps", ["-u", str(os.getuid())])
         process.waitForFinished()
@@ -82,13 +88,20 @@ def startAlsaAudioLoopBridge():
             "ALSA-Audio/BridgeTool", "alsa_in", type=str)
         == "zita")
 
+    # as "1:3,2:4", bridge channel to system channel
+    channelMap = GlobalSettings.value(
+        "ALSA-Audio/BridgeChannelMap", "", type=str)
+
     os.system(
-        "caleson-aloop-daemon --channels=%i %s &" % (
-            channels, "--zita" if useZita else ""))
+        "caleson-aloop-daemon --channels=%i %s %s &" % (
+            channels, "--zita" if useZita else "",
+            shlex.quote("--channel-map=%s" % channelMap) if channelMap else ""))
 
 # Stop all audio processes, used for force-restart
 def waitProcsEnd(procs, tries):
     for x in range(tries):
+        # we are waiting for changes, do not use the cached snapshot
+        proc_table.user_procs.invalidate()
         procsList = getProcList()
         for proc in procs:
             if proc in procsList:
@@ -133,6 +146,10 @@ def stopAllAudioProcesses(tryCloseJack = True):
     procsKill = ["jackdbus", "pulseaudio"]
     tries = 20
 
+    if platform_ is Platform.LINUX and proc_table.is_available():
+        proc_terminate.terminate(procsTerm, procsKill)
+        return
+
     process.start("killall", procsTerm)
     process.waitForFinished()
     waitProcsEnd(procsTerm, tries)
@@ -1,6 +1,7 @@
 
+import grp
 import os
-from subprocess import getoutput
+import pwd
 from PyQt5.QtWidgets import QApplication
 
 from shared import Platform
@@ -32,8 +33,14 @@ class CalesonSystemCheck_audioGroup(CalesonSystemCheck):
 
         self.name = self.tr("User in audio group")
 
-        user = getoutput("whoami").strip()
-        groups = getoutput("groups").strip().split(" ")
+        # as 'whoami' and 'groups', without starting them
+        user = pwd.getpwuid(os.geteuid()).pw_name
+        groups = list[str]()
+        for gid in set(os.getgroups() + [os.getegid()]):
+            try:
+                groups.append(grp.getgrgid(gid).gr_name)
+            except KeyError:
+                continue
 
         if "audio" in groups:
             self.icon = self.ICON_OK
@@ -76,7 +83,8 @@ class CalesonSystemCheck_kernel(CalesonSystemCheck):
         self.name = self.tr("Current kernel")
 
         uname3 = os.uname()[2]
-        uname4 = getoutput("uname -a").strip().split()
+        # words of 'uname -a', PREEMPT is in the kernel version
+        uname4 = ' '.join(os.uname()).split()
 
         versionInt = []
         versionStr = uname3.split("-",1)[0]
@@ -132,6 +140,8 @@ class CalesonSystemCheck_kernel(CalesonSystemCheck):
 calesonSystemChecks = list[CalesonSystemCheck]()
 
 def initSystemChecks(platform_: Platform):
+    '''run the checks, does not need the main thread,
+    Caleson runs it in the background during startup.'''
     if platform_ is Platform.LINUX:
         calesonSystemChecks.append(CalesonSystemCheck_kernel())
         calesonSystemChecks.append(CalesonSystemCheck_audioGroup())
\ No newline at end of file
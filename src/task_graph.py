@@ -0,0 +1,169 @@
+# Small dependency graph scheduler.
+# Each task starts as soon as the tasks it depends on are ready,
+# independent tasks run concurrently in a thread pool.
+
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ThreadPoolExecutor, wait)
+from dataclasses import dataclass, field
+from enum import Enum
+import logging
+import time
+from typing import Any, Callable, Optional
+
+import tracing
+
+_logger = logging.getLogger(__name__)
+
+# seconds between two checks of a readiness condition
+READY_CHECK_INTERVAL = 0.02
+
+
+class TaskState(Enum):
+    PENDING = 0
+    DONE = 1
+    'ran and is ready'
+    FAILED = 2
+    SKIPPED = 3
+    'a dependency failed or was skipped'
+
+
+@dataclass()
+class Task:
+    name: str
+    run: Callable[[], Any]
+    'raises to fail the task'
+    depends: tuple[str, ...] = ()
+    ready: Optional[Callable[[], bool]] = None
+    '''condition checked after run, until true (JACK started,
+    port present...). Dependents wait for it.'''
+    ready_timeout: float = 5.0
+    'seconds, the task fails if not ready after this time'
+
+
+@dataclass()
+class TaskReport:
+    name: str
+    state: TaskState = TaskState.PENDING
+    start: float = 0.0
+    'seconds from the graph start'
+    run_time: float = 0.0
+    'seconds spent in run'
+    ready_time: float = 0.0
+    'seconds spent waiting for the readiness condition'
+    error: Optional[BaseException] = None
+
+    @property
+    def end(self) -> float:
+        return self.start + self.run_time + self.ready_time
+
+
+@dataclass()
+class GraphReport:
+    total: float = 0.0
+    tasks: dict[str, TaskReport] = field(default_factory=dict)
+
+    def succeeded(self) -> bool:
+        return all(r.state is TaskState.DONE for r in self.tasks.values())
+
+    def format(self) -> str:
+        lines = [f"total: {self.total * 1000.0:.0f} ms"]
+        for report in sorted(self.tasks.values(), key=lambda r: r.start):
+            line = (f"  {report.name}: {report.state.name.lower()}, "
+                    f"start {report.start * 1000.0:.0f} ms, "
+                    f"run {report.run_time * 1000.0:.0f} ms")
+            if report.ready_time:
+                line += f", ready after {report.ready_time * 1000.0:.0f} ms"
+            if report.error is not None:
+                line += f" ({report.error})"
+            lines.append(line)
+        return '\n'.join(lines)
+
+
+def wait_ready(condition: Callable[[], bool], timeout: float) -> bool:
+    'check condition until it is true or timeout (seconds) is reached'
+    deadline = time.monotonic() + timeout
+    while True:
+        if condition():
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(READY_CHECK_INTERVAL)
+
+
+class TaskGraph:
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self._tasks = dict[str, Task]()
+
+    def add(self, task: Task):
+        for dep in task.depends:
+            if dep not in self._tasks:
+                raise ValueError(
+                    f"task '{task.name}' depends on unknown task '{dep}'")
+        self._tasks[task.name] = task
+
+    def _execute(self, task: Task, report: TaskReport, graph_start: float):
+        report.start = time.monotonic() - graph_start
+        with tracing.span(task.name):
+            task.run()
+        report.run_time = time.monotonic() - graph_start - report.start
+
+        if task.ready is not None:
+            ready_start = time.monotonic()
+            with tracing.span(f"{task.name} (ready)"):
+                ready = wait_ready(task.ready, task.ready_timeout)
+            report.ready_time = time.monotonic() - ready_start
+            if not ready:
+                raise TimeoutError(
+                    f"not ready after {task.ready_timeout:.1f}s")
+
+    def run(self) -> GraphReport:
+        '''run all tasks, returns when all are done, failed or skipped.
+        Tasks are added in a dependency order (see `add`),
+        so the graph has no cycle.'''
+        report = GraphReport(
+            tasks={name: TaskReport(name) for name in self._tasks})
+        graph_start = time.monotonic()
+        running = dict[Future, str]()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix='task') as executor:
+            while True:
+                skipped = False
+                for name, task in self._tasks.items():
+                    task_report = report.tasks[name]
+                    if task_report.state is not TaskState.PENDING \
+                            or name in running.values():
+                        continue
+
+                    dep_states = [report.tasks[d].state for d in task.depends]
+                    if any(s in (TaskState.FAILED, TaskState.SKIPPED)
+                           for s in dep_states):
+                        task_report.state = TaskState.SKIPPED
+                        skipped = True
+                        _logger.warning(
+                            f"{name} skipped, a dependency failed")
+                    elif all(s is TaskState.DONE for s in dep_states):
+                        future = executor.submit(
+                            self._execute, task, task_report, graph_start)
+                        running[future] = name
+
+                if not running:
+                    if skipped:
+                        # dependents of skipped tasks are skipped too
+                        continue
+                    break
+
+                done, not_done = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task_report = report.tasks[running.pop(future)]
+                    error = future.exception()
+                    if error is None:
+                        task_report.state = TaskState.DONE
+                    else:
+                        task_report.state = TaskState.FAILED
+                        task_report.error = error
+                        _logger.error(f"{task_report.name} failed: {error}")
+
+        report.total = time.monotonic() - graph_start
+        return report
@@ -0,0 +1,210 @@
+# Startup tracing, spans are written as a Chrome trace (JSON),
+# readable with Perfetto (ui.perfetto.dev) or chrome://tracing.
+# Disabled unless enabled with --profile or the CALESON_PROFILE
+# environment variable, then a span costs one function call.
+
+import atexit
+from functools import wraps
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Optional
+
+
+_logger = logging.getLogger(__name__)
+
+ENV_VAR = 'CALESON_PROFILE'
+'set to a file path, or to 1 for the default path'
+ARG = '--profile'
+'command line argument, --profile or --profile=FILE'
+
+# None while disabled
+_events: Optional[list[dict]] = None
+_thread_names = dict[int, str]()
+_path = ''
+
+
+def _now_us() -> float:
+    return time.perf_counter_ns() / 1000.0
+
+
+def _add_event(event: dict):
+    tid = threading.get_native_id()
+    if tid not in _thread_names:
+        _thread_names[tid] = threading.current_thread().name
+    event['pid'] = os.getpid()
+    event['tid'] = tid
+    _events.append(event)
+
+
+class _NoSpan:
+    'shared by all spans and sections while tracing is disabled'
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def next(self, name: str):
+        pass
+
+    def end(self):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'args', '_start')
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = _now_us()
+        event = {'name': self.name, 'ph': 'X',
+                 'ts': self._start, 'dur': end - self._start}
+        if exc is not None:
+            self.args['error'] = repr(exc)
+        if self.args:
+            event['args'] = self.args
+        _add_event(event)
+        return False
+
+
+class _Sections:
+    '''consecutive spans of a long function, to time its parts
+    without re-indenting them in `with` blocks.'''
+    __slots__ = ('prefix', '_span')
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._span: Optional[_Span] = None
+
+    def next(self, name: str):
+        'end the current section and start a new one'
+        self.end()
+        self._span = _Span(f'{self.prefix}: {name}', {})
+        self._span.__enter__()
+
+    def end(self):
+        if self._span is not None:
+            self._span.__exit__(None, None, None)
+            self._span = None
+
+
+def is_enabled() -> bool:
+    return _events is not None
+
+
+def span(name: str, **args):
+    '''context manager recording the time spent in its block,
+    args are shown with the span in the trace viewer.'''
+    if _events is None:
+        return _NO_SPAN
+    return _Span(name, args)
+
+
+def sections(prefix: str):
+    'see _Sections, call `end` after the last section'
+    if _events is None:
+        return _NO_SPAN
+    return _Sections(prefix)
+
+
+def instant(name: str, **args):
+    'record a point in time (first paint, a DBus reply...)'
+    if _events is None:
+        return
+    event = {'name': name, 'ph': 'i', 's': 'p', 'ts': _now_us()}
+    if args:
+        event['args'] = args
+    _add_event(event)
+
+
+def traced(name: str) -> Callable:
+    '''decorator recording each call of the function as a span.
+    Tracing is checked at each call, it can be enabled after decoration.'''
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _events is None:
+                return func(*args, **kwargs)
+            with _Span(name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def enable(path=''):
+    'start recording, the trace is written to path at exit'
+    global _events, _path
+    if _events is not None:
+        return
+
+    if not path:
+        prog = os.path.basename(sys.argv[0] if sys.argv else '')
+        if prog.endswith('.py'):
+            prog = prog[:-3]
+        path = os.path.join(tempfile.gettempdir(),
+                            f'{prog or "caleson"}-{os.getpid()}.trace.json')
+
+    _events = []
+    _path = path
+    atexit.register(write)
+
+
+def write():
+    'write the trace file, called at exit once enabled'
+    if _events is None:
+        return
+
+    events = [{'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(),
+               'tid': tid, 'args': {'name': name}}
+              for tid, name in _thread_names.items()]
+    events += _events
+
+    try:
+        with open(_path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+    except OSError as e:
+        _logger.error(f"Unable to write the trace file {_path}: {e}")
+        return
+
+    sys.stderr.write(f"Startup trace written to {_path}\n")
+
+
+def setup(argv: list[str]) -> list[str]:
+    '''enable tracing if argv contains --profile[=FILE],
+    or if the CALESON_PROFILE environment variable is set.
+    Returns argv without the --profile argument.'''
+    path = None
+    env_value = os.environ.get(ENV_VAR, '')
+    if env_value and env_value != '0':
+        path = '' if env_value == '1' else env_value
+
+    remaining = list[str]()
+    for arg in argv:
+        if arg == ARG:
+            path = path or ''
+        elif arg.startswith(ARG + '='):
+            path = arg.partition('=')[2]
+        else:
+            remaining.append(arg)
+
+    if path is not None:
+        enable(path)
+    return remaining